@@ -0,0 +1,33 @@
+"""task list indexes
+
+Revision ID: 3f9c1d2e7a41
+Revises: 5aa4777ccd53
+Create Date: 2026-10-17 10:12:40.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c1d2e7a41'
+down_revision: Union[str, None] = '5aa4777ccd53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY не блокирует запись в tasks, но не может
+    # выполняться внутри транзакции.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_tasks_owner_id_created_at_id', 'tasks', ['owner_id', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_tasks_owner_id_deadline_id', 'tasks', ['owner_id', 'deadline', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_tasks_owner_id_status_deadline', 'tasks', ['owner_id', 'status', 'deadline'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tasks_owner_id_status_deadline', table_name='tasks', postgresql_concurrently=True)
+        op.drop_index('ix_tasks_owner_id_deadline_id', table_name='tasks', postgresql_concurrently=True)
+        op.drop_index('ix_tasks_owner_id_created_at_id', table_name='tasks', postgresql_concurrently=True)
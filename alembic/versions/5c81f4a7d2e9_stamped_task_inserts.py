@@ -0,0 +1,45 @@
+"""stamped task inserts
+
+Revision ID: 5c81f4a7d2e9
+Revises: 0b7e9d42c6a1
+Create Date: 2026-10-17 21:20:13.640182
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c81f4a7d2e9'
+down_revision: Union[str, None] = '0b7e9d42c6a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Импорт через COPY сам записывает версию данных владельца, поэтому для таких
+    # строк триггер не вызывается (условие WHEN проверяется без вызова функции)
+    # и не читает users для каждой строки. Вставки без версии (data_version = 0)
+    # и все изменения по-прежнему получают версию из users.
+    op.execute('DROP TRIGGER tasks_track_changes ON tasks')
+    op.execute('''
+        CREATE TRIGGER tasks_track_changes
+        BEFORE UPDATE ON tasks
+        FOR EACH ROW EXECUTE FUNCTION tasks_track_changes()
+    ''')
+    op.execute('''
+        CREATE TRIGGER tasks_track_inserts
+        BEFORE INSERT ON tasks
+        FOR EACH ROW WHEN (NEW.data_version = 0) EXECUTE FUNCTION tasks_track_changes()
+    ''')
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER tasks_track_inserts ON tasks')
+    op.execute('DROP TRIGGER tasks_track_changes ON tasks')
+    op.execute('''
+        CREATE TRIGGER tasks_track_changes
+        BEFORE INSERT OR UPDATE ON tasks
+        FOR EACH ROW EXECUTE FUNCTION tasks_track_changes()
+    ''')
@@ -0,0 +1,92 @@
+"""task change tracking
+
+Revision ID: 7d3a95c0e1f4
+Revises: e5d08a3b71c2
+Create Date: 2026-10-17 14:10:37.902518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3a95c0e1f4'
+down_revision: Union[str, None] = 'e5d08a3b71c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('sync_min_version', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('tasks', sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False))
+    op.add_column('tasks', sa.Column('data_version', sa.BigInteger(), server_default='0', nullable=False))
+    op.execute(
+        'UPDATE tasks SET updated_at = tasks.created_at, data_version = users.data_version '
+        'FROM users WHERE users.id = tasks.owner_id'
+    )
+    op.create_index('ix_tasks_owner_id_data_version', 'tasks', ['owner_id', 'data_version'], unique=False)
+
+    op.create_table(
+        'task_tombstones',
+        sa.Column('task_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('data_version', sa.BigInteger(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('task_id'),
+    )
+    op.create_index('ix_task_tombstones_owner_id_data_version', 'task_tombstones', ['owner_id', 'data_version'], unique=False)
+
+    # Каждая вставка и изменение задачи получает текущую версию данных владельца,
+    # которую изменяющая транзакция увеличивает первым запросом.
+    op.execute('''
+        CREATE FUNCTION tasks_track_changes() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at := now();
+            NEW.data_version := coalesce(
+                (SELECT data_version FROM users WHERE id = NEW.owner_id), 0
+            );
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    ''')
+    op.execute('''
+        CREATE TRIGGER tasks_track_changes
+        BEFORE INSERT OR UPDATE ON tasks
+        FOR EACH ROW EXECUTE FUNCTION tasks_track_changes()
+    ''')
+
+    # Удаления записываются одним запросом на оператор DELETE. Задачи, удалённые
+    # вместе с пользователем, не записываются: строки пользователя уже нет.
+    op.execute('''
+        CREATE FUNCTION tasks_record_tombstones() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO task_tombstones (task_id, owner_id, data_version)
+            SELECT deleted_tasks.id, deleted_tasks.owner_id, users.data_version
+            FROM deleted_tasks JOIN users ON users.id = deleted_tasks.owner_id
+            ON CONFLICT (task_id) DO UPDATE
+            SET data_version = excluded.data_version, deleted_at = excluded.deleted_at;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    ''')
+    op.execute('''
+        CREATE TRIGGER tasks_record_tombstones
+        AFTER DELETE ON tasks
+        REFERENCING OLD TABLE AS deleted_tasks
+        FOR EACH STATEMENT EXECUTE FUNCTION tasks_record_tombstones()
+    ''')
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER tasks_record_tombstones ON tasks')
+    op.execute('DROP FUNCTION tasks_record_tombstones()')
+    op.execute('DROP TRIGGER tasks_track_changes ON tasks')
+    op.execute('DROP FUNCTION tasks_track_changes()')
+    op.drop_index('ix_task_tombstones_owner_id_data_version', table_name='task_tombstones')
+    op.drop_table('task_tombstones')
+    op.drop_index('ix_tasks_owner_id_data_version', table_name='tasks')
+    op.drop_column('tasks', 'data_version')
+    op.drop_column('tasks', 'updated_at')
+    op.drop_column('users', 'sync_min_version')
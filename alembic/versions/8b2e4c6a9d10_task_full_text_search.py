@@ -0,0 +1,41 @@
+"""task full text search
+
+Revision ID: 8b2e4c6a9d10
+Revises: 3f9c1d2e7a41
+Create Date: 2026-10-17 11:02:15.503117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4c6a9d10'
+down_revision: Union[str, None] = '3f9c1d2e7a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # btree_gin позволяет держать owner_id и tsvector в одном GIN-индексе.
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gin')
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))",
+                persisted=True,
+            ),
+            nullable=True,
+        ))
+        batch_op.create_index('ix_tasks_owner_id_search_vector', ['owner_id', 'search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index('ix_tasks_owner_id_search_vector', postgresql_using='gin')
+        batch_op.drop_column('search_vector')
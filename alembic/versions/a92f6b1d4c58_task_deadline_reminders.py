@@ -0,0 +1,41 @@
+"""task deadline reminders
+
+Revision ID: a92f6b1d4c58
+Revises: 7d3a95c0e1f4
+Create Date: 2026-10-17 15:02:44.118306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a92f6b1d4c58'
+down_revision: Union[str, None] = '7d3a95c0e1f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_tasks_deadline_id_pending',
+        'tasks',
+        ['deadline', 'id'],
+        unique=False,
+        postgresql_where=sa.text("status <> 'COMPLETED' AND deadline IS NOT NULL"),
+    )
+    op.create_table(
+        'task_reminders',
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('deadline', sa.DateTime(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('task_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('task_reminders')
+    op.drop_index('ix_tasks_deadline_id_pending', table_name='tasks', postgresql_where=sa.text("status <> 'COMPLETED' AND deadline IS NOT NULL"))
@@ -0,0 +1,36 @@
+"""task overdue flag
+
+Revision ID: b6e1f09d3c27
+Revises: a92f6b1d4c58
+Create Date: 2026-10-17 15:48:21.604713
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e1f09d3c27'
+down_revision: Union[str, None] = 'a92f6b1d4c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('is_overdue', sa.Boolean(), server_default=sa.false(), nullable=False))
+    # Уже просроченные задачи отметит первый запуск mark_overdue_tasks порциями,
+    # а не одна долгая транзакция миграции.
+    op.create_index(
+        'ix_tasks_deadline_overdue_candidate',
+        'tasks',
+        ['deadline'],
+        unique=False,
+        postgresql_where=sa.text("status <> 'COMPLETED' AND NOT is_overdue AND deadline IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_deadline_overdue_candidate', table_name='tasks', postgresql_where=sa.text("status <> 'COMPLETED' AND NOT is_overdue AND deadline IS NOT NULL"))
+    op.drop_column('tasks', 'is_overdue')
@@ -0,0 +1,43 @@
+"""user task counters
+
+Revision ID: c41a7f0e2b93
+Revises: 8b2e4c6a9d10
+Create Date: 2026-10-17 12:40:03.271950
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41a7f0e2b93'
+down_revision: Union[str, None] = '8b2e4c6a9d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_task_counters',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column(
+            'status',
+            postgresql.ENUM(name='taskstatus', create_type=False),
+            nullable=False,
+        ),
+        sa.Column('count', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'status'),
+    )
+    # Заполняем счётчики по уже существующим задачам.
+    op.execute(
+        'INSERT INTO user_task_counters (user_id, status, count) '
+        'SELECT owner_id, status, count(*) FROM tasks GROUP BY owner_id, status'
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_task_counters')
@@ -0,0 +1,58 @@
+"""tasks archive
+
+Revision ID: d07c4e8b5a13
+Revises: b6e1f09d3c27
+Create Date: 2026-10-17 16:31:09.257840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd07c4e8b5a13'
+down_revision: Union[str, None] = 'b6e1f09d3c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'tasks_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), server_default='', nullable=False),
+        sa.Column(
+            'status',
+            postgresql.ENUM(name='taskstatus', create_type=False),
+            nullable=False,
+        ),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('deadline', sa.DateTime(), nullable=True),
+        sa.Column('is_overdue', sa.Boolean(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('data_version', sa.BigInteger(), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_tasks_archive_owner_id_created_at_id', 'tasks_archive', ['owner_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_tasks_archive_owner_id_deadline_id', 'tasks_archive', ['owner_id', 'deadline', 'id'], unique=False)
+    op.create_index(
+        'ix_tasks_updated_at_completed',
+        'tasks',
+        ['updated_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'COMPLETED'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_updated_at_completed', table_name='tasks', postgresql_where=sa.text("status = 'COMPLETED'"))
+    op.drop_index('ix_tasks_archive_owner_id_deadline_id', table_name='tasks_archive')
+    op.drop_index('ix_tasks_archive_owner_id_created_at_id', table_name='tasks_archive')
+    op.drop_table('tasks_archive')
@@ -0,0 +1,29 @@
+"""user data version
+
+Revision ID: e5d08a3b71c2
+Revises: c41a7f0e2b93
+Create Date: 2026-10-17 13:25:48.610392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5d08a3b71c2'
+down_revision: Union[str, None] = 'c41a7f0e2b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column('data_version', sa.BigInteger(), server_default='0', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'data_version')
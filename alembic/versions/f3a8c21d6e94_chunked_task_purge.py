@@ -0,0 +1,78 @@
+"""chunked task purge
+
+Revision ID: f3a8c21d6e94
+Revises: d07c4e8b5a13
+Create Date: 2026-10-17 17:12:55.381906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8c21d6e94'
+down_revision: Union[str, None] = 'd07c4e8b5a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('tasks_visible_from_id', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('users', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+
+    op.create_table(
+        'task_purges',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('max_task_id', sa.Integer(), nullable=False),
+        sa.Column('delete_user', sa.Boolean(), server_default=sa.false(), nullable=False),
+        sa.Column('total', sa.BigInteger(), nullable=False),
+        sa.Column('deleted', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_task_purges_id_pending',
+        'task_purges',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text('finished_at IS NULL'),
+    )
+
+    # Задачи, скрытые до фоновой очистки, не записываются как удалённые:
+    # клиенты узнают о таком удалении по 410 на запрос изменений.
+    op.execute('''
+        CREATE OR REPLACE FUNCTION tasks_record_tombstones() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO task_tombstones (task_id, owner_id, data_version)
+            SELECT deleted_tasks.id, deleted_tasks.owner_id, users.data_version
+            FROM deleted_tasks JOIN users ON users.id = deleted_tasks.owner_id
+            WHERE deleted_tasks.id > users.tasks_visible_from_id
+            ON CONFLICT (task_id) DO UPDATE
+            SET data_version = excluded.data_version, deleted_at = excluded.deleted_at;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    ''')
+
+
+def downgrade() -> None:
+    op.execute('''
+        CREATE OR REPLACE FUNCTION tasks_record_tombstones() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO task_tombstones (task_id, owner_id, data_version)
+            SELECT deleted_tasks.id, deleted_tasks.owner_id, users.data_version
+            FROM deleted_tasks JOIN users ON users.id = deleted_tasks.owner_id
+            ON CONFLICT (task_id) DO UPDATE
+            SET data_version = excluded.data_version, deleted_at = excluded.deleted_at;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    ''')
+    op.drop_index('ix_task_purges_id_pending', table_name='task_purges', postgresql_where=sa.text('finished_at IS NULL'))
+    op.drop_table('task_purges')
+    op.drop_column('users', 'deleted_at')
+    op.drop_column('users', 'tasks_visible_from_id')
@@ -1,14 +1,18 @@
 """
 Этот файл содержит конфигурацию приложения FastAPI, включая настройку middleware для логирования,
-а также настройку жизненного цикла приложения.
+ключей идемпотентности и сжатия ответов, а также настройку жизненного цикла приложения (подключение к базе данных и общему кэшу, фоновые задачи).
 """
 
 import os
 from fastapi import FastAPI
 from app.logs import log_middleware, logger
+from app.compression import CompressionMiddleware, compression_settings
+from app.cache import shared_cache
 from app.database import database_for_test, database_helper
+from app.jobs import start_jobs, stop_jobs
 from app.tasks.tasks_routes import router as task_router
 from app.users.users_routes import router as user_router
+from app.idempotency import IdempotencyMiddleware, idempotency_settings
 from uuid import uuid4
 from contextlib import asynccontextmanager
 
@@ -19,10 +23,17 @@ async def lifespan(app: FastAPI):
     try:
         if os.getenv("TESTING", None):
             app.dependency_overrides[database_helper.get_db] = database_for_test.get_db
-            await database_for_test.test_connection()
+            app.state.database = database_for_test
         else:
-            await database_helper.test_connection()
-        yield
+            app.state.database = database_helper
+        await app.state.database.test_connection()
+        await shared_cache.connect()
+        jobs = start_jobs(app.state.database)
+        try:
+            yield
+        finally:
+            await stop_jobs(jobs)
+            await shared_cache.close()
     except Exception as e:
         logger.bind(log_id=database_helper.log_id).error(
             f"Lifespan startup failed: {str(e)}"
@@ -49,6 +60,14 @@ app = FastAPI(
 )
 
 app.middleware("http")(log_middleware)
+app.add_middleware(IdempotencyMiddleware, ttl=idempotency_settings.IDEMPOTENCY_TTL)
+if compression_settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        min_size=compression_settings.COMPRESSION_MIN_SIZE,
+        gzip_level=compression_settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=compression_settings.COMPRESSION_BROTLI_QUALITY,
+    )
 
 
 app.include_router(task_router, tags=["tasks"])
@@ -0,0 +1,6 @@
+"""
+Модуль для работы с общим кэшем и шиной инвалидации на Redis.
+"""
+
+from .config import cache_settings
+from .service import SharedCache, shared_cache
@@ -0,0 +1,51 @@
+"""
+Этот файл содержит класс `CacheSettings`, который используется для загрузки настроек общего кэша
+на Redis из переменных окружения.
+
+Основные компоненты:
+    - CacheSettings: Класс для загрузки параметров общего кэша из переменных окружения.
+
+    Атрибуты:
+        - REDIS_URL (str | None): Адрес Redis. Если не задан, общий кэш отключён.
+        - CACHE_TTL (int): Время жизни записей общего кэша в секундах.
+        - CACHE_KEY_PREFIX (str): Префикс ключей и канала инвалидации в Redis.
+        - REDIS_SOCKET_TIMEOUT (float): Таймаут операций с Redis в секундах.
+        - REDIS_RETRY_INTERVAL (float): Пауза перед повторным обращением к недоступному Redis.
+        - REDIS_RETRY_MAX_INTERVAL (float): Максимальная пауза между попытками переподключения.
+"""
+
+import os
+
+from dotenv import load_dotenv
+from pydantic_settings import BaseSettings
+
+
+load_dotenv()
+
+
+class CacheSettings(BaseSettings):
+    """
+    Класс для загрузки и хранения параметров общего кэша из переменных окружения.
+
+    Атрибуты:
+        REDIS_URL (str | None): Адрес Redis, например `redis://localhost:6379/0`.
+            Если не задан, приложение работает только с базой данных.
+        CACHE_TTL (int): Время жизни записей общего кэша в секундах (по умолчанию 300).
+        CACHE_KEY_PREFIX (str): Префикс ключей и канала инвалидации (по умолчанию "todo").
+        REDIS_SOCKET_TIMEOUT (float): Таймаут подключения и операций с Redis в секундах
+            (по умолчанию 0.5).
+        REDIS_RETRY_INTERVAL (float): Сколько секунд не обращаться к Redis после ошибки
+            (по умолчанию 5). С этой паузы начинаются попытки переподключения.
+        REDIS_RETRY_MAX_INTERVAL (float): До какого значения удваивается пауза между
+            попытками переподключения к недоступному Redis (по умолчанию 60).
+    """
+
+    REDIS_URL: str | None = os.getenv("REDIS_URL") or None
+    CACHE_TTL: int = int(os.getenv("CACHE_TTL", 300))
+    CACHE_KEY_PREFIX: str = os.getenv("CACHE_KEY_PREFIX", "todo")
+    REDIS_SOCKET_TIMEOUT: float = float(os.getenv("REDIS_SOCKET_TIMEOUT", 0.5))
+    REDIS_RETRY_INTERVAL: float = float(os.getenv("REDIS_RETRY_INTERVAL", 5))
+    REDIS_RETRY_MAX_INTERVAL: float = float(os.getenv("REDIS_RETRY_MAX_INTERVAL", 60))
+
+
+cache_settings = CacheSettings()
@@ -0,0 +1,335 @@
+"""
+Этот файл содержит общий для всех воркеров кэш на Redis и шину инвалидации
+in-memory кэшей через pub/sub.
+
+Общий кэш хранит готовые тела ответов по ключам, в которые входит версия данных
+пользователя, поэтому записи не требуют удаления: после изменения данных запросы
+обращаются уже к новым ключам, а старые истекают по TTL. Шина инвалидации
+рассылает всем воркерам идентификаторы пользователей, чьи данные изменились,
+чтобы воркеры сбросили свои in-memory кэши.
+
+Основные компоненты:
+    - SharedCache: Клиент общего кэша и шины инвалидации.
+    - shared_cache: Экземпляр, используемый приложением.
+
+    Отказоустойчивость:
+        - Если Redis не настроен, клиент Redis не установлен или Redis недоступен,
+          все операции становятся пустыми, и приложение работает только с базой данных.
+        - После ошибки Redis не используется REDIS_RETRY_INTERVAL секунд, чтобы
+          запросы не ждали таймаутов.
+        - Если Redis недоступен при запуске или канал инвалидации разорван,
+          подключение повторяется в фоне с экспоненциально растущей паузой
+          (от REDIS_RETRY_INTERVAL до REDIS_RETRY_MAX_INTERVAL).
+        - Сообщения, которые не удалось отправить, запоминаются и отправляются
+          после восстановления связи (при переполнении — одно сообщение о сбросе
+          кэшей всех пользователей).
+        - После (пере)подключения к каналу in-memory кэши сбрасываются целиком:
+          сообщения других воркеров, отправленные во время разрыва, могли быть потеряны.
+"""
+
+import asyncio
+import time
+from typing import Callable
+from uuid import uuid4
+
+from app.logs import logger
+from .config import cache_settings
+
+try:
+    from redis import asyncio as aioredis
+except ImportError:
+    try:
+        import aioredis
+    except Exception:  # aioredis 2.0.1 не импортируется на Python 3.11.
+        aioredis = None
+
+
+# Сколько идентификаторов пользователей запоминается, пока Redis недоступен.
+_MISSED_LIMIT = 10_000
+# Сообщение о сбросе кэшей всех пользователей.
+_ALL_USERS = "*"
+
+
+async def _aclose(resource):
+    close = getattr(resource, "aclose", None) or resource.close
+    await close()
+
+
+class SharedCache:
+    """
+    Общий кэш на Redis и шина инвалидации in-memory кэшей.
+
+    Атрибуты:
+        url (str | None): Адрес Redis.
+        ttl (int): Время жизни записей в секундах.
+        prefix (str): Префикс ключей и канала инвалидации.
+        retry_interval (float): Пауза перед повторным обращением к Redis после ошибки.
+        retry_max_interval (float): Максимальная пауза между попытками переподключения.
+        socket_timeout (float): Таймаут операций с Redis в секундах.
+        client: Клиент Redis или None, если общий кэш не используется.
+
+    Методы:
+        connect(client): Подключается к Redis и подписывается на канал инвалидации.
+        close(): Отписывается от канала и закрывает подключение.
+        get(key): Получает значение из общего кэша.
+        set(key, value): Сохраняет значение в общий кэш.
+        on_invalidate(handler): Регистрирует обработчик сообщений инвалидации.
+        publish_invalidation(user_id): Рассылает другим воркерам сообщение об изменении
+            данных пользователя.
+    """
+
+    def __init__(
+        self,
+        url: str | None,
+        ttl: int,
+        prefix: str,
+        retry_interval: float,
+        socket_timeout: float,
+        retry_max_interval: float | None = None,
+    ):
+        self.url = url
+        self.ttl = ttl
+        self.prefix = prefix
+        self.retry_interval = retry_interval
+        self.retry_max_interval = max(retry_max_interval or 0, retry_interval)
+        self.socket_timeout = socket_timeout
+        self.client = None
+        self._redis = None
+        self.log_id = str(uuid4())
+        self._instance_id = uuid4().hex
+        self._channel = f"{prefix}:invalidate"
+        self._handlers: list[Callable[[int | None], None]] = []
+        self._unavailable_until = 0.0
+        self._listener: asyncio.Task | None = None
+        self._pending: set[asyncio.Task] = set()
+        self._missed: set[int] = set()
+        self._missed_all = False
+        self._resender: asyncio.Task | None = None
+
+    async def connect(self, client=None):
+        """
+        Подключается к Redis и запускает прослушивание канала инвалидации.
+
+        Если Redis недоступен, подключение повторяется в фоне.
+
+        Параметры:
+            client: Готовый клиент Redis (необязательное, используется в тестах).
+                По умолчанию клиент создаётся по REDIS_URL.
+        """
+
+        if client is None:
+            if not self.url:
+                return
+            if aioredis is None:
+                logger.bind(log_id=self.log_id).warning(
+                    "Redis client is not installed, shared cache is disabled."
+                )
+                return
+            client = aioredis.from_url(
+                self.url,
+                socket_timeout=self.socket_timeout,
+                socket_connect_timeout=self.socket_timeout,
+            )
+        self._redis = client
+        try:
+            await client.ping()
+        except Exception as e:
+            logger.bind(log_id=self.log_id).warning(
+                f"Redis is unavailable, retrying in the background: {str(e)}"
+            )
+            self._listener = asyncio.create_task(self._reconnect())
+            return
+
+        self._connected()
+        self._listener = asyncio.create_task(self._listen())
+
+    async def close(self):
+        """Останавливает прослушивание канала и закрывает подключение к Redis."""
+
+        for task in (self._listener, self._resender):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._listener = self._resender = None
+        await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._redis is not None:
+            await _aclose(self._redis)
+        self._redis = self.client = None
+
+    async def get(self, key: str) -> bytes | None:
+        """
+        Получает значение из общего кэша.
+
+        Возвращаемое значение:
+            bytes | None: Значение или None, если его нет или Redis недоступен.
+        """
+
+        if not self._available():
+            return None
+        try:
+            return await self.client.get(f"{self.prefix}:{key}")
+        except Exception as e:
+            self._failed(e)
+            return None
+
+    async def set(self, key: str, value: bytes):
+        """Сохраняет значение в общий кэш на время TTL; ошибки Redis игнорируются."""
+
+        if not self._available():
+            return
+        try:
+            await self.client.set(f"{self.prefix}:{key}", value, ex=self.ttl)
+        except Exception as e:
+            self._failed(e)
+
+    def on_invalidate(self, handler: Callable[[int | None], None]):
+        """
+        Регистрирует обработчик сообщений инвалидации.
+
+        Обработчик получает идентификатор пользователя, чьи данные изменились
+        в другом воркере, или None, если нужно сбросить данные всех пользователей.
+        """
+
+        self._handlers.append(handler)
+
+    def publish_invalidation(self, user_id: int):
+        """
+        Рассылает другим воркерам сообщение об изменении данных пользователя.
+
+        Не ожидает отправки, поэтому может вызываться из обработчиков фиксации
+        транзакции (run_after_commit). Если Redis недоступен, сообщение
+        отправляется после восстановления связи.
+        """
+
+        if self._redis is None:
+            return
+        if not self._available():
+            self._remember(user_id)
+            return
+        task = asyncio.get_running_loop().create_task(self._publish(user_id))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _publish(self, user_id: int):
+        try:
+            await self.client.publish(self._channel, f"{self._instance_id}:{user_id}")
+        except Exception as e:
+            self._failed(e)
+            self._remember(user_id)
+
+    def _remember(self, user_id: int):
+        if not self._missed_all:
+            self._missed.add(user_id)
+            if len(self._missed) > _MISSED_LIMIT:
+                self._missed.clear()
+                self._missed_all = True
+        # До подключения пропущенные сообщения отправит _listen.
+        if self.client is not None:
+            self._start_resend(self.retry_interval)
+
+    def _start_resend(self, delay: float):
+        if self._resender is None or self._resender.done():
+            self._resender = asyncio.get_running_loop().create_task(self._resend(delay))
+
+    async def _resend(self, delay: float):
+        while self._missed or self._missed_all:
+            await asyncio.sleep(delay)
+            try:
+                if self._missed_all:
+                    await self.client.publish(
+                        self._channel, f"{self._instance_id}:{_ALL_USERS}"
+                    )
+                    self._missed_all = False
+                while self._missed:
+                    user_id = next(iter(self._missed))
+                    await self.client.publish(
+                        self._channel, f"{self._instance_id}:{user_id}"
+                    )
+                    self._missed.discard(user_id)
+            except Exception as e:
+                self._failed(e)
+                delay = min(
+                    max(delay, self.retry_interval) * 2, self.retry_max_interval
+                )
+            else:
+                self._unavailable_until = 0.0
+
+    async def _reconnect(self):
+        delay = self.retry_interval
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self._redis.ping()
+                break
+            except Exception as e:
+                delay = min(delay * 2, self.retry_max_interval)
+                logger.bind(log_id=self.log_id).warning(
+                    f"Redis is still unavailable, next attempt in {delay} s: {str(e)}"
+                )
+        self._connected()
+        await self._listen()
+
+    def _connected(self):
+        self.client = self._redis
+        self._unavailable_until = 0.0
+        logger.bind(log_id=self.log_id).info("Shared cache connected.")
+
+    async def _listen(self):
+        delay = self.retry_interval
+        while True:
+            pubsub = None
+            try:
+                pubsub = self.client.pubsub()
+                await pubsub.subscribe(self._channel)
+                delay = self.retry_interval
+                self._unavailable_until = 0.0
+                self._notify(None)
+                if self._missed or self._missed_all:
+                    self._start_resend(0)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._dispatch(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.bind(log_id=self.log_id).warning(
+                    f"Shared cache invalidation channel failed: {str(e)}"
+                )
+            finally:
+                if pubsub is not None:
+                    await asyncio.gather(_aclose(pubsub), return_exceptions=True)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.retry_max_interval)
+
+    def _dispatch(self, data: bytes | str):
+        if isinstance(data, bytes):
+            data = data.decode()
+        instance_id, _, user_id = data.partition(":")
+        if instance_id != self._instance_id:
+            self._notify(None if user_id == _ALL_USERS else int(user_id))
+
+    def _notify(self, user_id: int | None):
+        for handler in self._handlers:
+            try:
+                handler(user_id)
+            except Exception as e:
+                logger.bind(log_id=self.log_id).error(
+                    f"Shared cache invalidation handler failed: {str(e)}"
+                )
+
+    def _available(self) -> bool:
+        return self.client is not None and time.monotonic() >= self._unavailable_until
+
+    def _failed(self, error: Exception):
+        self._unavailable_until = time.monotonic() + self.retry_interval
+        logger.bind(log_id=self.log_id).warning(f"Redis request failed: {str(error)}")
+
+
+shared_cache = SharedCache(
+    url=cache_settings.REDIS_URL,
+    ttl=cache_settings.CACHE_TTL,
+    prefix=cache_settings.CACHE_KEY_PREFIX,
+    retry_interval=cache_settings.REDIS_RETRY_INTERVAL,
+    socket_timeout=cache_settings.REDIS_SOCKET_TIMEOUT,
+    retry_max_interval=cache_settings.REDIS_RETRY_MAX_INTERVAL,
+)
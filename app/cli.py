@@ -0,0 +1,78 @@
+"""
+Этот файл содержит команды для обслуживания базы данных из командной строки.
+
+Команды:
+    - archive: Переносит завершённые задачи, не изменявшиеся дольше заданного времени,
+      в архив (tasks_archive). Выполняется теми же порциями, что и фоновая задача.
+
+Пример запуска:
+    python -m app.cli archive --older-than 7776000 --batch-size 1000
+"""
+
+import argparse
+import asyncio
+import sys
+from uuid import uuid4
+
+from app.database import database_helper, settings
+from app.logs import logger
+from app.tasks import archive_completed_tasks, task_settings
+
+
+async def archive(older_than: int, batch_size: int) -> int:
+    """
+    Переносит завершённые задачи в архив.
+
+    Параметры:
+        older_than (int): Сколько секунд задача должна оставаться без изменений.
+        batch_size (int): Число задач, переносимых в одной транзакции.
+
+    Возвращаемое значение:
+        int: Число перенесённых задач.
+    """
+
+    try:
+        async with database_helper.async_session() as db:
+            return await archive_completed_tasks(
+                db, older_than=older_than, batch_size=batch_size
+            )
+    finally:
+        await database_helper.engine.dispose()
+
+
+def main(argv: list[str] | None = None):
+    """Разбирает аргументы командной строки и выполняет команду."""
+
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    archive_parser = commands.add_parser(
+        "archive", help="Перенести завершённые задачи в архив."
+    )
+    archive_parser.add_argument(
+        "--older-than",
+        type=int,
+        default=task_settings.ARCHIVE_AFTER,
+        help="Сколько секунд задача должна оставаться без изменений "
+        "(по умолчанию TASKS_ARCHIVE_AFTER).",
+    )
+    archive_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=task_settings.ARCHIVE_BATCH_SIZE,
+        help="Число задач в одной транзакции (по умолчанию TASKS_ARCHIVE_BATCH_SIZE).",
+    )
+
+    args = parser.parse_args(argv)
+    log_id = str(uuid4())
+    try:
+        archived = asyncio.run(archive(args.older_than, args.batch_size))
+    except Exception as ex:
+        logger.bind(log_id=log_id).error(f"Archiving tasks failed: {ex}")
+        sys.exit(settings.EXIT_CODE_ERROR)
+    logger.bind(log_id=log_id).info(f"Archived {archived} completed tasks.")
+    print(archived)
+
+
+if __name__ == "__main__":
+    main()
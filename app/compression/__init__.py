@@ -0,0 +1,6 @@
+"""
+Модуль для сжатия ответов API (gzip или brotli).
+"""
+
+from .config import compression_settings
+from .service import CompressionMiddleware
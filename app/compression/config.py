@@ -0,0 +1,48 @@
+"""
+Этот файл содержит класс `CompressionSettings`, который используется для загрузки настроек
+сжатия ответов из переменных окружения.
+
+Основные компоненты:
+    - CompressionSettings: Класс для загрузки параметров сжатия из переменных окружения.
+
+    Атрибуты:
+        - COMPRESSION_ENABLED (bool): Включено ли сжатие ответов.
+        - COMPRESSION_MIN_SIZE (int): Минимальный размер тела ответа для сжатия.
+        - COMPRESSION_GZIP_LEVEL (int): Уровень сжатия gzip.
+        - COMPRESSION_BROTLI_QUALITY (int): Качество сжатия brotli.
+"""
+
+import os
+
+from dotenv import load_dotenv
+from pydantic_settings import BaseSettings
+
+
+load_dotenv()
+
+
+class CompressionSettings(BaseSettings):
+    """
+    Класс для загрузки и хранения параметров сжатия ответов из переменных окружения.
+
+    Атрибуты:
+        COMPRESSION_ENABLED (bool): Включено ли сжатие ответов (по умолчанию True).
+        COMPRESSION_MIN_SIZE (int): Ответы меньше этого размера в байтах отправляются
+            без сжатия (по умолчанию 1024). Для потоковых ответов без Content-Length
+            размер заранее неизвестен, и они сжимаются всегда.
+        COMPRESSION_GZIP_LEVEL (int): Уровень сжатия gzip от 1 до 9 (по умолчанию 6).
+        COMPRESSION_BROTLI_QUALITY (int): Качество сжатия brotli от 0 до 11
+            (по умолчанию 4).
+    """
+
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+
+
+compression_settings = CompressionSettings()
@@ -0,0 +1,214 @@
+"""
+Этот файл содержит ASGI middleware для сжатия ответов.
+
+Кодировка выбирается по заголовку Accept-Encoding запроса: brotli или gzip.
+Ответы меньше COMPRESSION_MIN_SIZE отправляются без сжатия, поэтому небольшие
+запросы не получают дополнительной задержки.
+
+Заголовок Vary: Accept-Encoding добавляется ко всем ответам, которые могли бы
+быть сжаты (по типу содержимого), в том числе отправленным без сжатия из-за
+размера или заголовка Accept-Encoding запроса: иначе промежуточный кэш может
+отдать несжатую копию клиенту, ожидающему сжатую, и наоборот.
+
+Основные компоненты:
+    - CompressionMiddleware: Middleware для сжатия ответов.
+
+    Потоковые ответы:
+        - Тело не буферизуется: каждая часть ответа сжимается и сразу отправляется
+          клиенту (для gzip со сбросом буфера Z_SYNC_FLUSH), поэтому клиент получает
+          данные экспорта по мере их формирования.
+        - Если размер потокового ответа известен из Content-Length и меньше порога,
+          ответ отправляется без сжатия.
+"""
+
+import zlib
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/msgpack",
+    "application/xml",
+    "application/javascript",
+)
+
+
+def _accepted_encodings(accept_encoding: str) -> dict[str, float]:
+    encodings = {}
+    for item in accept_encoding.split(","):
+        coding, *params = item.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        coding = coding.strip().lower()
+        if coding:
+            encodings[coding] = quality
+    return encodings
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware, сжимающее ответы gzip или brotli.
+
+    Атрибуты:
+        app (ASGIApp): Приложение, ответы которого сжимаются.
+        min_size (int): Минимальный размер тела ответа для сжатия в байтах.
+        gzip_level (int): Уровень сжатия gzip.
+        brotli_quality (int): Качество сжатия brotli.
+
+    Методы:
+        choose_encoding(accept_encoding): Выбирает кодировку по заголовку Accept-Encoding.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        min_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.app = app
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = self.choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def choose_encoding(self, accept_encoding: str) -> str | None:
+        """
+        Выбирает кодировку ответа.
+
+        При одинаковом весе (q) brotli предпочтительнее gzip.
+
+        Параметры:
+            accept_encoding (str): Значение заголовка Accept-Encoding.
+
+        Возвращаемое значение:
+            str | None: "br", "gzip" или None, если ответ не нужно сжимать.
+        """
+
+        encodings = _accepted_encodings(accept_encoding)
+        wildcard = encodings.get("*", 0.0)
+        best, best_quality = None, 0.0
+        for encoding in ("br", "gzip"):
+            quality = encodings.get(encoding, wildcard)
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def encoder(self, encoding: str) -> _GzipEncoder | _BrotliEncoder:
+        if encoding == "br":
+            return _BrotliEncoder(self.brotli_quality)
+        return _GzipEncoder(self.gzip_level)
+
+
+class _CompressionResponder:
+    """Состояние сжатия одного ответа."""
+
+    def __init__(
+        self, middleware: CompressionMiddleware, encoding: str | None, send: Send
+    ):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start: Message | None = None
+        self._encoder: _GzipEncoder | _BrotliEncoder | None = None
+        self._passthrough = False
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            self._start = message
+            headers = MutableHeaders(raw=message["headers"])
+            content_length = headers.get("content-length")
+            # 304 не содержит Content-Type, но заменяет ответ, который мог быть сжат.
+            compressible = "content-encoding" not in headers and (
+                message["status"] == 304
+                or headers.get("content-type", "").startswith(_COMPRESSIBLE_TYPES)
+            )
+            if compressible:
+                headers.add_vary_header("Accept-Encoding")
+            self._passthrough = (
+                not compressible
+                or self.encoding is None
+                or message["status"] < 200
+                or message["status"] in (204, 304)
+                or (
+                    content_length is not None
+                    and int(content_length) < self.middleware.min_size
+                )
+            )
+            if self._passthrough:
+                await self._send(message)
+            return
+
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self._encoder is None:
+            if not more_body and len(body) < self.middleware.min_size:
+                self._passthrough = True
+                await self._send(self._start)
+                await self._send(message)
+                return
+            self._encoder = self.middleware.encoder(self.encoding)
+            headers = MutableHeaders(raw=self._start["headers"])
+            headers["Content-Encoding"] = self.encoding
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                body = self._encoder.finish(body)
+                headers["Content-Length"] = str(len(body))
+                await self._send(self._start)
+                await self._send({**message, "body": body})
+                return
+            await self._send(self._start)
+
+        if more_body:
+            if not body:
+                return
+            body = self._encoder.compress(body)
+        else:
+            body = self._encoder.finish(body)
+        await self._send({**message, "body": body})
@@ -3,4 +3,4 @@
 """
 
 from .config import settings
-from .db import database_for_test, database_helper
+from .db import database_for_test, database_helper, run_after_commit
@@ -7,10 +7,15 @@
       а также создание сессий для работы с данными.
     - Объекты database_helper и database_for_test: Экземпляры класса Database, настроенные для работы с основной
       и тестовой базой данных соответственно.
+    - run_after_commit: Регистрация действий, которые выполняются только после успешного коммита сессии
+      (например, обновление in-memory индексов и кэшей).
 """
 
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from typing import Callable
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, SessionTransaction
 from app.logs import logger
 from .config import settings
 from sqlalchemy.sql import text
@@ -75,6 +80,65 @@ class Database:
             yield session
 
 
+_AFTER_COMMIT_KEY = "after_commit_callbacks"
+
+
+def run_after_commit(db: AsyncSession, callback: Callable[[], None]):
+    """
+    Регистрирует действие, которое будет выполнено после успешного коммита сессии.
+
+    Если транзакция будет откатана, действие отбрасывается. Действия, зарегистрированные
+    внутри точки сохранения (begin_nested), отбрасываются при её откате, но не при
+    откате других точек сохранения той же транзакции. Используется для
+    побочных эффектов вне базы данных, которые не должны применяться к
+    незафиксированным изменениям.
+
+    Параметры:
+        db (AsyncSession): Сессия, после коммита которой нужно выполнить действие.
+        callback (Callable[[], None]): Синхронная функция без аргументов.
+    """
+    session = db.sync_session
+    transaction = session.get_nested_transaction() or session.get_transaction()
+    session.info.setdefault(_AFTER_COMMIT_KEY, []).append((transaction, callback))
+
+
+def _within(transaction: SessionTransaction | None, ancestor: SessionTransaction):
+    while transaction is not None:
+        if transaction is ancestor:
+            return True
+        transaction = transaction.parent
+    return False
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit_callbacks(session: Session):
+    # Освобождение точки сохранения тоже вызывает after_commit: действия
+    # выполняются только после коммита всей транзакции.
+    if session.get_nested_transaction() is not None:
+        return
+    for _, callback in session.info.pop(_AFTER_COMMIT_KEY, []):
+        try:
+            callback()
+        except Exception as e:
+            logger.bind(log_id=str(uuid4())).error(
+                f"After-commit callback failed: {str(e)}"
+            )
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_after_commit_callbacks(session: Session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop(_AFTER_COMMIT_KEY, None)
+        return
+    callbacks = session.info.get(_AFTER_COMMIT_KEY)
+    if callbacks:
+        session.info[_AFTER_COMMIT_KEY] = [
+            (transaction, callback)
+            for transaction, callback in callbacks
+            if not _within(transaction, previous_transaction)
+        ]
+
+
 database_helper = Database(settings.dsn())
 
 database_for_test = Database(settings.dsn_for_test())
@@ -0,0 +1,6 @@
+"""
+Модуль для поддержки заголовка Idempotency-Key в POST-запросах.
+"""
+
+from .config import idempotency_settings
+from .service import IdempotencyMiddleware, prune_idempotency_keys
@@ -0,0 +1,39 @@
+"""
+Этот файл содержит класс `IdempotencySettings`, который используется для загрузки настроек
+ключей идемпотентности из переменных окружения.
+
+Основные компоненты:
+    - IdempotencySettings: Класс для загрузки параметров ключей идемпотентности
+      из переменных окружения.
+
+    Атрибуты:
+        - IDEMPOTENCY_TTL (int): Сколько секунд хранится ответ на запрос с ключом.
+        - IDEMPOTENCY_PRUNE_INTERVAL (int): Период удаления устаревших ключей.
+"""
+
+import os
+
+from dotenv import load_dotenv
+from pydantic_settings import BaseSettings
+
+
+load_dotenv()
+
+
+class IdempotencySettings(BaseSettings):
+    """
+    Класс для загрузки и хранения параметров ключей идемпотентности из переменных окружения.
+
+    Атрибуты:
+        IDEMPOTENCY_TTL (int): Сколько секунд повторный запрос с тем же ключом получает
+            сохранённый ответ (по умолчанию 86400, одни сутки). После этого ключ
+            можно использовать заново.
+        IDEMPOTENCY_PRUNE_INTERVAL (int): Период фоновой задачи удаления устаревших
+            ключей в секундах (по умолчанию 3600).
+    """
+
+    IDEMPOTENCY_TTL: int = int(os.getenv("IDEMPOTENCY_TTL", 86400))
+    IDEMPOTENCY_PRUNE_INTERVAL: int = int(os.getenv("IDEMPOTENCY_PRUNE_INTERVAL", 3600))
+
+
+idempotency_settings = IdempotencySettings()
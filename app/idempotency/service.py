@@ -0,0 +1,259 @@
+"""
+Этот файл содержит ASGI middleware для ключей идемпотентности POST-запросов.
+
+Если POST-запрос авторизованного пользователя содержит заголовок Idempotency-Key,
+ответ на него сохраняется в таблице idempotency_keys. Повторный запрос с тем же
+ключом получает сохранённый ответ (с заголовком Idempotent-Replayed) без повторного
+выполнения, поэтому повторы клиента при плохой связи не создают дубликаты задач.
+
+Основные компоненты:
+    - IdempotencyMiddleware: Middleware, сохраняющее и воспроизводящее ответы.
+    - prune_idempotency_keys: Фоновая задача удаления устаревших ключей.
+
+    Обработка ключа:
+        - Ключ занимается вставкой INSERT ... ON CONFLICT в отдельной транзакции
+          до выполнения запроса, поэтому из одновременных запросов с одним ключом
+          выполняется только один. Остальные получают 409, пока он не завершится.
+        - Ключ, использованный с другим методом, путём или телом запроса, даёт 422.
+        - Ответы с ошибкой сервера (5xx) не сохраняются: ключ освобождается,
+          и запрос можно повторить.
+        - Ключи пользователей не пересекаются; истёкший ключ занимается заново.
+
+    Ограничения:
+        - Учитываются только запросы с телом JSON или MessagePack: потоковый импорт
+          задач не буферизуется ради хэша тела.
+        - Ответ сохраняется после коммита запроса в отдельной транзакции. Если процесс
+          остановится между ними, ключ остаётся занятым (409) до истечения IDEMPOTENCY_TTL.
+"""
+
+from datetime import timedelta
+from hashlib import blake2b
+
+from fastapi import status
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database.db import Database
+from app.models import IdempotencyKey
+from app.security import decode_jwt
+from .config import idempotency_settings
+
+_MAX_KEY_LENGTH = 255
+_BODY_MEDIA_TYPES = ("application/json", "application/msgpack", "application/x-msgpack")
+
+
+def _user_id(authorization: str | None) -> int | None:
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return int(decode_jwt(token)["sub"])
+    except Exception:
+        return None
+
+
+async def _read_body(receive: Receive) -> bytes | None:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+def _key_filter(user_id: int, key: str):
+    return (IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware, обрабатывающее заголовок Idempotency-Key в POST-запросах.
+
+    Атрибуты:
+        app (ASGIApp): Приложение, запросы к которому обрабатываются.
+        ttl (int): Сколько секунд хранится сохранённый ответ.
+    """
+
+    def __init__(self, app: ASGIApp, ttl: int = 86400):
+        self.app = app
+        self.ttl = ttl
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        key = headers.get("idempotency-key")
+        content_type = headers.get("content-type", "application/json")
+        user_id = _user_id(headers.get("authorization"))
+        if (
+            key is None
+            or user_id is None
+            or content_type.split(";", 1)[0].strip().lower() not in _BODY_MEDIA_TYPES
+        ):
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > _MAX_KEY_LENGTH:
+            response = JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "detail": f"Idempotency-Key должен содержать от 1 до {_MAX_KEY_LENGTH} символов."
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        if body is None:
+            return
+        request_hash = blake2b(
+            b"\n".join(
+                (
+                    scope["method"].encode(),
+                    scope["path"].encode(),
+                    scope.get("query_string", b""),
+                    body,
+                )
+            ),
+            digest_size=16,
+        ).digest()
+
+        database: Database = scope["app"].state.database
+        try:
+            async with database.async_session() as db:
+                stored = await self._claim(db, user_id, key, request_hash)
+        except IntegrityError:
+            # Пользователь удалён: запрос завершится ошибкой авторизации.
+            stored = None
+        if stored is not None:
+            await self._replay(stored, request_hash)(scope, receive, send)
+            return
+
+        body_sent = False
+
+        async def replay_receive() -> Message:
+            nonlocal body_sent
+            if body_sent:
+                return await receive()
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        response_start = None
+        response_body = []
+
+        async def capture_send(message: Message):
+            nonlocal response_start
+            if message["type"] == "http.response.start":
+                response_start = message
+            elif message["type"] == "http.response.body":
+                response_body.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        finally:
+            async with database.async_session() as db:
+                if response_start is None or response_start["status"] >= 500:
+                    await db.execute(
+                        delete(IdempotencyKey).where(
+                            *_key_filter(user_id, key),
+                            IdempotencyKey.status_code.is_(None),
+                        )
+                    )
+                else:
+                    response_headers = Headers(raw=response_start["headers"])
+                    await db.execute(
+                        update(IdempotencyKey)
+                        .where(*_key_filter(user_id, key))
+                        .values(
+                            status_code=response_start["status"],
+                            content_type=response_headers.get("content-type"),
+                            body=b"".join(response_body),
+                        )
+                    )
+                await db.commit()
+
+    async def _claim(
+        self, db: AsyncSession, user_id: int, key: str, request_hash: bytes
+    ) -> IdempotencyKey | None:
+        """
+        Занимает ключ или возвращает уже существующую запись о нём.
+
+        Возвращаемое значение:
+            IdempotencyKey | None: None, если ключ занят этим запросом, иначе запись
+            о запросе, который занял ключ раньше.
+        """
+
+        claim = insert(IdempotencyKey).values(
+            user_id=user_id, key=key, request_hash=request_hash
+        )
+        # Истёкший, но ещё не удалённый ключ занимается заново.
+        claim = claim.on_conflict_do_update(
+            index_elements=[IdempotencyKey.user_id, IdempotencyKey.key],
+            set_={
+                "request_hash": claim.excluded.request_hash,
+                "status_code": None,
+                "content_type": None,
+                "body": None,
+                "created_at": func.now(),
+            },
+            where=IdempotencyKey.created_at
+            < func.localtimestamp() - timedelta(seconds=self.ttl),
+        ).returning(IdempotencyKey.user_id)
+        claimed = (await db.execute(claim)).first() is not None
+        stored = None
+        if not claimed:
+            stored = await db.scalar(
+                select(IdempotencyKey).where(*_key_filter(user_id, key))
+            )
+        await db.commit()
+        # Ключ мог быть освобождён после ошибки между вставкой и чтением.
+        if not claimed and stored is None:
+            stored = IdempotencyKey(request_hash=request_hash)
+        return stored
+
+    @staticmethod
+    def _replay(stored: IdempotencyKey, request_hash: bytes) -> Response:
+        if stored.request_hash != request_hash:
+            return JSONResponse(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                content={
+                    "detail": "Idempotency-Key уже использован с другим запросом."
+                },
+            )
+        if stored.status_code is None:
+            return JSONResponse(
+                status_code=status.HTTP_409_CONFLICT,
+                content={"detail": "Запрос с этим Idempotency-Key ещё выполняется."},
+            )
+        return Response(
+            content=stored.body,
+            status_code=stored.status_code,
+            media_type=stored.content_type,
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+
+async def prune_idempotency_keys(db: AsyncSession):
+    """
+    Удаляет ключи идемпотентности старше IDEMPOTENCY_TTL.
+
+    Атрибуты:
+        db (AsyncSession): Сессия базы данных.
+    """
+
+    await db.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.created_at
+            < func.localtimestamp()
+            - timedelta(seconds=idempotency_settings.IDEMPOTENCY_TTL)
+        )
+    )
+    await db.commit()
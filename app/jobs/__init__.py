@@ -0,0 +1,5 @@
+"""
+Модуль для запуска фоновых задач приложения.
+"""
+
+from .service import start_jobs, stop_jobs
@@ -0,0 +1,126 @@
+"""
+Этот файл содержит запуск и остановку фоновых задач приложения, которые выполняются
+периодически в том же цикле событий, что и обработка запросов.
+
+Основные компоненты:
+    - run_periodically: Цикл, выполняющий задачу с заданным периодом в отдельной сессии базы данных.
+    - start_jobs: Запуск всех фоновых задач приложения, включая планировщик напоминаний
+      о дедлайнах (вызывается при старте в lifespan).
+    - stop_jobs: Остановка фоновых задач (вызывается при завершении приложения).
+
+    Логирование:
+        - Для каждой выполненной задачи записывается информация о завершении.
+        - Ошибки задачи логируются и не останавливают её следующий запуск.
+"""
+
+import asyncio
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.db import Database
+from app.logs import logger
+from app.tasks import (
+    archive_completed_tasks,
+    deadline_scheduler,
+    mark_overdue_tasks,
+    prune_task_tombstones,
+    purge_deleted_tasks,
+    reconcile_task_counters,
+    task_settings,
+)
+from app.idempotency import idempotency_settings, prune_idempotency_keys
+
+
+async def run_periodically(
+    name: str,
+    interval: float,
+    job: Callable[[AsyncSession], Awaitable],
+    database: Database,
+):
+    """
+    Выполняет задачу с заданным периодом, открывая для каждого запуска новую сессию.
+
+    Параметры:
+        name (str): Имя задачи для логов.
+        interval (float): Период между запусками в секундах.
+        job (Callable[[AsyncSession], Awaitable]): Асинхронная функция, принимающая сессию.
+        database (Database): База данных, с которой работает приложение.
+    """
+
+    log_id = str(uuid4())
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with database.async_session() as db:
+                await job(db)
+            logger.bind(log_id=log_id).info(f"Background job {name} finished.")
+        except Exception as e:
+            logger.bind(log_id=log_id).error(f"Background job {name} failed: {str(e)}")
+
+
+def start_jobs(database: Database) -> list[asyncio.Task]:
+    """
+    Запускает фоновые задачи приложения.
+
+    Параметры:
+        database (Database): База данных, с которой работает приложение.
+
+    Возвращаемое значение:
+        list[asyncio.Task]: Запущенные задачи (передаются в stop_jobs при завершении).
+    """
+
+    periodic_jobs = [
+        (
+            "reconcile_task_counters",
+            task_settings.COUNTERS_RECONCILE_INTERVAL,
+            reconcile_task_counters,
+        ),
+        (
+            "prune_task_tombstones",
+            task_settings.TOMBSTONE_PRUNE_INTERVAL,
+            prune_task_tombstones,
+        ),
+        (
+            "mark_overdue_tasks",
+            task_settings.OVERDUE_SWEEP_INTERVAL,
+            mark_overdue_tasks,
+        ),
+        (
+            "archive_completed_tasks",
+            task_settings.ARCHIVE_INTERVAL,
+            archive_completed_tasks,
+        ),
+        (
+            "purge_deleted_tasks",
+            task_settings.PURGE_INTERVAL,
+            purge_deleted_tasks,
+        ),
+        (
+            "prune_idempotency_keys",
+            idempotency_settings.IDEMPOTENCY_PRUNE_INTERVAL,
+            prune_idempotency_keys,
+        ),
+    ]
+    jobs = [
+        asyncio.create_task(run_periodically(name, interval, job, database), name=name)
+        for name, interval, job in periodic_jobs
+    ]
+    jobs.append(
+        asyncio.create_task(deadline_scheduler.run(database), name="deadline_scheduler")
+    )
+    return jobs
+
+
+async def stop_jobs(jobs: list[asyncio.Task]):
+    """
+    Останавливает фоновые задачи и дожидается их завершения.
+
+    Параметры:
+        jobs (list[asyncio.Task]): Задачи, запущенные start_jobs.
+    """
+
+    for job in jobs:
+        job.cancel()
+    await asyncio.gather(*jobs, return_exceptions=True)
@@ -2,4 +2,18 @@
 Модуль для определения моделей данных для задач и пользователей.
 """
 
-from .models import Base, Task, User
+from .models import (
+    TASK_SEARCH_CONFIG,
+    Base,
+    TASK_COMPLETED,
+    TASK_OVERDUE_CANDIDATE,
+    TASK_PENDING_DEADLINE,
+    IdempotencyKey,
+    Task,
+    TaskArchive,
+    TaskPurge,
+    TaskReminder,
+    TaskTombstone,
+    User,
+    UserTaskCounter,
+)
@@ -7,6 +7,10 @@
     - Base: Базовый класс для всех моделей данных с использованием SQLAlchemy.
     - Task: Модель для задач с атрибутами, такими как заголовок, описание, статус и дедлайн.
     - User: Модель для пользователей с атрибутами, такими как имя пользователя, электронная почта и пароль.
+    - UserTaskCounter: Счётчик задач пользователя в определённом статусе.
+    - TaskTombstone: Запись об удалённой задаче для синхронизации изменений.
+    - TaskReminder: Отметка об отправленном напоминании о дедлайне задачи.
+    - IdempotencyKey: Ключ идемпотентности POST-запроса и сохранённый ответ.
 
     Связи между моделями:
         - Каждая задача связана с одним пользователем (владельцем).
@@ -15,9 +19,40 @@
 
 from datetime import datetime
 from app.tasks.schemas import TaskStatus
-from sqlalchemy import ForeignKey, func, Enum, Text
+from sqlalchemy import (
+    BigInteger,
+    Computed,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    SmallInteger,
+    String,
+    func,
+    Enum,
+    Text,
+    false,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
+# Конфигурация полнотекстового поиска. Используется "simple", так как заголовки
+# и описания задач пишутся на разных языках и не должны искажаться стеммингом.
+TASK_SEARCH_CONFIG = "simple"
+
+# Условие частичного индекса по незавершённым задачам, ещё не отмеченным как просроченные.
+TASK_OVERDUE_CANDIDATE = text(
+    "status <> 'COMPLETED' AND NOT is_overdue AND deadline IS NOT NULL"
+)
+
+# Условие частичного индекса по завершённым задачам, которые переносятся в архив.
+TASK_COMPLETED = text("status = 'COMPLETED'")
+
+# Условие частичного индекса по дедлайнам незавершённых задач. Запросы планировщика
+# напоминаний используют это же условие без параметров, чтобы индекс применялся
+# и в подготовленных (generic) планах запросов.
+TASK_PENDING_DEADLINE = text("status <> 'COMPLETED' AND deadline IS NOT NULL")
+
 
 class Base(DeclarativeBase):
     """
@@ -44,12 +79,60 @@ class Task(Base):
         deadline (datetime | None): Дедлайн задачи.
         owner_id (int): Идентификатор пользователя, который является владельцем задачи.
         owner (User): Связь с пользователем, владельцем задачи.
+        search_vector (str | None): Поисковый вектор (tsvector) по заголовку и описанию,
+            вычисляется базой данных и не загружается по умолчанию.
+        is_overdue (bool): Признак просроченной задачи. Проставляется фоновой задачей,
+            когда дедлайн незавершённой задачи прошёл, и сбрасывается при изменении дедлайна.
+        updated_at (datetime): Дата и время последнего изменения задачи.
+        data_version (int): Версия данных владельца, в которой задача изменялась последней.
+            Вместе с updated_at проставляется триггером базы данных; импорт через COPY
+            передаёт версию сам, и для его строк триггер не вызывается.
 
     Связи:
         - Связана с пользователем через поле owner_id.
+
+    Индексы:
+        - (owner_id, created_at, id): постраничная выдача и сортировка по дате создания.
+        - (owner_id, deadline, id): сортировка и фильтрация по дедлайну.
+        - (owner_id, status, deadline): фильтрация по статусу.
+        - GIN (owner_id, search_vector): полнотекстовый поиск по задачам пользователя.
+        - (owner_id, data_version): выборка изменений задач для синхронизации.
+        - Частичный (deadline, id) по незавершённым задачам с дедлайном: загрузка
+          ближайших дедлайнов планировщиком напоминаний.
+        - Частичный (deadline) по незавершённым и ещё не просроченным задачам: поиск
+          задач, которые нужно отметить просроченными.
+        - Частичный (updated_at) по завершённым задачам: поиск задач для переноса в архив.
     """
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_owner_id_created_at_id", "owner_id", "created_at", "id"),
+        Index("ix_tasks_owner_id_deadline_id", "owner_id", "deadline", "id"),
+        Index("ix_tasks_owner_id_status_deadline", "owner_id", "status", "deadline"),
+        Index(
+            "ix_tasks_owner_id_search_vector",
+            "owner_id",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+        Index("ix_tasks_owner_id_data_version", "owner_id", "data_version"),
+        Index(
+            "ix_tasks_deadline_id_pending",
+            "deadline",
+            "id",
+            postgresql_where=TASK_PENDING_DEADLINE,
+        ),
+        Index(
+            "ix_tasks_deadline_overdue_candidate",
+            "deadline",
+            postgresql_where=TASK_OVERDUE_CANDIDATE,
+        ),
+        Index(
+            "ix_tasks_updated_at_completed",
+            "updated_at",
+            postgresql_where=TASK_COMPLETED,
+        ),
+    )
 
     title: Mapped[str] = mapped_column(nullable=False)
     description: Mapped[str] = mapped_column(Text, default="", server_default="")
@@ -58,12 +141,83 @@ class Task(Base):
     )
     created_at: Mapped[datetime] = mapped_column(default=func.now(), nullable=False)
     deadline: Mapped[datetime | None] = mapped_column(nullable=True)
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"to_tsvector('{TASK_SEARCH_CONFIG}', "
+            "coalesce(title, '') || ' ' || coalesce(description, ''))",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+    is_overdue: Mapped[bool] = mapped_column(
+        default=False, server_default=false(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(), nullable=False
+    )
+    data_version: Mapped[int] = mapped_column(
+        BigInteger, server_default="0", nullable=False
+    )
 
     # Ссылка на пользователя
-    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    owner_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
     owner: Mapped["User"] = relationship(back_populates="tasks")
 
 
+class TaskArchive(Base):
+    """
+    Модель архивной задачи.
+
+    Завершённые задачи, которые не изменялись дольше ARCHIVE_AFTER, переносятся
+    сюда из таблицы tasks порциями, чтобы таблица и индексы активных задач
+    не разрастались. Задача сохраняет свой идентификатор и все поля.
+
+    Атрибуты:
+        id (int): Идентификатор задачи (тот же, что был в таблице tasks).
+        title (str): Заголовок задачи.
+        description (str): Описание задачи.
+        status (TaskStatus): Статус задачи.
+        created_at (datetime): Дата и время создания задачи.
+        deadline (datetime | None): Дедлайн задачи.
+        is_overdue (bool): Признак просроченной задачи.
+        updated_at (datetime): Дата и время последнего изменения задачи до архивации.
+        data_version (int): Версия данных владельца, в которой задача изменялась последней.
+        owner_id (int): Идентификатор владельца задачи.
+        archived_at (datetime): Дата и время переноса в архив.
+
+    Индексы:
+        - (owner_id, created_at, id) и (owner_id, deadline, id): списки задач
+          вместе с архивом с теми же сортировками, что и по таблице tasks.
+    """
+
+    __tablename__ = "tasks_archive"
+    __table_args__ = (
+        Index(
+            "ix_tasks_archive_owner_id_created_at_id", "owner_id", "created_at", "id"
+        ),
+        Index("ix_tasks_archive_owner_id_deadline_id", "owner_id", "deadline", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    title: Mapped[str] = mapped_column(nullable=False)
+    description: Mapped[str] = mapped_column(Text, default="", server_default="")
+    status: Mapped[TaskStatus] = mapped_column(Enum(TaskStatus), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(nullable=False)
+    deadline: Mapped[datetime | None] = mapped_column(nullable=True)
+    is_overdue: Mapped[bool] = mapped_column(nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(nullable=False)
+    data_version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    owner_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    archived_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(), nullable=False
+    )
+
+
 class User(Base):
     """
     Модель для пользователя.
@@ -74,6 +228,14 @@ class User(Base):
         email (str): Электронная почта пользователя.
         password (str): Пароль пользователя.
         is_active (bool): Статус активности пользователя.
+        data_version (int): Версия данных пользователя. Увеличивается при каждом
+            изменении пользователя или его задач и используется для ETag.
+        sync_min_version (int): Минимальная версия, начиная с которой доступны
+            изменения задач (более старые записи об удалениях уже очищены).
+        tasks_visible_from_id (int): Задачи пользователя с id не больше этого значения
+            удалены и ожидают фоновой очистки (task_purges).
+        deleted_at (datetime | None): Дата и время удаления пользователя. Строка
+            пользователя удаляется после фоновой очистки его задач.
 
     Связи:
         - Пользователь может иметь несколько задач (связь с моделью Task).
@@ -85,7 +247,180 @@ class User(Base):
     email: Mapped[str] = mapped_column(nullable=False)
     password: Mapped[str] = mapped_column(nullable=False)
     is_active: Mapped[bool] = mapped_column(default=True)
+    data_version: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
+    sync_min_version: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
+    tasks_visible_from_id: Mapped[int] = mapped_column(
+        default=0, server_default="0", nullable=False
+    )
+    deleted_at: Mapped[datetime | None] = mapped_column(nullable=True)
+
+    tasks: Mapped[list["Task"]] = relationship(back_populates="owner")
+
+
+class UserTaskCounter(Base):
+    """
+    Модель счётчика задач пользователя в определённом статусе.
+
+    Счётчики обновляются в той же транзакции, что и изменения задач,
+    и позволяют получать статистику без подсчёта строк таблицы задач.
+
+    Атрибуты:
+        user_id (int): Идентификатор пользователя.
+        status (TaskStatus): Статус задач.
+        count (int): Количество задач пользователя в этом статусе.
+    """
+
+    __tablename__ = "user_task_counters"
+
+    # Составной первичный ключ (user_id, status) вместо id из Base.
+    id = None
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    status: Mapped[TaskStatus] = mapped_column(Enum(TaskStatus), primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+
 
-    tasks: Mapped[list["Task"]] = relationship(
-        back_populates="owner"
-    )
\ No newline at end of file
+class TaskTombstone(Base):
+    """
+    Модель записи об удалённой задаче.
+
+    Записи создаются триггером базы данных при удалении задач и позволяют клиентам
+    узнавать об удалениях при синхронизации изменений. Старые записи периодически
+    очищаются.
+
+    Атрибуты:
+        task_id (int): Идентификатор удалённой задачи.
+        owner_id (int): Идентификатор владельца задачи. Внешнего ключа нет, чтобы
+            записи не участвовали в каскадном удалении пользователя; записи удалённых
+            пользователей очищаются вместе с остальными старыми записями.
+        data_version (int): Версия данных владельца, в которой задача была удалена.
+        deleted_at (datetime): Дата и время удаления.
+
+    Индексы:
+        - (owner_id, data_version): выборка удалений для синхронизации.
+    """
+
+    __tablename__ = "task_tombstones"
+    __table_args__ = (
+        Index("ix_task_tombstones_owner_id_data_version", "owner_id", "data_version"),
+    )
+
+    id = None
+    task_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    owner_id: Mapped[int] = mapped_column(nullable=False)
+    data_version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(), nullable=False
+    )
+
+
+class TaskPurge(Base):
+    """
+    Модель фоновой очистки удалённых задач пользователя.
+
+    delete_all_tasks и удаление пользователя только скрывают задачи
+    (users.tasks_visible_from_id) и создают запись очистки, а сами строки
+    удаляются фоновой задачей порциями.
+
+    Атрибуты:
+        id (int): Идентификатор очистки.
+        user_id (int): Идентификатор пользователя. Внешнего ключа нет: запись
+            остаётся после удаления пользователя, чтобы можно было узнать результат.
+        max_task_id (int): Удаляются задачи пользователя с id не больше этого значения.
+        delete_user (bool): Удалить ли пользователя после удаления задач.
+        total (int): Примерное количество задач для удаления.
+        deleted (int): Количество уже удалённых задач.
+        created_at (datetime): Дата и время создания очистки.
+        finished_at (datetime | None): Дата и время завершения очистки.
+    """
+
+    __tablename__ = "task_purges"
+    __table_args__ = (
+        Index(
+            "ix_task_purges_id_pending",
+            "id",
+            postgresql_where=text("finished_at IS NULL"),
+        ),
+    )
+
+    user_id: Mapped[int] = mapped_column(nullable=False)
+    max_task_id: Mapped[int] = mapped_column(nullable=False)
+    delete_user: Mapped[bool] = mapped_column(
+        default=False, server_default=false(), nullable=False
+    )
+    total: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    deleted: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(), nullable=False
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(nullable=True)
+
+
+class TaskReminder(Base):
+    """
+    Модель отметки об отправленном напоминании о дедлайне задачи.
+
+    Отметка создаётся атомарно перед вызовом обработчика напоминаний, поэтому
+    напоминание об одном и том же дедлайне отправляется один раз, даже если
+    планировщик работает в нескольких воркерах. После изменения дедлайна
+    задача снова получит напоминание.
+
+    Атрибуты:
+        task_id (int): Идентификатор задачи.
+        deadline (datetime): Дедлайн, о котором отправлено напоминание.
+        sent_at (datetime): Дата и время отправки напоминания.
+    """
+
+    __tablename__ = "task_reminders"
+
+    id = None
+    task_id: Mapped[int] = mapped_column(
+        ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True
+    )
+    deadline: Mapped[datetime] = mapped_column(nullable=False)
+    sent_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
+
+
+class IdempotencyKey(Base):
+    """
+    Модель ключа идемпотентности POST-запроса пользователя.
+
+    Запись создаётся до выполнения запроса (status_code пустой, пока запрос
+    выполняется), затем в неё сохраняется ответ. Повторный запрос с тем же ключом
+    получает сохранённый ответ. Записи старше IDEMPOTENCY_TTL периодически удаляются.
+
+    Атрибуты:
+        user_id (int): Идентификатор пользователя.
+        key (str): Значение заголовка Idempotency-Key.
+        request_hash (bytes): Хэш метода, пути и тела запроса.
+        status_code (int | None): Статус сохранённого ответа.
+        content_type (str | None): Тип содержимого сохранённого ответа.
+        body (bytes | None): Тело сохранённого ответа.
+        created_at (datetime): Дата и время первого запроса с этим ключом.
+
+    Индексы:
+        - (created_at): удаление устаревших ключей.
+    """
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (Index("ix_idempotency_keys_created_at", "created_at"),)
+
+    id = None
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    request_hash: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    status_code: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
+    content_type: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    body: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(), nullable=False
+    )
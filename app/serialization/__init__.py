@@ -0,0 +1,10 @@
+"""
+Модуль для согласования формата тела запросов и ответов API (JSON или MessagePack).
+"""
+
+from .service import (
+    MSGPACK_MEDIA_TYPE,
+    MsgPackResponse,
+    MsgPackRoute,
+    accepts_msgpack,
+)
@@ -0,0 +1,152 @@
+"""
+Этот файл содержит поддержку MessagePack в маршрутах API.
+
+Маршруты, созданные с классом MsgPackRoute, принимают тело запроса
+с `Content-Type: application/msgpack` и возвращают ответ в MessagePack, если клиент
+передал `Accept: application/msgpack`. Схема данных не меняется: в MessagePack
+кодируются те же значения, что и в JSON (даты — строками ISO 8601).
+
+Основные компоненты:
+    - MSGPACK_MEDIA_TYPE: Тип содержимого MessagePack.
+    - accepts_msgpack: Проверка, предпочитает ли клиент ответ в MessagePack.
+    - MsgPackResponse: Ответ, сериализуемый в MessagePack.
+    - MsgPackRoute: Класс маршрута с согласованием формата.
+
+    Ограничения:
+        - Ответы с ошибками (HTTPException, ошибки валидации) формируются обработчиками
+          исключений приложения и остаются в JSON.
+        - Потоковые ответы (экспорт задач) не преобразуются.
+"""
+
+import json
+from typing import Any, Callable, Coroutine
+
+import msgpack
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from starlette.responses import StreamingResponse
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+_JSON_MEDIA_RANGES = ("application/json", "application/*", "*/*")
+
+
+def _media_type(value: str) -> str:
+    return value.split(";", 1)[0].strip().lower()
+
+
+def accepts_msgpack(request: Request) -> bool:
+    """
+    Проверяет заголовок Accept запроса.
+
+    MessagePack выбирается, только если он указан явно и его вес (q) не меньше,
+    чем у JSON. Без заголовка Accept ответ остаётся в JSON.
+
+    Параметры:
+        request (Request): Текущий запрос.
+
+    Возвращаемое значение:
+        bool: True, если ответ нужно вернуть в MessagePack.
+    """
+
+    accept = request.headers.get("accept")
+    if not accept:
+        return False
+    msgpack_quality = json_quality = 0.0
+    for media_range in accept.split(","):
+        media_type, *params = media_range.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        media_type = _media_type(media_type)
+        if media_type in _MSGPACK_MEDIA_TYPES:
+            msgpack_quality = max(msgpack_quality, quality)
+        elif media_type in _JSON_MEDIA_RANGES:
+            json_quality = max(json_quality, quality)
+    return msgpack_quality > 0 and msgpack_quality >= json_quality
+
+
+class MsgPackResponse(Response):
+    """
+    Ответ, тело которого сериализуется в MessagePack.
+    """
+
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content)
+
+
+class MsgPackRequest(Request):
+    """
+    Запрос с телом в MessagePack.
+
+    FastAPI разбирает тело только для JSON, поэтому такой запрос представляется
+    обработчику как JSON, а json() декодирует MessagePack.
+    """
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = msgpack.unpackb(await self.body())
+        return self._json
+
+
+def _msgpack_request(request: Request) -> Request:
+    headers = [
+        (name, value)
+        for name, value in request.scope["headers"]
+        if name != b"content-type"
+    ]
+    headers.append((b"content-type", b"application/json"))
+    return MsgPackRequest({**request.scope, "headers": headers}, request.receive)
+
+
+def _to_msgpack(response: Response) -> Response:
+    # Ответы, сформированные маршрутом вручную (например, готовое тело из кэша),
+    # перекодируются из JSON.
+    if isinstance(response, StreamingResponse) or not response.body:
+        return response
+    if _media_type(response.headers.get("content-type", "")) != "application/json":
+        return response
+    response.body = msgpack.packb(json.loads(response.body))
+    response.media_type = MSGPACK_MEDIA_TYPE
+    response.headers["content-type"] = MSGPACK_MEDIA_TYPE
+    response.headers["content-length"] = str(len(response.body))
+    return response
+
+
+class MsgPackRoute(APIRoute):
+    """
+    Маршрут, поддерживающий MessagePack в теле запроса и ответа.
+
+    Для маршрута строятся два обработчика: с классом ответа маршрута (JSON)
+    и с MsgPackResponse. Обработчик выбирается по заголовку Accept, поэтому
+    ответ сериализуется сразу в нужный формат. Все ответы содержат `Vary: Accept`.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        json_handler = super().get_route_handler()
+        response_class = self.response_class
+        self.response_class = MsgPackResponse
+        try:
+            msgpack_handler = super().get_route_handler()
+        finally:
+            self.response_class = response_class
+
+        async def route_handler(request: Request) -> Response:
+            content_type = request.headers.get("content-type")
+            if content_type and _media_type(content_type) in _MSGPACK_MEDIA_TYPES:
+                request = _msgpack_request(request)
+            if accepts_msgpack(request):
+                response = _to_msgpack(await msgpack_handler(request))
+            else:
+                response = await json_handler(request)
+            response.headers.add_vary_header("Accept")
+            return response
+
+        return route_handler
@@ -3,5 +3,14 @@
 для работы с пользователями и задачами в приложении.
 """
 
-from .task import get_task_by_id
-from .user import get_user, change_username, change_email
+from .etag import etag_headers, make_etag, not_modified
+from .pagination import decode_cursor, encode_cursor
+from .task import get_task_by_id, task_not_found, task_visible
+from .user import (
+    get_user,
+    change_username,
+    change_email,
+    user_not_found,
+    bump_data_version,
+    get_data_version,
+)
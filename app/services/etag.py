@@ -0,0 +1,77 @@
+"""
+Этот файл содержит функции для условных GET-запросов: формирование слабого ETag
+по версии данных пользователя и проверку заголовка If-None-Match.
+
+Основные функции:
+    - make_etag: Формирование слабого ETag.
+    - etag_headers: Заголовки ответа с ETag.
+    - not_modified: Проверка If-None-Match и подготовка ответа 304.
+"""
+
+from hashlib import blake2b
+
+from fastapi import Request, Response, status
+
+
+def make_etag(version: int, *parts) -> str:
+    """
+    Формирует слабый ETag по версии данных и параметрам запроса.
+
+    Параметры:
+        version (int): Версия данных пользователя.
+        *parts: Остальные значения, от которых зависит ответ (пользователь, параметры запроса).
+
+    Возвращаемое значение:
+        str: Слабый ETag вида `W/"<версия>-<хэш>"`.
+    """
+
+    digest = blake2b(repr(parts).encode(), digest_size=8).hexdigest()
+    return f'W/"{version}-{digest}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match использует слабое сравнение: префикс W/ не учитывается.
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(",")
+    )
+
+
+def etag_headers(etag: str) -> dict[str, str]:
+    """
+    Формирует заголовки ответа с ETag.
+
+    Cache-Control `no-cache` требует от клиента проверять ETag при каждом запросе.
+
+    Параметры:
+        etag (str): ETag текущего состояния данных.
+
+    Возвращаемое значение:
+        dict[str, str]: Заголовки ETag и Cache-Control.
+    """
+
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    """
+    Проверяет заголовок If-None-Match запроса.
+
+    Параметры:
+        request (Request): Текущий запрос.
+        etag (str): ETag текущего состояния данных.
+
+    Возвращаемое значение:
+        Response | None: Ответ 304 Not Modified, если у клиента актуальные данные,
+        иначе None.
+    """
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag)
+        )
+    return None
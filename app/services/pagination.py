@@ -0,0 +1,77 @@
+"""
+Этот файл содержит функции для работы с курсорами постраничной выдачи (keyset pagination).
+
+Курсор — это непрозрачная для клиента строка, в которой закодирован ключ сортировки
+последней отданной записи. Следующая страница выбирается условием «строго после ключа»,
+поэтому стоимость запроса не зависит от того, насколько далеко клиент пролистал список.
+
+Основные функции:
+    - encode_cursor: Кодирование ключа сортировки в строку курсора.
+    - decode_cursor: Декодирование строки курсора обратно в ключ сортировки.
+
+Исключения:
+    - HTTPException (400): Если курсор повреждён или не может быть декодирован.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(order_by: str, value: datetime | float | None, task_id: int) -> str:
+    """
+    Кодирует ключ сортировки задачи в строку курсора.
+
+    Параметры:
+        order_by (str): Порядок сортировки, для которого выдан курсор.
+        value (datetime | float | None): Значение поля сортировки у последней задачи
+            на странице (дата или релевантность при полнотекстовом поиске).
+        task_id (int): ID последней задачи на странице.
+
+    Возвращаемое значение:
+        str: Курсор в формате base64 (URL-safe, без выравнивания).
+    """
+
+    raw = json.dumps(
+        [
+            order_by,
+            value.isoformat() if isinstance(value, datetime) else value,
+            task_id,
+        ],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: str) -> tuple[datetime | float | None, int]:
+    """
+    Декодирует строку курсора в ключ сортировки задачи.
+
+    Параметры:
+        cursor (str): Курсор, полученный клиентом в поле `next_cursor`.
+        order_by (str): Порядок сортировки текущего запроса.
+
+    Возвращаемое значение:
+        tuple[datetime | float | None, int]: Значение поля сортировки и ID задачи,
+        после которой начинается страница.
+
+    Исключения:
+        - HTTPException (400): Если курсор некорректен или выдан для другой сортировки.
+    """
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_order_by, value, task_id = json.loads(base64.urlsafe_b64decode(padded))
+        if cursor_order_by != order_by:
+            raise ValueError("cursor was issued for another ordering")
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        elif value is not None:
+            value = float(value)
+        return value, int(task_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Некорректный курсор."
+        )
@@ -3,6 +3,8 @@
 
 Основные функции:
     - get_task_by_id: Получение задачи по её ID и ID пользователя.
+    - task_visible: Условие, скрывающее задачи, которые ожидают фонового удаления.
+    - task_not_found: Исключение для случая, когда задача не найдена или не принадлежит пользователю.
 
 Исключения:
     - HTTPException (404): Если задача не найдена или не принадлежит пользователю.
@@ -11,7 +13,44 @@
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from app.models import Task
+from app.models import Task, User
+
+
+def task_visible(user_id: int | None = None, task=Task):
+    """
+    Строит условие видимости задачи.
+
+    Задачи с id не больше users.tasks_visible_from_id владельца удалены
+    (delete_all_tasks, удаление пользователя) и ожидают фоновой очистки,
+    поэтому не должны попадать ни в ответы, ни в изменения.
+
+    Параметры:
+        user_id (int | None): ID владельца, если запрос выбирает задачи одного
+            пользователя. По умолчанию граница берётся у владельца каждой задачи.
+        task: Сущность задачи (Task или её псевдоним).
+
+    Возвращаемое значение:
+        ColumnElement[bool]: Условие для WHERE.
+    """
+
+    owner_id = task.owner_id if user_id is None else user_id
+    return task.id > (
+        select(User.tasks_visible_from_id).where(User.id == owner_id).scalar_subquery()
+    )
+
+
+def task_not_found() -> HTTPException:
+    """
+    Создаёт исключение для задачи, которая не найдена или не принадлежит пользователю.
+
+    Возвращаемое значение:
+        HTTPException: Исключение с кодом 404.
+    """
+
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Задача не найдена или не принадлежит пользователю.",
+    )
 
 
 async def get_task_by_id(*, db: AsyncSession, user_id: int, task_id: int):
@@ -31,12 +70,11 @@ async def get_task_by_id(*, db: AsyncSession, user_id: int, task_id: int):
     """
 
     result = await db.execute(
-        select(Task).filter(Task.id == task_id, Task.owner_id == user_id)
+        select(Task).filter(
+            Task.id == task_id, Task.owner_id == user_id, task_visible(user_id)
+        )
     )
     task = result.scalars().first()
     if task:
         return task
-    raise HTTPException(
-        status_code=status.HTTP_404_NOT_FOUND,
-        detail="Задача не найдена или не принадлежит пользователю.",
-    )
+    raise task_not_found()
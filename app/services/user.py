@@ -6,6 +6,9 @@
     - get_user: Получение пользователя по email, ID или имени пользователя.
     - change_username: Изменение имени пользователя.
     - change_email: Изменение email пользователя.
+    - user_not_found: Исключение для случая, когда пользователь не найден.
+    - bump_data_version: Увеличение версии данных пользователя при изменениях.
+    - get_data_version: Получение версии данных пользователя (для ETag).
 
 Исключения:
     - HTTPException (404): Если пользователь не найден.
@@ -14,12 +17,26 @@
 
 from fastapi import HTTPException, status
 from pydantic import EmailStr
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.models import User
 
 
+def user_not_found() -> HTTPException:
+    """
+    Создаёт исключение для пользователя, который не найден.
+
+    Возвращаемое значение:
+        HTTPException: Исключение с кодом 404.
+    """
+
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND, detail="Пользователь не найден."
+    )
+
+
 async def get_user(
     *,
     db: AsyncSession,
@@ -30,6 +47,9 @@ async def get_user(
     """
     Получает пользователя по указанным данным (email, ID или имени).
 
+    Поиск по email и имени не учитывает удалённых пользователей, ожидающих
+    фоновой очистки: их email и имя сразу доступны для регистрации и смены.
+
     Параметры:
         db (AsyncSession): Сессия для взаимодействия с базой данных.
         email (EmailStr, optional): Email пользователя для поиска.
@@ -44,18 +64,20 @@ async def get_user(
     """
 
     if email:
-        result = await db.execute(select(User).filter(User.email == email))
+        result = await db.execute(
+            select(User).filter(User.email == email, User.deleted_at.is_(None))
+        )
         return result.scalars().first()
     elif user_id:
         result = await db.execute(select(User).filter(User.id == user_id))
         return result.scalars().first()
     elif username:
-        result = await db.execute(select(User).filter(User.username == username))
+        result = await db.execute(
+            select(User).filter(User.username == username, User.deleted_at.is_(None))
+        )
         return result.scalars().first()
 
-    raise HTTPException(
-        status_code=status.HTTP_404_NOT_FOUND, detail="Пользователь не найден."
-    )
+    raise user_not_found()
 
 
 async def change_username(*, db: AsyncSession, user: User, new_username: str):
@@ -99,3 +121,57 @@ async def change_email(*, db: AsyncSession, user: User, new_email: EmailStr):
             detail=f"Пользователь с email {new_email} уже существует.",
         )
     user.email = new_email
+
+
+async def bump_data_version(db: AsyncSession, user_id: int) -> int:
+    """
+    Увеличивает версию данных пользователя в текущей транзакции.
+
+    Вызывается первым запросом каждой изменяющей транзакции: блокировка строки
+    пользователя упорядочивает его параллельные изменения, поэтому версия
+    меняется вместе с данными при фиксации транзакции.
+
+    Параметры:
+        db (AsyncSession): Сессия для взаимодействия с базой данных.
+        user_id (int): ID пользователя.
+
+    Возвращаемое значение:
+        int: Новая версия данных пользователя.
+
+    Исключения:
+        - HTTPException (404): Если пользователь не найден или удалён.
+    """
+
+    version = await db.scalar(
+        update(User)
+        .where(User.id == user_id, User.deleted_at.is_(None))
+        .values(data_version=User.data_version + 1)
+        .returning(User.data_version)
+        .execution_options(synchronize_session=False)
+    )
+    if version is None:
+        raise user_not_found()
+    return version
+
+
+async def get_data_version(db: AsyncSession, user_id: int) -> int:
+    """
+    Получает текущую версию данных пользователя.
+
+    Параметры:
+        db (AsyncSession): Сессия для взаимодействия с базой данных.
+        user_id (int): ID пользователя.
+
+    Возвращаемое значение:
+        int: Версия данных пользователя.
+
+    Исключения:
+        - HTTPException (404): Если пользователь не найден или удалён.
+    """
+
+    version = await db.scalar(
+        select(User.data_version).where(User.id == user_id, User.deleted_at.is_(None))
+    )
+    if version is None:
+        raise user_not_found()
+    return version
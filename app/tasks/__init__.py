@@ -4,11 +4,51 @@
 
 from .crud import (
     update_task_status,
+    archive_completed_tasks,
     create_task,
+    create_tasks,
     delete_all_tasks,
     delete_task,
+    export_tasks,
+    get_task_changes,
+    get_task_purge,
+    get_task_stats,
     get_tasks,
+    import_tasks,
+    invalidate_task_caches,
+    mark_overdue_tasks,
+    prune_task_tombstones,
+    purge_deleted_tasks,
+    quick_find_tasks,
+    run_task_batch,
+    schedule_tasks_purge,
+    search_tasks,
     update_task,
+    update_tasks_status,
+)
+from .config import task_settings
+from .counters import reconcile_task_counters
+from .list_cache import task_list_cache
+from .reminders import deadline_scheduler
+from .schemas import (
+    TaskBase,
+    TaskBatch,
+    TaskBatchOperationResult,
+    TaskBatchResult,
+    TaskBulkUpdateStatus,
+    TaskBulkUpdateStatusResult,
+    TaskChanges,
+    TaskImportError,
+    TaskImportResult,
+    TaskOrdering,
+    TaskPage,
+    TaskPurgeStatus,
+    TaskQuickFindResult,
+    TaskResponse,
+    TaskStats,
+    TaskStatus,
+    TaskUpdate,
+    TaskUpdateStatus,
 )
-from .schemas import TaskBase, TaskResponse, TaskUpdate, TaskUpdateStatus
 from .tasks_routes import router
+from .title_index import title_index
@@ -0,0 +1,171 @@
+"""
+Этот файл содержит класс `TaskSettings`, который используется для загрузки настроек работы с задачами
+из переменных окружения, например размеров страниц при постраничной выдаче задач.
+
+Основные компоненты:
+    - TaskSettings: Класс для загрузки параметров работы с задачами из переменных окружения.
+
+    Атрибуты:
+        - PAGE_SIZE (int): Размер страницы списка задач по умолчанию.
+        - PAGE_SIZE_MAX (int): Максимально допустимый размер страницы списка задач.
+        - TITLE_INDEX_MAX_ENTRIES (int): Лимит заголовков в in-memory индексе быстрого поиска.
+        - QUICK_FIND_SCORE_CUTOFF (float): Минимальная оценка схожести для быстрого поиска.
+        - QUICK_FIND_CANDIDATES_FACTOR (int): Во сколько раз больше лимита выбирается кандидатов
+          для быстрого поиска, если заголовки пользователя не помещаются в индекс.
+        - BULK_MAX_SIZE (int): Максимальное число задач в одном пакетном запросе.
+        - EXPORT_CHUNK_SIZE (int): Число строк, читаемых из серверного курсора за раз при экспорте.
+        - IMPORT_CHUNK_SIZE (int): Число строк, передаваемых в COPY за раз при импорте.
+        - IMPORT_MAX_ERRORS (int): Максимальное число ошибок, возвращаемых в ответе на импорт.
+        - COUNTERS_RECONCILE_INTERVAL (int): Период сверки счётчиков задач в секундах.
+        - TOMBSTONE_RETENTION (int): Срок хранения записей об удалённых задачах в секундах.
+        - TOMBSTONE_PRUNE_INTERVAL (int): Период очистки записей об удалённых задачах в секундах.
+        - LIST_CACHE_ENABLED (bool): Включён ли in-memory кэш страниц списка задач.
+        - LIST_CACHE_TTL (float): Время жизни страницы в кэше в секундах.
+        - LIST_CACHE_MAX_BYTES (int): Максимальный суммарный размер кэша страниц в байтах.
+        - REMINDER_WINDOW (int): Насколько вперёд планировщик загружает дедлайны, в секундах.
+        - REMINDER_BATCH_SIZE (int): Число дедлайнов, загружаемых планировщиком за раз.
+        - REMINDER_GRACE (int): За сколько секунд в прошлом отправляются пропущенные напоминания.
+        - REMINDER_RESCAN_INTERVAL (int): Период полного перечитывания окна дедлайнов в секундах.
+        - REMINDER_HOOK (str): Обработчик напоминаний в виде `модуль:функция`.
+        - OVERDUE_SWEEP_INTERVAL (int): Период отметки просроченных задач в секундах.
+        - OVERDUE_BATCH_SIZE (int): Число задач, отмечаемых просроченными в одной транзакции.
+        - ARCHIVE_AFTER (int): Возраст завершённой задачи в секундах для переноса в архив.
+        - ARCHIVE_BATCH_SIZE (int): Число задач, переносимых в архив в одной транзакции.
+        - ARCHIVE_INTERVAL (int): Период переноса завершённых задач в архив в секундах.
+        - PURGE_INTERVAL (int): Период фоновой очистки удалённых задач в секундах.
+        - PURGE_BATCH_SIZE (int): Число задач, удаляемых в одной транзакции очистки.
+        - PURGE_RETENTION (int): Срок хранения записей о завершённых очистках в секундах.
+"""
+
+import os
+
+from dotenv import load_dotenv
+from pydantic_settings import BaseSettings
+
+
+load_dotenv()
+
+
+class TaskSettings(BaseSettings):
+    """
+    Класс для загрузки и хранения параметров работы с задачами из переменных окружения.
+
+    Атрибуты:
+        PAGE_SIZE (int): Размер страницы списка задач по умолчанию (по умолчанию 50).
+        PAGE_SIZE_MAX (int): Максимальный размер страницы списка задач (по умолчанию 500).
+        TITLE_INDEX_MAX_ENTRIES (int): Максимальное число заголовков во всех пользовательских
+            индексах быстрого поиска вместе (по умолчанию 200000).
+        QUICK_FIND_SCORE_CUTOFF (float): Минимальная оценка схожести от 0 до 100
+            (по умолчанию 60).
+        QUICK_FIND_CANDIDATES_FACTOR (int): Число кандидатов из базы данных на один результат
+            быстрого поиска для пользователей, не помещающихся в индекс (по умолчанию 20).
+        BULK_MAX_SIZE (int): Максимальное число задач в одном пакетном запросе
+            (по умолчанию 1000).
+        EXPORT_CHUNK_SIZE (int): Число строк, читаемых из серверного курсора за раз
+            при экспорте задач (по умолчанию 1000).
+        IMPORT_CHUNK_SIZE (int): Число строк, передаваемых в COPY за раз
+            при импорте задач (по умолчанию 5000).
+        IMPORT_MAX_ERRORS (int): Максимальное число подробно описанных ошибок
+            в ответе на импорт (по умолчанию 100).
+        COUNTERS_RECONCILE_INTERVAL (int): Период сверки счётчиков задач с таблицей задач
+            в секундах (по умолчанию 86400, раз в сутки).
+        TOMBSTONE_RETENTION (int): Срок хранения записей об удалённых задачах в секундах
+            (по умолчанию 2592000, 30 дней). Клиент, не синхронизировавшийся дольше,
+            получает 410 и должен заново загрузить все задачи.
+        TOMBSTONE_PRUNE_INTERVAL (int): Период очистки записей об удалённых задачах
+            в секундах (по умолчанию 3600).
+        LIST_CACHE_ENABLED (bool): Включён ли in-memory кэш страниц списка задач
+            (по умолчанию включён, отключается значением `false` или `0`).
+        LIST_CACHE_TTL (float): Время жизни страницы в кэше в секундах (по умолчанию 30).
+            Ограничивает время, в течение которого память занимают страницы устаревших версий.
+        LIST_CACHE_MAX_BYTES (int): Максимальный суммарный размер тел ответов в кэше
+            в байтах (по умолчанию 67108864, 64 МиБ).
+        REMINDER_WINDOW (int): Размер скользящего окна дедлайнов, которые планировщик
+            держит в памяти, в секундах (по умолчанию 600).
+        REMINDER_BATCH_SIZE (int): Максимальное число дедлайнов, загружаемых за раз
+            (по умолчанию 10000). В памяти хранится не больше полутора порций.
+        REMINDER_GRACE (int): Напоминания о дедлайнах, наступивших за столько секунд
+            до запуска планировщика, отправляются при запуске (по умолчанию 3600).
+        REMINDER_RESCAN_INTERVAL (int): Период полного перечитывания окна, чтобы учесть
+            задачи, изменённые в других воркерах, в секундах (по умолчанию 300).
+        REMINDER_HOOK (str): Асинхронная функция, получающая напоминания, в виде
+            `модуль:функция` (по умолчанию запись в лог).
+        OVERDUE_SWEEP_INTERVAL (int): Период отметки просроченных задач в секундах
+            (по умолчанию 60).
+        OVERDUE_BATCH_SIZE (int): Число задач, отмечаемых просроченными в одной
+            транзакции (по умолчанию 1000). Ограничивает время удержания блокировок.
+        ARCHIVE_AFTER (int): Через сколько секунд после последнего изменения завершённая
+            задача переносится в архив (по умолчанию 7776000, 90 дней).
+        ARCHIVE_BATCH_SIZE (int): Число задач, переносимых в архив в одной транзакции
+            (по умолчанию 1000).
+        ARCHIVE_INTERVAL (int): Период переноса завершённых задач в архив в секундах
+            (по умолчанию 86400, раз в сутки). Перенос можно запустить и вручную:
+            `python -m app.cli archive`.
+        PURGE_INTERVAL (int): Период фоновой очистки задач, удалённых через
+            delete_all_tasks или вместе с пользователем, в секундах (по умолчанию 5).
+        PURGE_BATCH_SIZE (int): Число задач, удаляемых в одной транзакции очистки
+            (по умолчанию 5000). Ограничивает время блокировок и объём WAL транзакции.
+        PURGE_RETENTION (int): Срок хранения записей о завершённых очистках
+            в секундах (по умолчанию 604800, 7 дней).
+    """
+
+    PAGE_SIZE: int = int(os.getenv("TASKS_PAGE_SIZE", 50))
+    PAGE_SIZE_MAX: int = int(os.getenv("TASKS_PAGE_SIZE_MAX", 500))
+
+    TITLE_INDEX_MAX_ENTRIES: int = int(
+        os.getenv("TASKS_TITLE_INDEX_MAX_ENTRIES", 200_000)
+    )
+    QUICK_FIND_SCORE_CUTOFF: float = float(
+        os.getenv("TASKS_QUICK_FIND_SCORE_CUTOFF", 60)
+    )
+    QUICK_FIND_CANDIDATES_FACTOR: int = int(
+        os.getenv("TASKS_QUICK_FIND_CANDIDATES_FACTOR", 20)
+    )
+
+    BULK_MAX_SIZE: int = int(os.getenv("TASKS_BULK_MAX_SIZE", 1000))
+
+    EXPORT_CHUNK_SIZE: int = int(os.getenv("TASKS_EXPORT_CHUNK_SIZE", 1000))
+
+    IMPORT_CHUNK_SIZE: int = int(os.getenv("TASKS_IMPORT_CHUNK_SIZE", 5000))
+    IMPORT_MAX_ERRORS: int = int(os.getenv("TASKS_IMPORT_MAX_ERRORS", 100))
+
+    COUNTERS_RECONCILE_INTERVAL: int = int(
+        os.getenv("TASKS_COUNTERS_RECONCILE_INTERVAL", 86400)
+    )
+
+    TOMBSTONE_RETENTION: int = int(os.getenv("TASKS_TOMBSTONE_RETENTION", 2_592_000))
+    TOMBSTONE_PRUNE_INTERVAL: int = int(
+        os.getenv("TASKS_TOMBSTONE_PRUNE_INTERVAL", 3600)
+    )
+
+    LIST_CACHE_ENABLED: bool = os.getenv(
+        "TASKS_LIST_CACHE_ENABLED", "true"
+    ).lower() not in ("0", "false", "no")
+    LIST_CACHE_TTL: float = float(os.getenv("TASKS_LIST_CACHE_TTL", 30))
+    LIST_CACHE_MAX_BYTES: int = int(
+        os.getenv("TASKS_LIST_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+    )
+
+    REMINDER_WINDOW: int = int(os.getenv("TASKS_REMINDER_WINDOW", 600))
+    REMINDER_BATCH_SIZE: int = int(os.getenv("TASKS_REMINDER_BATCH_SIZE", 10_000))
+    REMINDER_GRACE: int = int(os.getenv("TASKS_REMINDER_GRACE", 3600))
+    REMINDER_RESCAN_INTERVAL: int = int(
+        os.getenv("TASKS_REMINDER_RESCAN_INTERVAL", 300)
+    )
+    REMINDER_HOOK: str = os.getenv(
+        "TASKS_REMINDER_HOOK", "app.tasks.reminders:log_reminders"
+    )
+
+    OVERDUE_SWEEP_INTERVAL: int = int(os.getenv("TASKS_OVERDUE_SWEEP_INTERVAL", 60))
+    OVERDUE_BATCH_SIZE: int = int(os.getenv("TASKS_OVERDUE_BATCH_SIZE", 1000))
+
+    ARCHIVE_AFTER: int = int(os.getenv("TASKS_ARCHIVE_AFTER", 7_776_000))
+    ARCHIVE_BATCH_SIZE: int = int(os.getenv("TASKS_ARCHIVE_BATCH_SIZE", 1000))
+    ARCHIVE_INTERVAL: int = int(os.getenv("TASKS_ARCHIVE_INTERVAL", 86400))
+
+    PURGE_INTERVAL: int = int(os.getenv("TASKS_PURGE_INTERVAL", 5))
+    PURGE_BATCH_SIZE: int = int(os.getenv("TASKS_PURGE_BATCH_SIZE", 5000))
+    PURGE_RETENTION: int = int(os.getenv("TASKS_PURGE_RETENTION", 604_800))
+
+
+task_settings = TaskSettings()
@@ -0,0 +1,159 @@
+"""
+Этот файл содержит функции для работы со счётчиками задач пользователей по статусам.
+
+Счётчики хранятся в таблице user_task_counters и изменяются в той же транзакции,
+что и сами задачи, поэтому статистика читается без подсчёта строк таблицы задач.
+Периодическая сверка пересчитывает счётчики по таблице задач и исправляет расхождения.
+
+Основные функции:
+    - adjust_task_counters: Изменение счётчиков пользователя на заданные величины.
+    - adjust_users_task_counters: Изменение счётчиков нескольких пользователей одним запросом.
+    - reset_task_counters: Обнуление всех счётчиков пользователя.
+    - get_task_counters: Получение счётчиков пользователя.
+    - reconcile_task_counters: Пересчёт счётчиков всех пользователей по таблице задач.
+"""
+
+from typing import Mapping
+
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Task, UserTaskCounter
+from app.services import task_visible
+from .schemas import TaskStatus
+
+# Ключ advisory-блокировки, чтобы сверку одновременно выполнял только один процесс.
+_RECONCILE_LOCK_KEY = 7_301_001
+
+
+async def adjust_task_counters(
+    db: AsyncSession, user_id: int, deltas: Mapping[TaskStatus, int]
+):
+    """
+    Изменяет счётчики задач пользователя одним запросом INSERT ... ON CONFLICT.
+
+    Не выполняет коммит: вызывается внутри транзакции, изменяющей задачи.
+
+    Параметры:
+        db (AsyncSession): Сессия базы данных.
+        user_id (int): Идентификатор пользователя.
+        deltas (Mapping[TaskStatus, int]): Изменение количества задач по статусам.
+    """
+
+    await adjust_users_task_counters(
+        db,
+        {(user_id, task_status): delta for task_status, delta in deltas.items()},
+    )
+
+
+async def adjust_users_task_counters(
+    db: AsyncSession, deltas: Mapping[tuple[int, TaskStatus], int]
+):
+    """
+    Изменяет счётчики задач нескольких пользователей одним запросом INSERT ... ON CONFLICT.
+
+    Не выполняет коммит: вызывается внутри транзакции, изменяющей задачи.
+
+    Параметры:
+        db (AsyncSession): Сессия базы данных.
+        deltas (Mapping[tuple[int, TaskStatus], int]): Изменение количества задач
+            по парам (идентификатор пользователя, статус).
+    """
+
+    # Строки счётчиков блокируются в одном и том же порядке, чтобы избежать взаимоблокировок.
+    rows = [
+        {"user_id": user_id, "status": task_status, "count": delta}
+        for (user_id, task_status), delta in sorted(
+            deltas.items(), key=lambda item: (item[0][0], item[0][1].name)
+        )
+        if delta
+    ]
+    if not rows:
+        return
+
+    statement = insert(UserTaskCounter).values(rows)
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[UserTaskCounter.user_id, UserTaskCounter.status],
+            set_={"count": UserTaskCounter.count + statement.excluded.count},
+        )
+    )
+
+
+async def reset_task_counters(db: AsyncSession, user_id: int):
+    """
+    Обнуляет счётчики задач пользователя. Не выполняет коммит.
+
+    Параметры:
+        db (AsyncSession): Сессия базы данных.
+        user_id (int): Идентификатор пользователя.
+    """
+
+    await db.execute(delete(UserTaskCounter).where(UserTaskCounter.user_id == user_id))
+
+
+async def get_task_counters(db: AsyncSession, user_id: int) -> dict[TaskStatus, int]:
+    """
+    Получает счётчики задач пользователя по всем статусам.
+
+    Параметры:
+        db (AsyncSession): Сессия базы данных.
+        user_id (int): Идентификатор пользователя.
+
+    Возвращаемое значение:
+        dict[TaskStatus, int]: Количество задач в каждом статусе (отсутствующие статусы — 0).
+    """
+
+    result = await db.execute(
+        select(UserTaskCounter.status, UserTaskCounter.count).where(
+            UserTaskCounter.user_id == user_id
+        )
+    )
+    counters = dict.fromkeys(TaskStatus, 0)
+    counters.update(result.tuples().all())
+    return counters
+
+
+async def reconcile_task_counters(db: AsyncSession) -> bool:
+    """
+    Пересчитывает счётчики всех пользователей по таблице задач и фиксирует результат.
+
+    Выполняется под advisory-блокировкой: если сверку уже выполняет другой процесс,
+    функция ничего не делает.
+
+    Параметры:
+        db (AsyncSession): Сессия базы данных.
+
+    Возвращаемое значение:
+        bool: True, если сверка выполнена, иначе False.
+    """
+
+    if not await db.scalar(select(func.pg_try_advisory_xact_lock(_RECONCILE_LOCK_KEY))):
+        await db.rollback()
+        return False
+
+    # Задачи, ожидающие фоновой очистки, в счётчиках уже не учитываются.
+    actual = (
+        select(Task.owner_id, Task.status, func.count())
+        .where(task_visible())
+        .group_by(Task.owner_id, Task.status)
+    )
+    statement = insert(UserTaskCounter).from_select(
+        ["user_id", "status", "count"], actual
+    )
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[UserTaskCounter.user_id, UserTaskCounter.status],
+            set_={"count": statement.excluded.count},
+        )
+    )
+    await db.execute(
+        delete(UserTaskCounter).where(
+            tuple_(UserTaskCounter.user_id, UserTaskCounter.status).not_in(
+                select(Task.owner_id, Task.status).where(task_visible()).distinct()
+            )
+        )
+    )
+    await db.commit()
+    return True
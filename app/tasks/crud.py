@@ -3,12 +3,130 @@
 для работы с задачами.
 """
 
-from datetime import datetime
-from sqlalchemy import delete
-from sqlalchemy.ext.asyncio import AsyncSession
+import re
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Sequence
+from pydantic import ValidationError
+from sqlalchemy import (
+    ARRAY,
+    Integer,
+    and_,
+    any_,
+    bindparam,
+    delete,
+    exists,
+    func,
+    insert,
+    or_,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import aliased
 from sqlalchemy.future import select
-from app.services import get_task_by_id
-from app.models import Task
+from app.cache import shared_cache
+from app.database import run_after_commit
+from fastapi import HTTPException, status as http_status
+from app.services import (
+    bump_data_version,
+    decode_cursor,
+    encode_cursor,
+    get_data_version,
+    get_task_by_id,
+    task_not_found,
+    task_visible,
+)
+from app.models import (
+    TASK_COMPLETED,
+    TASK_OVERDUE_CANDIDATE,
+    TASK_SEARCH_CONFIG,
+    Task,
+    TaskArchive,
+    TaskPurge,
+    TaskTombstone,
+    User,
+)
+from .config import task_settings
+from .counters import (
+    adjust_task_counters,
+    adjust_users_task_counters,
+    get_task_counters,
+    reset_task_counters,
+)
+from .schemas import (
+    TaskBase,
+    TaskBatchCreate,
+    TaskBatchDelete,
+    TaskBatchOperation,
+    TaskBatchOperationResult,
+    TaskBatchResult,
+    TaskBatchUpdate,
+    TaskOrdering,
+    TaskResponse,
+    TaskStatus,
+)
+from .importer import ImportRow
+from .list_cache import task_list_cache
+from .reminders import deadline_scheduler
+from .title_index import extract_titles, title_index
+
+
+# Столбцы задачи, которые возвращаются клиенту (TaskResponse). Запросы
+# UPDATE ... RETURNING возвращают только их, минуя загрузку ORM-объекта.
+_TASK_RESPONSE_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.created_at,
+    Task.deadline,
+    Task.is_overdue,
+)
+
+_SEARCH_ORDERING = "rank"
+
+# Граница видимости удалённого пользователя: скрывает все его задачи.
+_MAX_TASK_ID = 2**31 - 1
+
+_ORDERINGS = {
+    TaskOrdering.CREATED_AT: (Task.created_at, False),
+    TaskOrdering.CREATED_AT_DESC: (Task.created_at, True),
+    TaskOrdering.DEADLINE: (Task.deadline, False),
+    TaskOrdering.DEADLINE_DESC: (Task.deadline, True),
+}
+
+
+def invalidate_task_caches(db: AsyncSession, user_id: int):
+    """
+    Сбрасывает кэши списка задач пользователя после фиксации транзакции.
+
+    Кэш текущего воркера сбрасывается сразу, остальные воркеры получают
+    сообщение через шину инвалидации общего кэша.
+
+    Атрибуты:
+        db (AsyncSession): Сессия базы данных с изменяющей транзакцией.
+        user_id (int): Идентификатор пользователя, чьи задачи изменяются.
+    """
+
+    def invalidate():
+        task_list_cache.invalidate(user_id)
+        shared_cache.publish_invalidation(user_id)
+
+    run_after_commit(db, invalidate)
+
+
+def _on_shared_invalidation(user_id: int | None):
+    if user_id is None:
+        task_list_cache.clear()
+        title_index.clear()
+    else:
+        task_list_cache.invalidate(user_id)
+        title_index.drop(user_id)
+
+
+shared_cache.on_invalidate(_on_shared_invalidation)
 
 
 async def create_task(
@@ -17,6 +135,7 @@ async def create_task(
     title: str,
     description: str = None,
     deadline: datetime | None = None,
+    commit: bool = True,
 ):
     """
     Создаёт новую задачу в базе данных.
@@ -27,19 +146,171 @@ async def create_task(
         title (str): Заголовок задачи.
         description (str | None): Описание задачи (необязательное).
         deadline (datetime | None): Дедлайн задачи (необязательное).
+        commit (bool): Фиксировать ли транзакцию (по умолчанию True). При False
+            изменения только отправляются в базу данных (flush), а транзакцию
+            фиксирует вызывающий код (пакетные операции).
 
     Возвращает:
         task (Task): Созданная задача.
     """
+    version = await bump_data_version(db, user_id)
     task = Task(
         owner_id=user_id, title=title, description=description, deadline=deadline
     )
     db.add(task)
-    await db.commit()
+    await adjust_task_counters(db, user_id, {TaskStatus.NEW: 1})
+    run_after_commit(db, lambda: title_index.add(user_id, task.id, task.title, version))
+    run_after_commit(
+        db, lambda: deadline_scheduler.schedule(user_id, task.id, task.deadline)
+    )
+    invalidate_task_caches(db, user_id)
+    if commit:
+        await db.commit()
+    else:
+        await db.flush()
     await db.refresh(task)
     return task
 
 
+async def create_tasks(db: AsyncSession, user_id: int, tasks: list[TaskBase]):
+    """
+    Создаёт несколько задач одним запросом INSERT ... RETURNING.
+
+    Все задачи вставляются в одной транзакции: либо создаются все, либо ни одной.
+
+    Атрибуты:
+        db (AsyncSession): Сессия базы данных.
+        user_id (int): Идентификатор пользователя, который создает задачи.
+        tasks (list[TaskBase]): Данные создаваемых задач.
+
+    Возвращает:
+        list[Task]: Созданные задачи в порядке передачи.
+    """
+
+    if not tasks:
+        return []
+
+    rows = [
+        {
+            "owner_id": user_id,
+            "title": task.title,
+            "description": task.description or "",
+            "deadline": task.deadline,
+            "status": task.status or TaskStatus.NEW,
+        }
+        for task in tasks
+    ]
+    version = await bump_data_version(db, user_id)
+    result = await db.scalars(
+        insert(Task).returning(Task, sort_by_parameter_order=True), rows
+    )
+    created = result.all()
+    await adjust_task_counters(db, user_id, Counter(row["status"] for row in rows))
+
+    def index_tasks():
+        for task in created:
+            title_index.add(user_id, task.id, task.title, version)
+            deadline_scheduler.schedule(user_id, task.id, task.deadline)
+
+    run_after_commit(db, index_tasks)
+    invalidate_task_caches(db, user_id)
+    await db.commit()
+    return created
+
+
+_COPY_COLUMNS = (
+    "owner_id",
+    "title",
+    "description",
+    "status",
+    "created_at",
+    "deadline",
+    "data_version",
+)
+
+
+async def import_tasks(db: AsyncSession, user_id: int, rows: AsyncIterator[ImportRow]):
+    """
+    Импортирует задачи из потока записей через COPY.
+
+    Записи проверяются по одной моделью TaskBase; корректные накапливаются
+    порциями по IMPORT_CHUNK_SIZE и передаются в `copy_records_to_table`
+    asyncpg-соединения, на котором работает сессия. Весь импорт выполняется
+    в одной транзакции, некорректные записи пропускаются и попадают в отчёт.
+
+    Атрибуты:
+        db (AsyncSession): Сессия базы данных.
+        user_id (int): Идентификатор пользователя, для которого импортируются задачи.
+        rows (AsyncIterator[ImportRow]): Поток записей (номер строки, данные, ошибка разбора).
+
+    Возвращает:
+        tuple[int, int, list[tuple[int, list[str]]]]: Число импортированных записей,
+        число ошибочных записей и ошибки по строкам (не более IMPORT_MAX_ERRORS).
+    """
+
+    # Запрос открывает транзакцию сессии, в которой затем выполняется COPY.
+    # Версия записывается в строки сразу: триггер tasks_track_inserts вызывается
+    # только для вставок без версии и не читает users для каждой строки.
+    version = await bump_data_version(db, user_id)
+    created_at = await db.scalar(select(func.localtimestamp()))
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+
+    imported, failed, errors = 0, 0, []
+    records = []
+    statuses = Counter()
+
+    async def copy_records():
+        await driver_connection.copy_records_to_table(
+            Task.__tablename__, records=records, columns=_COPY_COLUMNS
+        )
+
+    async for line, data, parse_error in rows:
+        row_errors = [parse_error] if parse_error else []
+        if not row_errors:
+            try:
+                task = TaskBase.model_validate(data)
+            except ValidationError as e:
+                row_errors = [
+                    f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}"
+                    for error in e.errors()
+                ]
+        if row_errors:
+            failed += 1
+            if len(errors) < task_settings.IMPORT_MAX_ERRORS:
+                errors.append((line, row_errors))
+            continue
+
+        task_status = task.status or TaskStatus.NEW
+        statuses[task_status] += 1
+        records.append(
+            (
+                user_id,
+                task.title,
+                task.description or "",
+                task_status.name,
+                created_at,
+                task.deadline,
+                version,
+            )
+        )
+        if len(records) >= task_settings.IMPORT_CHUNK_SIZE:
+            await copy_records()
+            imported += len(records)
+            records.clear()
+
+    if records:
+        await copy_records()
+        imported += len(records)
+
+    await adjust_task_counters(db, user_id, statuses)
+    run_after_commit(db, lambda: title_index.drop(user_id))
+    invalidate_task_caches(db, user_id)
+    await db.commit()
+    return imported, failed, errors
+
+
 async def update_task(
     db: AsyncSession,
     user_id: int,
@@ -47,6 +318,7 @@ async def update_task(
     title: str | None = None,
     description: str | None = None,
     deadline: datetime | None = None,
+    commit: bool = True,
 ):
     """
     Обновляет существующую задачу в базе данных.
@@ -58,48 +330,694 @@ async def update_task(
         title (str | None): Новый заголовок задачи (необязательное).
         description (str | None): Новое описание задачи (необязательное).
         deadline (datetime | None): Новый срок выполнения задачи (необязательное).
+        commit (bool): Фиксировать ли транзакцию (по умолчанию True). При False
+            изменения только отправляются в базу данных (flush), а транзакцию
+            фиксирует вызывающий код (пакетные операции).
 
     Возвращает:
-        task (Task): Обновленная задача.
+        task (Row | Task): Обновленная задача (строка из UPDATE ... RETURNING).
 
     Исключения:
         HTTPException: В случае, если задача не найдена.
     """
 
-    task = await get_task_by_id(db=db, task_id=task_id, user_id=user_id)
-
+    values = {}
     if title:
-        task.title = title
-
+        values["title"] = title
     if description:
-        task.description = description
-
+        values["description"] = description
     if deadline:
-        task.deadline = deadline
+        # Новый дедлайн может быть в будущем; если он уже прошёл, задача снова
+        # будет отмечена просроченной при следующем запуске mark_overdue_tasks.
+        values["deadline"] = deadline
+        values["is_overdue"] = False
 
-    await db.commit()
-    await db.refresh(task)
+    if not values:
+        return await get_task_by_id(db=db, task_id=task_id, user_id=user_id)
+
+    version = await bump_data_version(db, user_id)
+    result = await db.execute(
+        update(Task)
+        .where(Task.id == task_id, Task.owner_id == user_id, task_visible(user_id))
+        .values(**values)
+        .returning(*_TASK_RESPONSE_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    task = result.first()
+    if task is None:
+        raise task_not_found()
+
+    if title:
+        run_after_commit(db, lambda: title_index.add(user_id, task_id, title, version))
+    if deadline:
+        run_after_commit(
+            db, lambda: deadline_scheduler.schedule(user_id, task_id, task.deadline)
+        )
+    invalidate_task_caches(db, user_id)
+    if commit:
+        await db.commit()
     return task
 
 
-async def get_tasks(db: AsyncSession, user_id: int):
+def _after_key(source, column, descending: bool, value: datetime | None, task_id: int):
+    """
+    Строит условие «строго после ключа (value, task_id)» для keyset-пагинации.
+
+    Порядок NULL соответствует порядку PostgreSQL по умолчанию: при сортировке
+    по возрастанию NULL идут в конце, при сортировке по убыванию — в начале.
+    Это позволяет читать оба направления одним индексом.
+
+    source — сущность, из которой читаются задачи (Task или _with_archive()),
+    column — столбец сортировки модели Task.
     """
-    Получает все задачи пользователя.
+
+    nullable = column.nullable
+    column, id_column = getattr(source, column.key), source.id
+
+    if not nullable:
+        if descending:
+            return tuple_(column, id_column) < (value, task_id)
+        return tuple_(column, id_column) > (value, task_id)
+
+    if descending:
+        if value is None:
+            return or_(and_(column.is_(None), id_column < task_id), column.is_not(None))
+        return or_(column < value, and_(column == value, id_column < task_id))
+
+    if value is None:
+        return and_(column.is_(None), id_column > task_id)
+    return or_(
+        column > value,
+        and_(column == value, id_column > task_id),
+        column.is_(None),
+    )
+
+
+def _with_archive():
+    """
+    Возвращает сущность Task, читающую задачи из tasks и tasks_archive (UNION ALL).
+
+    Условия по owner_id и сортировка переносятся PostgreSQL в обе ветви объединения,
+    поэтому каждая читается своим индексом (owner_id, ...), а результаты сливаются
+    без полной сортировки.
+    """
+
+    columns = [
+        column.name
+        for column in Task.__table__.columns
+        if column.name in TaskArchive.__table__.columns
+    ]
+    tasks = union_all(
+        select(*(Task.__table__.c[column] for column in columns)),
+        select(*(TaskArchive.__table__.c[column] for column in columns)),
+    ).subquery("tasks")
+    return aliased(Task, tasks, adapt_on_names=True)
+
+
+async def get_tasks(
+    db: AsyncSession,
+    user_id: int,
+    limit: int = task_settings.PAGE_SIZE,
+    after: str | None = None,
+    status: TaskStatus | None = None,
+    deadline_before: datetime | None = None,
+    deadline_after: datetime | None = None,
+    created_before: datetime | None = None,
+    created_after: datetime | None = None,
+    order_by: TaskOrdering = TaskOrdering.CREATED_AT,
+    include_archived: bool = False,
+    fields: Sequence[str] | None = None,
+):
+    """
+    Получает страницу задач пользователя с фильтрацией и сортировкой на стороне БД.
+
+    Используется keyset-пагинация: страница начинается строго после ключа
+    (поле сортировки, id), закодированного в курсоре, поэтому время ответа
+    не зависит от числа задач пользователя. Фильтры и сортировки опираются
+    на составные индексы по (owner_id, ...).
 
     Атрибуты:
         db (AsyncSession): Сессия базы данных.
         user_id (int): Идентификатор пользователя, чьи задачи нужно получить.
+        limit (int): Максимальное количество задач на странице.
+        after (str | None): Курсор, после которого начинается страница (необязательное).
+        status (TaskStatus | None): Фильтр по статусу задачи (необязательное).
+        deadline_before (datetime | None): Только задачи с дедлайном раньше указанного.
+        deadline_after (datetime | None): Только задачи с дедлайном позже указанного.
+        created_before (datetime | None): Только задачи, созданные раньше указанной даты.
+        created_after (datetime | None): Только задачи, созданные позже указанной даты.
+        order_by (TaskOrdering): Порядок сортировки (по умолчанию по дате создания).
+        include_archived (bool): Включать ли задачи из архива (по умолчанию False).
+        fields (Sequence[str] | None): Поля задачи, которые нужно выбрать
+            (по умолчанию все поля TaskResponse).
+
+    Возвращает:
+        tuple[list[Row], str | None]: Строки задач страницы (выбранные поля, поле
+        сортировки и id) и курсор следующей страницы.
+
+    Исключения:
+        HTTPException: В случае, если курсор некорректен.
+    """
+
+    column, descending = _ORDERINGS[order_by]
+    source = _with_archive() if include_archived else Task
+    sort_column = getattr(source, column.key)
+
+    # Выбираются только столбцы ответа, без загрузки ORM-объектов. Поле
+    # сортировки и id нужны для курсора следующей страницы.
+    if fields is None:
+        fields = [response_column.key for response_column in _TASK_RESPONSE_COLUMNS]
+    columns = dict.fromkeys((*fields, column.key, "id"))
+    query = select(*(getattr(source, name) for name in columns))
+    query = query.where(source.owner_id == user_id, task_visible(user_id, source))
+
+    if status:
+        query = query.where(source.status == status)
+    if deadline_before:
+        query = query.where(source.deadline < deadline_before)
+    if deadline_after:
+        query = query.where(source.deadline > deadline_after)
+    if created_before:
+        query = query.where(source.created_at < created_before)
+    if created_after:
+        query = query.where(source.created_at > created_after)
+
+    if after:
+        value, task_id = decode_cursor(after, order_by.value)
+        query = query.where(_after_key(source, column, descending, value, task_id))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), source.id.desc())
+    else:
+        query = query.order_by(sort_column, source.id)
+
+    result = await db.execute(query.limit(limit + 1))
+    tasks = result.all()
+
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        last = tasks[-1]
+        next_cursor = encode_cursor(order_by.value, getattr(last, column.key), last.id)
+
+    return tasks, next_cursor
+
+
+async def export_tasks(session_factory: async_sessionmaker, user_id: int):
+    """
+    Потоково выгружает все задачи пользователя в формате NDJSON.
+
+    Строки читаются из серверного курсора порциями по EXPORT_CHUNK_SIZE и сразу
+    сериализуются, поэтому потребление памяти не зависит от числа задач.
+    Генератор открывает собственную сессию: сессия запроса закрывается
+    до того, как начнётся отправка потокового ответа.
+
+    Атрибуты:
+        session_factory (async_sessionmaker): Фабрика сессий базы данных.
+        user_id (int): Идентификатор пользователя, чьи задачи нужно выгрузить.
 
     Возвращает:
-        list[Task]: Список задач пользователя.
+        AsyncIterator[bytes]: Порции NDJSON, по одной задаче на строку.
     """
 
-    result = await db.execute(select(Task).where(Task.owner_id == user_id))
-    return result.scalars().all()
+    query = (
+        select(*_TASK_RESPONSE_COLUMNS)
+        .where(Task.owner_id == user_id, task_visible(user_id))
+        .order_by(Task.created_at, Task.id)
+        .execution_options(yield_per=task_settings.EXPORT_CHUNK_SIZE)
+    )
+
+    async with session_factory() as db:
+        result = await db.stream(query)
+        async for rows in result.partitions():
+            yield b"".join(
+                TaskResponse.model_validate(row).model_dump_json().encode() + b"\n"
+                for row in rows
+            )
+
+
+async def search_tasks(
+    db: AsyncSession,
+    user_id: int,
+    query_text: str,
+    limit: int = task_settings.PAGE_SIZE,
+    after: str | None = None,
+):
+    """
+    Выполняет полнотекстовый поиск по заголовкам и описаниям задач пользователя.
+
+    Поиск идёт по вычисляемому столбцу search_vector через GIN-индекс
+    (owner_id, search_vector). Результаты упорядочены по убыванию релевантности
+    (ts_rank), при равной релевантности — по id, и выдаются постранично по курсору.
+
+    Атрибуты:
+        db (AsyncSession): Сессия базы данных.
+        user_id (int): Идентификатор пользователя, среди задач которого идёт поиск.
+        query_text (str): Поисковый запрос (синтаксис websearch_to_tsquery).
+        limit (int): Максимальное количество задач на странице.
+        after (str | None): Курсор, после которого начинается страница (необязательное).
+
+    Возвращает:
+        tuple[list[Task], str | None]: Найденные задачи страницы и курсор следующей страницы.
+
+    Исключения:
+        HTTPException: В случае, если курсор некорректен.
+    """
+
+    ts_query = func.websearch_to_tsquery(TASK_SEARCH_CONFIG, query_text)
+    rank = func.ts_rank(Task.search_vector, ts_query)
+
+    query = select(Task, rank).where(
+        Task.owner_id == user_id,
+        task_visible(user_id),
+        Task.search_vector.op("@@")(ts_query),
+    )
+
+    if after:
+        last_rank, task_id = decode_cursor(after, _SEARCH_ORDERING)
+        query = query.where(
+            or_(rank < last_rank, and_(rank == last_rank, Task.id > task_id))
+        )
+
+    result = await db.execute(query.order_by(rank.desc(), Task.id).limit(limit + 1))
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_task, last_rank = rows[-1]
+        next_cursor = encode_cursor(_SEARCH_ORDERING, last_rank, last_task.id)
+
+    return [task for task, _ in rows], next_cursor
+
+
+async def quick_find_tasks(
+    db: AsyncSession, user_id: int, query_text: str, limit: int = 10
+):
+    """
+    Выполняет нечёткий поиск задач пользователя по заголовку (для автодополнения).
+
+    Заголовки берутся из in-memory индекса пользователя. Индекс загружается из
+    базы данных одним запросом (id, title) при первом обращении и после изменений
+    задач в других воркерах (версия данных пользователя не совпадает с версией
+    индекса); изменения в текущем воркере применяются к индексу инкрементально.
+
+    Если заголовки пользователя не помещаются в индекс, до следующего изменения
+    его задач они не загружаются заново: кандидаты выбираются полнотекстовым
+    поиском по префиксам слов запроса и уже затем ранжируются RapidFuzz.
+
+    Атрибуты:
+        db (AsyncSession): Сессия базы данных.
+        user_id (int): Идентификатор пользователя, среди задач которого идёт поиск.
+        query_text (str): Строка запроса, допускающая опечатки.
+        limit (int): Максимальное количество результатов.
+
+    Возвращает:
+        list[tuple[int, str, float]]: Кортежи (id задачи, заголовок, оценка схожести).
+    """
+
+    cutoff = task_settings.QUICK_FIND_SCORE_CUTOFF
+    version = await get_data_version(db=db, user_id=user_id)
+
+    if title_index.is_oversized(user_id, version):
+        words = re.findall(r"\w+", query_text)
+        if not words:
+            return []
+        ts_query = func.to_tsquery(
+            TASK_SEARCH_CONFIG, " & ".join(f"{word}:*" for word in words)
+        )
+        result = await db.execute(
+            select(Task.id, Task.title)
+            .where(
+                Task.owner_id == user_id,
+                task_visible(user_id),
+                Task.search_vector.op("@@")(ts_query),
+            )
+            .limit(limit * task_settings.QUICK_FIND_CANDIDATES_FACTOR)
+        )
+        return extract_titles(dict(result.all()), query_text, limit, cutoff)
+
+    if not title_index.is_loaded(user_id, version):
+        load_version = title_index.begin_load(user_id)
+        try:
+            result = await db.execute(
+                select(Task.id, Task.title).where(
+                    Task.owner_id == user_id, task_visible(user_id)
+                )
+            )
+        except Exception:
+            title_index.cancel_load(user_id)
+            raise
+        titles = title_index.finish_load(user_id, load_version, version, result.all())
+
+        if not title_index.is_loaded(user_id, version):
+            return extract_titles(titles, query_text, limit, cutoff)
+
+    return title_index.search(user_id, query_text, limit, cutoff)
+
+
+async def get_task_stats(db: AsyncSession, user_id: int):
+    """
+    Получает статистику задач пользователя.
+
+    Количество задач по статусам берётся из счётчиков user_task_counters.
+    Просроченные задачи и задачи на ближайшую неделю зависят от текущего времени,
+    поэтому считаются одним запросом по диапазону индекса (owner_id, status, deadline),
+    который затрагивает только незавершённые задачи с дедлайном раньше чем через 7 дней.
+
+    Атрибуты:
+        db (AsyncSession): Сессия базы данных.
+        user_id (int): Идентификатор пользователя.
+
+    Возвращает:
+        tuple[dict[TaskStatus, int], int, int]: Количество задач по статусам,
+        количество просроченных задач и задач с дедлайном в ближайшие 7 дней.
+    """
+
+    by_status = await get_task_counters(db, user_id)
+
+    now = func.localtimestamp()
+    week_later = now + timedelta(days=7)
+    result = await db.execute(
+        select(
+            func.count().filter(Task.deadline < now),
+            func.count().filter(Task.deadline >= now),
+        ).where(
+            Task.owner_id == user_id,
+            task_visible(user_id),
+            Task.status != TaskStatus.COMPLETED,
+            Task.deadline < week_later,
+        )
+    )
+    overdue, due_this_week = result.one()
+    return by_status, overdue, due_this_week
+
+
+async def get_task_changes(db: AsyncSession, user_id: int, since: int):
+    """
+    Получает задачи, созданные, изменённые или удалённые после версии `since`.
+
+    Каждая изменяющая транзакция первым запросом увеличивает версию данных
+    пользователя, а триггеры базы данных проставляют её изменённым задачам
+    и записям об удалённых задачах. Поэтому изменения выбираются по диапазону
+    версий (since, token], где token — текущая версия: транзакции пользователя
+    упорядочены блокировкой его строки, и изменение с версией не больше token
+    уже зафиксировано к моменту её чтения.
+
+    Атрибуты:
+        db (AsyncSession): Сессия базы данных.
+        user_id (int): Идентификатор пользователя.
+        since (int): Токен из предыдущего ответа (0 — получить все задачи).
+
+    Возвращает:
+        tuple[list[Row], list[int], int]: Изменённые задачи, идентификаторы
+        удалённых задач и токен для следующего запроса.
+
+    Исключения:
+        HTTPException (400): Если токен больше текущей версии данных.
+        HTTPException (410): Если записи об удалениях после `since` уже очищены.
+    """
+
+    token = await get_data_version(db=db, user_id=user_id)
+    if since > token:
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail="Некорректный токен синхронизации.",
+        )
+
+    changed = await db.execute(
+        select(*_TASK_RESPONSE_COLUMNS)
+        .where(
+            Task.owner_id == user_id,
+            task_visible(user_id),
+            Task.data_version > since,
+            Task.data_version <= token,
+        )
+        .order_by(Task.data_version, Task.id)
+    )
+    changed = changed.all()
+    if not since:
+        return changed, [], token
+
+    deleted = await db.scalars(
+        select(TaskTombstone.task_id)
+        .where(
+            TaskTombstone.owner_id == user_id,
+            TaskTombstone.data_version > since,
+            TaskTombstone.data_version <= token,
+        )
+        .order_by(TaskTombstone.data_version, TaskTombstone.task_id)
+    )
+    deleted = deleted.all()
+
+    # Граница читается после записей об удалениях: если очистка успела удалить
+    # нужные записи, она уже подняла границу, и клиент получит 410.
+    sync_min_version = await db.scalar(
+        select(User.sync_min_version).where(User.id == user_id)
+    )
+    if since < sync_min_version:
+        raise HTTPException(
+            status_code=http_status.HTTP_410_GONE,
+            detail="Токен синхронизации устарел, загрузите задачи заново.",
+        )
+    return changed, deleted, token
+
+
+async def prune_task_tombstones(db: AsyncSession):
+    """
+    Удаляет записи об удалённых задачах старше TOMBSTONE_RETENTION.
+
+    В том же запросе поднимает границу sync_min_version пользователей до
+    максимальной версии удалённых записей, чтобы запросы изменений с более
+    старым токеном получали 410.
+
+    Атрибуты:
+        db (AsyncSession): Сессия базы данных.
+    """
+
+    pruned = (
+        delete(TaskTombstone)
+        .where(
+            TaskTombstone.deleted_at
+            < func.localtimestamp()
+            - timedelta(seconds=task_settings.TOMBSTONE_RETENTION)
+        )
+        .returning(TaskTombstone.owner_id, TaskTombstone.data_version)
+        .cte("pruned")
+    )
+    floors = (
+        select(
+            pruned.c.owner_id,
+            func.max(pruned.c.data_version).label("data_version"),
+        )
+        .group_by(pruned.c.owner_id)
+        .subquery("floors")
+    )
+    await db.execute(
+        update(User)
+        .where(User.id == floors.c.owner_id)
+        .values(
+            sync_min_version=func.greatest(User.sync_min_version, floors.c.data_version)
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def _bump_owners_data_version(db: AsyncSession, owner_ids: set[int]) -> set[int]:
+    """
+    Увеличивает версию данных владельцев задач для фоновой обработки задач.
+
+    Строки пользователей блокируются в порядке id, а уже заблокированные другими
+    транзакциями пропускаются (SKIP LOCKED): фоновая задача не ждёт запросы
+    пользователей и обрабатывает их задачи при следующем запуске.
+
+    Возвращает:
+        set[int]: Идентификаторы владельцев, чья версия увеличена (и строка заблокирована).
+    """
+
+    locked_owners = (
+        select(User.id)
+        .where(
+            User.id
+            == any_(bindparam("owner_ids", sorted(owner_ids), type_=ARRAY(Integer)))
+        )
+        .order_by(User.id)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.execute(
+        update(User)
+        .where(User.id.in_(locked_owners))
+        .values(data_version=User.data_version + 1)
+        .returning(User.id)
+        .execution_options(synchronize_session=False)
+    )
+    return set(result.scalars())
+
+
+async def mark_overdue_tasks(db: AsyncSession):
+    """
+    Отмечает просроченными незавершённые задачи, дедлайн которых уже прошёл.
+
+    Задачи обрабатываются порциями по OVERDUE_BATCH_SIZE, каждая в отдельной
+    транзакции, поэтому строки блокируются ненадолго. Кандидаты выбираются
+    по частичному индексу (deadline) незавершённых и ещё не просроченных задач.
+    Как и запросы пользователей, транзакция сначала увеличивает версию данных
+    владельцев, а затем изменяет их задачи; владельцы и задачи, заблокированные
+    другими транзакциями, пропускаются (SKIP LOCKED) до следующего запуска.
+
+    Атрибуты:
+        db (AsyncSession): Сессия базы данных.
+
+    Возвращает:
+        int: Число задач, отмеченных просроченными.
+    """
+
+    batch_size = task_settings.OVERDUE_BATCH_SIZE
+    total = 0
+    while True:
+        result = await db.execute(
+            select(Task.id, Task.owner_id)
+            .where(
+                TASK_OVERDUE_CANDIDATE,
+                task_visible(),
+                Task.deadline < func.localtimestamp(),
+            )
+            .order_by(Task.deadline)
+            .limit(batch_size)
+        )
+        candidates = result.all()
+        if not candidates:
+            break
+
+        owners = await _bump_owners_data_version(
+            db, {owner_id for _, owner_id in candidates}
+        )
+        task_ids = [task_id for task_id, owner_id in candidates if owner_id in owners]
+
+        locked_tasks = (
+            select(Task.id)
+            .where(
+                Task.id == any_(bindparam("task_ids", task_ids, type_=ARRAY(Integer))),
+                TASK_OVERDUE_CANDIDATE,
+                task_visible(),
+                Task.deadline < func.localtimestamp(),
+            )
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(
+            update(Task)
+            .where(Task.id.in_(locked_tasks))
+            .values(is_overdue=True)
+            .returning(Task.owner_id)
+            .execution_options(synchronize_session=False)
+        )
+        marked = result.scalars().all()
+        for owner_id in set(marked):
+            invalidate_task_caches(db, owner_id)
+        await db.commit()
+
+        total += len(marked)
+        # Если вся порция заблокирована другими транзакциями, повторная выборка
+        # вернёт те же строки: оставшиеся задачи обработает следующий запуск.
+        if not marked or len(candidates) < batch_size:
+            break
+    return total
+
+
+async def archive_completed_tasks(
+    db: AsyncSession,
+    older_than: int = task_settings.ARCHIVE_AFTER,
+    batch_size: int = task_settings.ARCHIVE_BATCH_SIZE,
+):
+    """
+    Переносит в архив (tasks_archive) завершённые задачи, не изменявшиеся дольше older_than.
+
+    Задачи переносятся порциями по batch_size, каждая в отдельной транзакции одним
+    запросом DELETE ... RETURNING внутри INSERT. Как и при отметке просроченных задач,
+    сначала увеличивается версия данных владельцев, а заблокированные строки
+    пропускаются. Для синхронизации изменений перенесённые задачи выглядят
+    удалёнными: они больше не входят в список задач без include_archived.
+
+    Атрибуты:
+        db (AsyncSession): Сессия базы данных.
+        older_than (int): Сколько секунд задача должна оставаться без изменений.
+        batch_size (int): Число задач, переносимых в одной транзакции.
+
+    Возвращает:
+        int: Число перенесённых задач.
+    """
+
+    cutoff = func.localtimestamp() - timedelta(seconds=older_than)
+    columns = [column.name for column in TaskArchive.__table__.columns]
+    columns.remove("archived_at")
+
+    total = 0
+    while True:
+        result = await db.execute(
+            select(Task.id, Task.owner_id)
+            .where(TASK_COMPLETED, task_visible(), Task.updated_at < cutoff)
+            .order_by(Task.updated_at)
+            .limit(batch_size)
+        )
+        candidates = result.all()
+        if not candidates:
+            break
+
+        owners = await _bump_owners_data_version(
+            db, {owner_id for _, owner_id in candidates}
+        )
+        task_ids = [task_id for task_id, owner_id in candidates if owner_id in owners]
+
+        locked_tasks = (
+            select(Task.id)
+            .where(
+                Task.id == any_(bindparam("task_ids", task_ids, type_=ARRAY(Integer))),
+                TASK_COMPLETED,
+                task_visible(),
+                Task.updated_at < cutoff,
+            )
+            .with_for_update(skip_locked=True)
+        )
+        moved = (
+            delete(Task)
+            .where(Task.id.in_(locked_tasks))
+            .returning(*(Task.__table__.c[column] for column in columns))
+            .cte("moved")
+        )
+        result = await db.execute(
+            insert(TaskArchive)
+            .from_select(columns, select(*(moved.c[column] for column in columns)))
+            .returning(TaskArchive.id, TaskArchive.owner_id)
+        )
+        archived = result.all()
+
+        per_owner = Counter(owner_id for _, owner_id in archived)
+        await adjust_users_task_counters(
+            db,
+            {
+                (owner_id, TaskStatus.COMPLETED): -count
+                for owner_id, count in per_owner.items()
+            },
+        )
+
+        def drop_titles(owner_ids=list(per_owner)):
+            for owner_id in owner_ids:
+                title_index.drop(owner_id)
+
+        run_after_commit(db, drop_titles)
+        for owner_id in per_owner:
+            invalidate_task_caches(db, owner_id)
+        await db.commit()
+
+        total += len(archived)
+        if not archived or len(candidates) < batch_size:
+            break
+    return total
 
 
 async def update_task_status(
-    db: AsyncSession, user_id: int, task_id: int, new_status: str
+    db: AsyncSession, user_id: int, task_id: int, new_status: str, commit: bool = True
 ):
     """
     Обновляет статус задачи.
@@ -109,23 +1027,122 @@ async def update_task_status(
         user_id (int): Идентификатор пользователя, который обновляет статус.
         task_id (int): Идентификатор задачи, статус которой нужно обновить.
         new_status (str): Новый статус задачи.
+        commit (bool): Фиксировать ли транзакцию (по умолчанию True). При False
+            изменения только отправляются в базу данных (flush), а транзакцию
+            фиксирует вызывающий код (пакетные операции).
 
     Возвращает:
-        task (Task): Обновленная задача.
+        task (Row): Обновленная задача (строка из UPDATE ... RETURNING).
 
     Исключения:
         HTTPException: В случае, если задача не найдена.
     """
 
-    task = await get_task_by_id(db=db, task_id=task_id, user_id=user_id)
+    await bump_data_version(db, user_id)
+    # Подзапрос блокирует строку и возвращает прежний статус для обновления счётчиков.
+    previous = (
+        select(Task.id, Task.status)
+        .where(Task.id == task_id, Task.owner_id == user_id, task_visible(user_id))
+        .with_for_update()
+        .subquery("previous")
+    )
+    result = await db.execute(
+        update(Task)
+        .where(Task.id == previous.c.id)
+        .values(status=new_status)
+        .returning(*_TASK_RESPONSE_COLUMNS, previous.c.status.label("previous_status"))
+        .execution_options(synchronize_session=False)
+    )
+    task = result.first()
+    if task is None:
+        raise task_not_found()
 
-    task.status = new_status
-    await db.commit()
-    await db.refresh(task)
+    deltas = Counter({TaskStatus(new_status): 1})
+    deltas[task.previous_status] -= 1
+    await adjust_task_counters(db, user_id, deltas)
+    if TaskStatus(new_status) != TaskStatus.COMPLETED:
+        run_after_commit(
+            db, lambda: deadline_scheduler.schedule(user_id, task_id, task.deadline)
+        )
+    else:
+        run_after_commit(db, lambda: deadline_scheduler.cancel(task_id))
+    invalidate_task_caches(db, user_id)
+    if commit:
+        await db.commit()
     return task
 
 
-async def delete_task(db: AsyncSession, user_id: int, task_id: int):
+async def update_tasks_status(
+    db: AsyncSession, user_id: int, task_ids: list[int], new_status: TaskStatus
+):
+    """
+    Обновляет статус нескольких задач одним запросом UPDATE ... RETURNING.
+
+    Атрибуты:
+        db (AsyncSession): Сессия базы данных.
+        user_id (int): Идентификатор пользователя, который обновляет статус.
+        task_ids (list[int]): Идентификаторы задач.
+        new_status (TaskStatus): Новый статус задач.
+
+    Возвращает:
+        tuple[list[int], list[int]]: Идентификаторы обновлённых задач и задач,
+        которые не найдены или не принадлежат пользователю (в порядке передачи).
+    """
+
+    task_ids = list(dict.fromkeys(task_ids))
+    if not task_ids:
+        return [], []
+
+    await bump_data_version(db, user_id)
+    previous = (
+        select(Task.id, Task.status)
+        .where(
+            Task.owner_id == user_id,
+            task_visible(user_id),
+            Task.id == any_(bindparam("task_ids", task_ids, type_=ARRAY(Integer))),
+        )
+        .order_by(Task.id)
+        .with_for_update()
+        .subquery("previous")
+    )
+    result = await db.execute(
+        update(Task)
+        .where(Task.id == previous.c.id)
+        .values(status=new_status)
+        .returning(Task.id, Task.deadline, previous.c.status)
+        .execution_options(synchronize_session=False)
+    )
+    rows = result.all()
+
+    deltas = Counter({new_status: len(rows)})
+    deltas.subtract(previous_status for _, _, previous_status in rows)
+    await adjust_task_counters(db, user_id, deltas)
+    if new_status != TaskStatus.COMPLETED:
+
+        def schedule_deadlines():
+            for task_id, deadline, _ in rows:
+                deadline_scheduler.schedule(user_id, task_id, deadline)
+
+        run_after_commit(db, schedule_deadlines)
+    else:
+
+        def cancel_deadlines():
+            for task_id, _, _ in rows:
+                deadline_scheduler.cancel(task_id)
+
+        run_after_commit(db, cancel_deadlines)
+    invalidate_task_caches(db, user_id)
+    await db.commit()
+
+    found = {task_id for task_id, _, _ in rows}
+    updated = [task_id for task_id in task_ids if task_id in found]
+    not_found = [task_id for task_id in task_ids if task_id not in found]
+    return updated, not_found
+
+
+async def delete_task(
+    db: AsyncSession, user_id: int, task_id: int, commit: bool = True
+):
     """
     Удаляет задачу из базы данных.
 
@@ -133,31 +1150,341 @@ async def delete_task(db: AsyncSession, user_id: int, task_id: int):
         db (AsyncSession): Сессия базы данных.
         user_id (int): Идентификатор пользователя, который удаляет задачу.
         task_id (int): Идентификатор задачи для удаления.
+        commit (bool): Фиксировать ли транзакцию (по умолчанию True). При False
+            изменения только отправляются в базу данных (flush), а транзакцию
+            фиксирует вызывающий код (пакетные операции).
 
     Возвращает:
-        task (Task): Удаленная задача.
+        task_id (int): Идентификатор удаленной задачи.
 
     Исключения:
         HTTPException: В случае, если задача не найдена.
     """
 
-    task = await get_task_by_id(db=db, user_id=user_id, task_id=task_id)
-    await db.delete(task)
+    version = await bump_data_version(db, user_id)
+    result = await db.execute(
+        delete(Task)
+        .where(Task.id == task_id, Task.owner_id == user_id, task_visible(user_id))
+        .returning(Task.status)
+    )
+    task_status = result.scalar()
+    if task_status is None:
+        raise task_not_found()
+
+    await adjust_task_counters(db, user_id, {task_status: -1})
+
+    run_after_commit(db, lambda: title_index.remove(user_id, task_id, version))
+    run_after_commit(db, lambda: deadline_scheduler.cancel(task_id))
+    invalidate_task_caches(db, user_id)
+    if commit:
+        await db.commit()
+    return task_id
+
+
+async def _run_batch_operation(
+    db: AsyncSession, user_id: int, operation: TaskBatchOperation
+) -> TaskBatchOperationResult:
+    if isinstance(operation, TaskBatchDelete):
+        task_id = await delete_task(
+            db=db, user_id=user_id, task_id=operation.task_id, commit=False
+        )
+        return TaskBatchOperationResult(
+            status_code=http_status.HTTP_200_OK, task_id=task_id
+        )
+
+    if isinstance(operation, TaskBatchCreate):
+        task = await create_task(
+            db=db,
+            user_id=user_id,
+            title=operation.task.title,
+            description=operation.task.description,
+            deadline=operation.task.deadline,
+            commit=False,
+        )
+    elif isinstance(operation, TaskBatchUpdate):
+        task = await update_task(
+            db=db,
+            user_id=user_id,
+            task_id=operation.task.id,
+            title=operation.task.title,
+            description=operation.task.description,
+            deadline=operation.task.deadline,
+            commit=False,
+        )
+    else:
+        task = await update_task_status(
+            db=db,
+            user_id=user_id,
+            task_id=operation.task.id,
+            new_status=operation.task.new_status,
+            commit=False,
+        )
+    return TaskBatchOperationResult(
+        status_code=http_status.HTTP_200_OK, task=TaskResponse.model_validate(task)
+    )
+
+
+async def run_task_batch(
+    db: AsyncSession,
+    user_id: int,
+    operations: Sequence[TaskBatchOperation],
+    atomic: bool = True,
+) -> TaskBatchResult:
+    """
+    Выполняет пакет операций с задачами в одной транзакции.
+
+    Операции выполняются по порядку теми же функциями, что и отдельные маршруты,
+    но без собственных коммитов. В атомарном режиме первая ошибка откатывает всю
+    транзакцию. В неатомарном режиме каждая операция выполняется в точке сохранения
+    (SAVEPOINT): ошибочная операция откатывается, остальные фиксируются.
+
+    Атрибуты:
+        db (AsyncSession): Сессия базы данных.
+        user_id (int): Идентификатор пользователя, чьи задачи изменяются.
+        operations (Sequence[TaskBatchOperation]): Операции в порядке выполнения.
+        atomic (bool): Отменять ли весь пакет при ошибке операции (по умолчанию True).
+
+    Возвращает:
+        TaskBatchResult: Признак фиксации и результаты операций. Если атомарный пакет
+        отменён, ошибочная операция содержит свою ошибку, а остальные — статус 424.
+    """
+
+    results = []
+    for index, operation in enumerate(operations):
+        try:
+            if atomic:
+                result = await _run_batch_operation(db, user_id, operation)
+            else:
+                async with db.begin_nested():
+                    result = await _run_batch_operation(db, user_id, operation)
+        except HTTPException as e:
+            failure = TaskBatchOperationResult(
+                status_code=e.status_code, detail=str(e.detail)
+            )
+            if not atomic:
+                results.append(failure)
+                continue
+            await db.rollback()
+            skipped = TaskBatchOperationResult(
+                status_code=http_status.HTTP_424_FAILED_DEPENDENCY,
+                detail=f"Пакет отменён из-за ошибки операции {index}.",
+            )
+            return TaskBatchResult(
+                committed=False,
+                results=[
+                    failure if position == index else skipped
+                    for position in range(len(operations))
+                ],
+            )
+        results.append(result)
+
     await db.commit()
-    return task
+    return TaskBatchResult(committed=True, results=results)
 
 
-async def delete_all_tasks(db: AsyncSession, user_id: int):
+async def schedule_tasks_purge(
+    db: AsyncSession, user_id: int, version: int, delete_user: bool = False
+) -> TaskPurge:
     """
-    Удаляет все задачи пользователя.
+    Скрывает все задачи пользователя и создаёт запись их фоновой очистки.
+
+    Задачи не удаляются в текущей транзакции: граница users.tasks_visible_from_id
+    сразу скрывает их из всех запросов, а строки удаляет purge_deleted_tasks
+    порциями по PURGE_BATCH_SIZE. Граница синхронизации поднимается до текущей
+    версии, поэтому клиенты с более старым токеном получат 410 и загрузят задачи
+    заново вместо записей об удалении каждой задачи.
+
+    Не выполняет коммит: вызывается после bump_data_version в изменяющей транзакции.
+
+    Атрибуты:
+        db (AsyncSession): Сессия базы данных.
+        user_id (int): Идентификатор пользователя.
+        version (int): Версия данных пользователя, полученная от bump_data_version.
+        delete_user (bool): Удалить ли пользователя после очистки задач.
+
+    Возвращает:
+        TaskPurge: Созданная запись очистки.
+    """
+
+    if delete_user:
+        max_task_id = _MAX_TASK_ID
+    else:
+        max_task_id = await db.scalar(
+            select(
+                func.coalesce(
+                    func.greatest(
+                        select(func.max(Task.id))
+                        .where(Task.owner_id == user_id)
+                        .scalar_subquery(),
+                        select(func.max(TaskArchive.id))
+                        .where(TaskArchive.owner_id == user_id)
+                        .scalar_subquery(),
+                    ),
+                    0,
+                )
+            )
+        )
+    archived = await db.scalar(
+        select(func.count()).where(
+            TaskArchive.owner_id == user_id, task_visible(user_id, TaskArchive)
+        )
+    )
+    counters = await get_task_counters(db, user_id)
+
+    values = {"tasks_visible_from_id": max_task_id, "sync_min_version": version}
+    if delete_user:
+        values["deleted_at"] = func.now()
+    await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    await reset_task_counters(db, user_id)
+
+    purge = TaskPurge(
+        user_id=user_id,
+        max_task_id=max_task_id,
+        delete_user=delete_user,
+        total=sum(counters.values()) + archived,
+    )
+    db.add(purge)
+    await db.flush()
+
+    run_after_commit(db, lambda: title_index.drop(user_id))
+    invalidate_task_caches(db, user_id)
+    return purge
+
+
+async def delete_all_tasks(db: AsyncSession, user_id: int) -> TaskPurge:
+    """
+    Удаляет все задачи пользователя, в том числе архивные.
+
+    Задачи сразу перестают быть видны, а их строки удаляются в фоне
+    (см. schedule_tasks_purge), поэтому запрос не зависит от числа задач.
 
     Атрибуты:
         db (AsyncSession): Сессия базы данных.
         user_id (int): Идентификатор пользователя, чьи задачи нужно удалить.
 
     Возвращает:
-        None
+        TaskPurge: Запись фоновой очистки (для проверки прогресса).
+    """
+
+    version = await bump_data_version(db, user_id)
+    purge = await schedule_tasks_purge(db, user_id, version)
+    await db.commit()
+    await db.refresh(purge)
+    return purge
+
+
+async def get_task_purge(db: AsyncSession, user_id: int, purge_id: int) -> TaskPurge:
     """
+    Получает запись фоновой очистки задач пользователя.
 
-    await db.execute(delete(Task).where(Task.owner_id == user_id))
+    Атрибуты:
+        db (AsyncSession): Сессия базы данных.
+        user_id (int): Идентификатор пользователя.
+        purge_id (int): Идентификатор очистки.
+
+    Возвращает:
+        TaskPurge: Запись очистки.
+
+    Исключения:
+        HTTPException (404): Если очистка не найдена или относится к другому пользователю.
+    """
+
+    purge = await db.scalar(
+        select(TaskPurge).where(TaskPurge.id == purge_id, TaskPurge.user_id == user_id)
+    )
+    if purge is None:
+        raise HTTPException(
+            status_code=http_status.HTTP_404_NOT_FOUND,
+            detail="Очистка задач не найдена.",
+        )
+    return purge
+
+
+async def purge_deleted_tasks(db: AsyncSession):
+    """
+    Удаляет строки задач, скрытых delete_all_tasks и удалением пользователя.
+
+    Каждая транзакция блокирует одну незавершённую запись очистки (SKIP LOCKED,
+    поэтому воркеры обрабатывают разные записи) и удаляет не больше
+    PURGE_BATCH_SIZE задач и архивных задач, что ограничивает время блокировок
+    и объём WAL одной транзакции. Когда задач не осталось, очистка завершается,
+    а при удалении пользователя удаляется и его строка. Завершённые записи
+    старше PURGE_RETENTION удаляются.
+
+    Атрибуты:
+        db (AsyncSession): Сессия базы данных.
+
+    Возвращает:
+        int: Число удалённых задач.
+    """
+
+    batch_size = task_settings.PURGE_BATCH_SIZE
+    total = 0
+    while True:
+        purge = await db.scalar(
+            select(TaskPurge)
+            .where(TaskPurge.finished_at.is_(None))
+            .order_by(TaskPurge.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .execution_options(populate_existing=True)
+        )
+        if purge is None:
+            break
+
+        deleted = 0
+        for model in (Task, TaskArchive):
+            chunk = (
+                select(model.id)
+                .where(model.owner_id == purge.user_id, model.id <= purge.max_task_id)
+                .limit(batch_size - deleted)
+                .with_for_update(skip_locked=True)
+            )
+            result = await db.execute(
+                delete(model)
+                .where(model.id.in_(chunk))
+                .execution_options(synchronize_session=False)
+            )
+            deleted += result.rowcount
+            if deleted >= batch_size:
+                break
+        purge.deleted += deleted
+        total += deleted
+
+        if deleted < batch_size:
+            remaining = await db.scalar(
+                select(
+                    or_(
+                        *(
+                            exists().where(
+                                model.owner_id == purge.user_id,
+                                model.id <= purge.max_task_id,
+                            )
+                            for model in (Task, TaskArchive)
+                        )
+                    )
+                )
+            )
+            if not remaining:
+                if purge.delete_user:
+                    await db.execute(delete(User).where(User.id == purge.user_id))
+                purge.finished_at = func.now()
+            elif not deleted:
+                # Оставшиеся строки заблокированы: очистка продолжится при следующем запуске.
+                await db.commit()
+                break
+        await db.commit()
+
+    await db.execute(
+        delete(TaskPurge).where(
+            TaskPurge.finished_at
+            < func.localtimestamp() - timedelta(seconds=task_settings.PURGE_RETENTION)
+        )
+    )
     await db.commit()
+    return total
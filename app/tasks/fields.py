@@ -0,0 +1,122 @@
+"""
+Этот файл содержит разбор параметра `fields` (разреженные наборы полей) для чтения задач.
+
+Клиент может запросить только нужные ему поля задачи, например
+`fields=id,title,status,deadline`. Тогда запрос к базе данных выбирает только
+соответствующие столбцы (без объёмного описания), а ответ сериализуется моделью,
+содержащей только эти поля.
+
+Основные компоненты:
+    - parse_task_fields: Разбор и проверка значения параметра `fields`.
+    - task_page_model: Модель страницы задач с выбранными полями.
+    - dump_task_page: Сериализация страницы задач в JSON или MessagePack.
+
+    Ограничения:
+        - Модели строятся динамически (pydantic.create_model) и кэшируются
+          по набору полей, поэтому их число ограничено числом подмножеств полей TaskResponse.
+"""
+
+from functools import lru_cache
+from typing import Sequence
+
+import msgpack
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+
+from .schemas import TaskPage, TaskResponse
+
+# Поля в порядке объявления TaskResponse: ответы с выбранными полями сохраняют его.
+TASK_FIELDS = tuple(TaskResponse.model_fields)
+
+
+def parse_task_fields(value: str | None) -> tuple[str, ...] | None:
+    """
+    Разбирает значение параметра `fields`.
+
+    Параметры:
+        value (str | None): Имена полей через запятую.
+
+    Возвращаемое значение:
+        tuple[str, ...] | None: Выбранные поля в порядке TaskResponse или None,
+        если параметр не передан (нужны все поля).
+
+    Исключения:
+        HTTPException (400): Если указано неизвестное поле или список пуст.
+    """
+
+    if value is None:
+        return None
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested.difference(TASK_FIELDS)
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Допустимые поля: {', '.join(TASK_FIELDS)}.",
+        )
+    if requested == set(TASK_FIELDS):
+        return None
+    return tuple(name for name in TASK_FIELDS if name in requested)
+
+
+@lru_cache(maxsize=None)
+def task_page_model(fields: tuple[str, ...] | None) -> type[BaseModel]:
+    """
+    Возвращает модель страницы задач, элементы которой содержат только выбранные поля.
+
+    Параметры:
+        fields (tuple[str, ...] | None): Поля из parse_task_fields.
+
+    Возвращаемое значение:
+        type[BaseModel]: TaskPage или её вариант с усечённой моделью задачи.
+    """
+
+    if fields is None:
+        return TaskPage
+    item_model = create_model(
+        "TaskFields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (TaskResponse.model_fields[name].annotation, ...) for name in fields},
+    )
+    return create_model(
+        "TaskFieldsPage",
+        items=(list[item_model], ...),
+        next_cursor=(str | None, None),
+    )
+
+
+@lru_cache(maxsize=None)
+def _task_page_adapter(fields: tuple[str, ...] | None) -> TypeAdapter:
+    return TypeAdapter(task_page_model(fields))
+
+
+def dump_task_page(
+    fields: tuple[str, ...] | None,
+    tasks: Sequence,
+    next_cursor: str | None,
+    as_msgpack: bool = False,
+) -> bytes:
+    """
+    Сериализует страницу задач в JSON или MessagePack.
+
+    Вся страница проверяется одним вызовом заранее построенного TypeAdapter,
+    и он же сразу формирует байты ответа. Модель каждой задачи при этом
+    всё равно создаётся (внутри pydantic-core, from_attributes), но без
+    отдельных вызовов model_validate из Python и без промежуточных словарей.
+
+    Параметры:
+        fields (tuple[str, ...] | None): Поля из parse_task_fields.
+        tasks (Sequence): Строки задач (из get_tasks).
+        next_cursor (str | None): Курсор следующей страницы.
+        as_msgpack (bool): Сериализовать ли страницу в MessagePack (по умолчанию JSON).
+
+    Возвращаемое значение:
+        bytes: Тело ответа.
+    """
+
+    adapter = _task_page_adapter(fields)
+    page = adapter.validate_python(
+        {"items": tasks, "next_cursor": next_cursor}, from_attributes=True
+    )
+    if as_msgpack:
+        return msgpack.packb(adapter.dump_python(page, mode="json"))
+    return adapter.dump_json(page)
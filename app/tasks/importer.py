@@ -0,0 +1,118 @@
+"""
+Этот файл содержит функции для потокового разбора файлов импорта задач.
+
+Тело запроса читается порциями и разбирается построчно, поэтому загрузка
+не буферизуется в памяти целиком. Каждая запись отдаётся вместе с номером
+строки, с которой она начинается, чтобы ошибки можно было привязать к месту в файле.
+
+Основные функции:
+    - iter_lines: Разбиение потока байтов на строки с инкрементальным декодированием UTF-8.
+    - iter_ndjson_rows: Разбор NDJSON (по одному JSON-объекту на строку).
+    - iter_csv_rows: Разбор CSV с заголовком (поддерживаются многострочные значения в кавычках).
+"""
+
+import codecs
+import csv
+import json
+from typing import AsyncIterator
+
+ImportRow = tuple[int, dict | None, str | None]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Разбивает поток байтов на строки.
+
+    Параметры:
+        chunks (AsyncIterator[bytes]): Порции тела запроса.
+
+    Возвращаемое значение:
+        AsyncIterator[str]: Строки без завершающих символов перевода строки.
+    """
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def iter_ndjson_rows(lines: AsyncIterator[str]) -> AsyncIterator[ImportRow]:
+    """
+    Разбирает строки NDJSON.
+
+    Параметры:
+        lines (AsyncIterator[str]): Строки файла.
+
+    Возвращаемое значение:
+        AsyncIterator[tuple[int, dict | None, str | None]]: Номер строки, данные записи
+        и описание ошибки разбора (если запись разобрать не удалось).
+    """
+
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f"Некорректный JSON: {e}"
+            continue
+        if not isinstance(data, dict):
+            yield line_number, None, "Ожидается JSON-объект."
+            continue
+        yield line_number, data, None
+
+
+async def iter_csv_rows(lines: AsyncIterator[str]) -> AsyncIterator[ImportRow]:
+    """
+    Разбирает строки CSV. Первая строка должна содержать заголовок с именами полей.
+
+    Пустые значения считаются отсутствующими. Значение в кавычках может занимать
+    несколько строк: запись считается законченной, когда число кавычек в ней чётное.
+
+    Параметры:
+        lines (AsyncIterator[str]): Строки файла.
+
+    Возвращаемое значение:
+        AsyncIterator[tuple[int, dict | None, str | None]]: Номер строки, данные записи
+        и описание ошибки разбора (если запись разобрать не удалось).
+    """
+
+    header = None
+    record = None
+    record_start = 0
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if record is None:
+            record, record_start = line, line_number
+        else:
+            record += "\n" + line
+        if record.count('"') % 2:
+            continue
+
+        values = next(csv.reader([record]), [])
+        record = None
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if not any(values):
+            continue
+        if len(values) != len(header):
+            yield record_start, None, (
+                f"Ожидается {len(header)} значений, получено {len(values)}."
+            )
+            continue
+        yield record_start, {
+            name: value if value != "" else None for name, value in zip(header, values)
+        }, None
+
+    if record is not None:
+        yield record_start, None, "Незакрытая кавычка в конце файла."
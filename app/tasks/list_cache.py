@@ -0,0 +1,154 @@
+"""
+Этот файл содержит in-memory кэш сериализованных страниц списка задач пользователей.
+
+Кэш хранит готовое тело ответа GET /tasks/me/ вместе с его ETag по ключу
+(пользователь, строка параметров запроса), поэтому повторные запросы
+читают из базы данных только версию данных пользователя. Запись возвращается,
+только если её ETag совпадает с ETag текущей версии. Кроме того, все записи
+пользователя сбрасываются после фиксации любой транзакции, изменяющей его задачи.
+
+Основные компоненты:
+    - TaskListCache: Кэш с вытеснением давно не использовавшихся записей (LRU),
+      временем жизни записей (TTL) и ограничением суммарного размера.
+    - task_list_cache: Экземпляр кэша, используемый приложением.
+
+    Ограничения:
+        - Кэш живёт в памяти процесса, поэтому каждый воркер хранит свою копию.
+          Изменения в других воркерах меняют версию данных пользователя, поэтому
+          устаревшие записи не отдаются и без шины инвалидации общего кэша (app.cache);
+          шина лишь раньше освобождает занятую ими память.
+        - Суммарный размер тел ответов ограничен настройкой LIST_CACHE_MAX_BYTES.
+"""
+
+import time
+from collections import OrderedDict
+
+from .config import task_settings
+
+
+class TaskListCache:
+    """
+    Кэш страниц списка задач по пользователям.
+
+    Атрибуты:
+        enabled (bool): Включён ли кэш.
+        max_bytes (int): Максимальный суммарный размер тел ответов в байтах.
+        ttl (float): Время жизни записи в секундах.
+
+    Методы:
+        get(user_id, key, etag): Возвращает тело ответа из кэша, если ETag записи
+            совпадает с переданным.
+        begin_load(user_id): Отмечает начало загрузки страницы пользователя из БД.
+        store(user_id, version, key, etag, body): Сохраняет страницу, если за время
+            загрузки задачи пользователя не менялись.
+        end_load(user_id): Отмечает завершение загрузки страницы пользователя.
+        invalidate(user_id): Удаляет все страницы пользователя.
+        clear(): Удаляет страницы всех пользователей.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float, enabled: bool = True):
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # (user_id, параметры запроса) -> (время истечения, ETag, тело ответа)
+        self._entries: OrderedDict[tuple[int, str], tuple[float, str, bytes]] = (
+            OrderedDict()
+        )
+        self._user_keys: dict[int, set[str]] = {}
+        self._size = 0
+        self._version = 0
+        self._loading: dict[int, int] = {}
+        self._touched: dict[int, int] = {}
+
+    def get(self, user_id: int, key: str, etag: str) -> bytes | None:
+        """
+        Возвращает страницу пользователя из кэша.
+
+        Параметры:
+            user_id (int): Идентификатор пользователя.
+            key (str): Параметры запроса.
+            etag (str): ETag, построенный по текущей версии данных пользователя.
+
+        Возвращаемое значение:
+            bytes | None: Тело ответа или None, если записи нет, её время жизни
+            истекло или она сохранена для другой версии данных.
+        """
+        if not self.enabled:
+            return None
+        entry = self._entries.get((user_id, key))
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic() or entry[1] != etag:
+            self._pop((user_id, key))
+            return None
+        self._entries.move_to_end((user_id, key))
+        return entry[2]
+
+    def begin_load(self, user_id: int) -> int:
+        """
+        Отмечает начало загрузки страницы пользователя из базы данных.
+
+        Возвращаемое значение:
+            int: Версия кэша, которую нужно передать в store.
+        """
+        self._loading[user_id] = self._loading.get(user_id, 0) + 1
+        return self._version
+
+    def store(self, user_id: int, version: int, key: str, etag: str, body: bytes):
+        """
+        Сохраняет страницу пользователя в кэш.
+
+        Если во время загрузки задачи пользователя изменялись, страница в кэш
+        не попадает: она могла быть прочитана до фиксации изменений.
+        """
+        if not self.enabled or len(body) > self.max_bytes:
+            return
+        if self._touched.get(user_id, -1) >= version:
+            return
+        self._pop((user_id, key))
+        self._entries[(user_id, key)] = (time.monotonic() + self.ttl, etag, body)
+        self._user_keys.setdefault(user_id, set()).add(key)
+        self._size += len(body)
+        self._evict()
+
+    def end_load(self, user_id: int):
+        """Отмечает завершение (в том числе неудачное) загрузки страницы пользователя."""
+        self._loading[user_id] -= 1
+        if not self._loading[user_id]:
+            del self._loading[user_id]
+            self._touched.pop(user_id, None)
+
+    def invalidate(self, user_id: int):
+        """Удаляет все страницы пользователя из кэша."""
+        for key in self._user_keys.get(user_id, set()).copy():
+            self._pop((user_id, key))
+        if user_id in self._loading:
+            self._touched[user_id] = self._version
+            self._version += 1
+
+    def clear(self):
+        """Удаляет страницы всех пользователей."""
+        for user_id in set(self._user_keys) | set(self._loading):
+            self.invalidate(user_id)
+
+    def _pop(self, cache_key: tuple[int, str]):
+        entry = self._entries.pop(cache_key, None)
+        if entry is None:
+            return
+        self._size -= len(entry[2])
+        user_id, key = cache_key
+        user_keys = self._user_keys[user_id]
+        user_keys.discard(key)
+        if not user_keys:
+            del self._user_keys[user_id]
+
+    def _evict(self):
+        while self._size > self.max_bytes and self._entries:
+            self._pop(next(iter(self._entries)))
+
+
+task_list_cache = TaskListCache(
+    max_bytes=task_settings.LIST_CACHE_MAX_BYTES,
+    ttl=task_settings.LIST_CACHE_TTL,
+    enabled=task_settings.LIST_CACHE_ENABLED,
+)
@@ -0,0 +1,373 @@
+"""
+Этот файл содержит планировщик напоминаний о дедлайнах задач.
+
+Планировщик держит в памяти min-кучу ближайших дедлайнов и спит до ближайшего
+из них, а не опрашивает таблицу задач. Дедлайны загружаются порциями из частичного
+индекса (deadline, id) по незавершённым задачам только в пределах скользящего окна
+REMINDER_WINDOW, поэтому объём памяти ограничен независимо от общего числа задач.
+
+Основные компоненты:
+    - fetch_deadlines: Загрузка порции ближайших дедлайнов.
+    - claim_reminders: Атомарная отметка наступивших напоминаний.
+    - DeadlineScheduler: Планировщик напоминаний.
+    - deadline_scheduler: Экземпляр планировщика, используемый приложением.
+    - log_reminders: Обработчик напоминаний по умолчанию (запись в лог).
+
+    Работа планировщика:
+        - Задачи, созданные или изменённые в текущем воркере, добавляются в кучу сразу
+          (schedule), если их дедлайн попадает в уже загруженную часть окна; прежний
+          дедлайн задачи при этом заменяется. Удалённые и завершённые задачи
+          убираются из кучи (cancel).
+        - Остальные задачи загружаются при сдвиге окна, а раз в REMINDER_RESCAN_INTERVAL
+          окно перечитывается целиком, чтобы учесть изменения из других воркеров.
+        - Перед вызовом обработчика напоминания атомарно отмечаются в task_reminders:
+          одно напоминание о дедлайне отправляется один раз, даже если планировщик
+          работает в нескольких воркерах.
+        - При запуске отправляются напоминания, пропущенные за последние REMINDER_GRACE секунд.
+"""
+
+import asyncio
+import heapq
+from datetime import datetime, timedelta
+from importlib import import_module
+from typing import Awaitable, Callable, Sequence
+from uuid import uuid4
+
+from sqlalchemy import ARRAY, Integer, any_, bindparam, exists, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.db import Database
+from app.logs import logger
+from app.models import TASK_PENDING_DEADLINE, Task, TaskReminder
+from app.services import task_visible
+from .config import task_settings
+
+ReminderHook = Callable[[Sequence[Row]], Awaitable[None]]
+
+
+async def log_reminders(reminders: Sequence[Row]):
+    """
+    Обработчик напоминаний по умолчанию: записывает напоминания в лог.
+
+    Параметры:
+        reminders (Sequence[Row]): Задачи с наступившим дедлайном
+            (id, owner_id, title, deadline).
+    """
+
+    for reminder in reminders:
+        logger.bind(log_id=str(uuid4())).info(
+            f"Task {reminder.id} of user {reminder.owner_id} "
+            f"reached its deadline {reminder.deadline.isoformat()}."
+        )
+
+
+async def fetch_deadlines(
+    db: AsyncSession, after: tuple[datetime, int], until: datetime, limit: int
+) -> Sequence[Row]:
+    """
+    Загружает порцию ближайших дедлайнов незавершённых задач, напоминания
+    о которых ещё не отправлялись.
+
+    Параметры:
+        db (AsyncSession): Сессия базы данных.
+        after (tuple[datetime, int]): Дедлайн и идентификатор последней загруженной задачи.
+        until (datetime): Конец окна дедлайнов.
+        limit (int): Максимальное число дедлайнов.
+
+    Возвращаемое значение:
+        Sequence[Row]: Строки (deadline, id, owner_id) в порядке дедлайнов.
+    """
+
+    result = await db.execute(
+        select(Task.deadline, Task.id, Task.owner_id)
+        .where(
+            TASK_PENDING_DEADLINE,
+            task_visible(),
+            tuple_(Task.deadline, Task.id) > tuple_(*after),
+            Task.deadline <= until,
+            ~exists().where(
+                TaskReminder.task_id == Task.id,
+                TaskReminder.deadline == Task.deadline,
+            ),
+        )
+        .order_by(Task.deadline, Task.id)
+        .limit(limit)
+    )
+    return result.all()
+
+
+async def claim_reminders(
+    db: AsyncSession, task_ids: list[int], now: datetime
+) -> Sequence[Row]:
+    """
+    Отмечает в task_reminders напоминания о наступивших дедлайнах задач.
+
+    Напоминание отмечается одним запросом INSERT ... ON CONFLICT, поэтому из
+    нескольких воркеров, одновременно отмечающих одну задачу, его получает
+    только один. Задачи, которые уже завершены, удалены или дедлайн которых
+    перенесён, пропускаются. Транзакцию фиксирует вызывающий код.
+
+    Параметры:
+        db (AsyncSession): Сессия базы данных.
+        task_ids (list[int]): Идентификаторы задач с наступившим дедлайном.
+        now (datetime): Текущее время базы данных.
+
+    Возвращаемое значение:
+        Sequence[Row]: Отмеченные напоминания (id, owner_id, title, deadline).
+    """
+
+    due = select(Task.id, Task.deadline).where(
+        TASK_PENDING_DEADLINE,
+        task_visible(),
+        Task.id == any_(bindparam("task_ids", task_ids, type_=ARRAY(Integer))),
+        Task.deadline <= now,
+    )
+    claim = insert(TaskReminder).from_select(["task_id", "deadline"], due)
+    claimed = (
+        claim.on_conflict_do_update(
+            index_elements=[TaskReminder.task_id],
+            set_={"deadline": claim.excluded.deadline, "sent_at": func.now()},
+            where=TaskReminder.deadline != claim.excluded.deadline,
+        )
+        .returning(TaskReminder.task_id)
+        .cte("claimed")
+    )
+    result = await db.execute(
+        select(Task.id, Task.owner_id, Task.title, Task.deadline)
+        .join(claimed, claimed.c.task_id == Task.id)
+        .order_by(Task.deadline, Task.id)
+    )
+    return result.all()
+
+
+def load_hook(path: str) -> ReminderHook:
+    """
+    Загружает обработчик напоминаний по пути вида `модуль:функция`.
+
+    Параметры:
+        path (str): Путь к асинхронной функции, принимающей список напоминаний.
+
+    Возвращаемое значение:
+        ReminderHook: Обработчик напоминаний.
+    """
+
+    module_name, _, attribute = path.partition(":")
+    return getattr(import_module(module_name), attribute)
+
+
+class DeadlineScheduler:
+    """
+    Планировщик напоминаний о дедлайнах задач на основе min-кучи.
+
+    Атрибуты:
+        window (timedelta): Насколько вперёд загружаются дедлайны.
+        batch_size (int): Максимальное число дедлайнов, загружаемых за раз.
+        grace (timedelta): За какой период в прошлом отправляются пропущенные напоминания.
+        rescan_interval (timedelta): Период полного перечитывания окна.
+        hook (ReminderHook | None): Обработчик напоминаний.
+        clock (Callable[[], datetime]): Источник текущего времени процесса.
+
+    Методы:
+        run(database): Цикл планировщика (запускается в lifespan приложения).
+        schedule(user_id, task_id, deadline): Добавляет или заменяет дедлайн задачи,
+            изменённой в текущем воркере.
+        cancel(task_id): Убирает дедлайн удалённой или завершённой задачи.
+    """
+
+    def __init__(
+        self,
+        window: timedelta,
+        batch_size: int,
+        grace: timedelta,
+        rescan_interval: timedelta,
+        hook: ReminderHook | None = None,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
+        self.window = window
+        self.batch_size = batch_size
+        self.grace = grace
+        self.rescan_interval = rescan_interval
+        self.hook = hook
+        self.clock = clock
+        self.log_id = str(uuid4())
+        # (дедлайн, id задачи, id владельца). Записи, дедлайн которых заменён
+        # или отменён, остаются в куче и пропускаются при извлечении.
+        self._heap: list[tuple[datetime, int, int]] = []
+        # id задачи -> её текущий дедлайн в куче
+        self._scheduled: dict[int, datetime] = {}
+        self._cursor: tuple[datetime, int] | None = None
+        self._horizon: datetime | None = None
+        self._rescan_at: datetime | None = None
+        self._clock_offset = timedelta()
+        self._wakeup: asyncio.Event | None = None
+
+    async def run(self, database: Database):
+        """
+        Цикл планировщика: загружает окно дедлайнов, спит до ближайшего
+        и отправляет наступившие напоминания.
+
+        Параметры:
+            database (Database): База данных, с которой работает приложение.
+        """
+
+        if self.hook is None:
+            self.hook = load_hook(task_settings.REMINDER_HOOK)
+        self._wakeup = asyncio.Event()
+        try:
+            while True:
+                try:
+                    wake_at = await self._tick(database)
+                    if wake_at is not None:
+                        await self._sleep(wake_at)
+                except Exception as e:
+                    logger.bind(log_id=self.log_id).error(
+                        f"Deadline scheduler failed: {str(e)}"
+                    )
+                    self._reset()
+                    await asyncio.sleep(self.rescan_interval.total_seconds())
+        finally:
+            self._reset()
+            self._wakeup = None
+
+    def schedule(self, user_id: int, task_id: int, deadline: datetime | None):
+        """
+        Добавляет дедлайн задачи, созданной или изменённой в текущем воркере.
+
+        Прежний дедлайн задачи заменяется. Дедлайны за пределами загруженной
+        части окна не добавляются: они будут загружены из базы данных при сдвиге окна.
+
+        Параметры:
+            user_id (int): Идентификатор владельца задачи.
+            task_id (int): Идентификатор задачи.
+            deadline (datetime | None): Дедлайн задачи.
+        """
+
+        if self._horizon is None:
+            return
+        if deadline is None or deadline > self._horizon:
+            self.cancel(task_id)
+            return
+        self._push(deadline, task_id, user_id)
+        if self._wakeup is not None and self._heap[0] == (deadline, task_id, user_id):
+            self._wakeup.set()
+
+    def cancel(self, task_id: int):
+        """
+        Убирает дедлайн задачи, удалённой или завершённой в текущем воркере.
+
+        Параметры:
+            task_id (int): Идентификатор задачи.
+        """
+
+        self._scheduled.pop(task_id, None)
+
+    async def _tick(self, database: Database) -> datetime | None:
+        # Возвращает время, до которого нужно спать, или None, если были
+        # отправлены напоминания и следующий шаг нужно выполнить сразу.
+        now = self._now()
+        if self._rescan_at is None or now >= self._rescan_at:
+            async with database.async_session() as db:
+                db_now = await db.scalar(select(func.localtimestamp()))
+            self._clock_offset = db_now - self.clock()
+            now = self._now()
+            self._cursor = (now - self.grace, 0)
+            self._horizon = now - self.grace
+            self._rescan_at = now + self.rescan_interval
+
+        if self._needs_load(now):
+            await self._load(database, now)
+
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, task_id, _ = heapq.heappop(self._heap)
+            if self._scheduled.get(task_id) == deadline:
+                del self._scheduled[task_id]
+                due.append(task_id)
+        if due:
+            await self._fire(database, due, now)
+            return None
+
+        return self._wake_at(now)
+
+    def _needs_load(self, now: datetime) -> bool:
+        # Окно сдвигается, когда до его конца остаётся меньше половины, а куча
+        # опустела хотя бы наполовину: в памяти не больше полутора порций.
+        return (
+            len(self._scheduled) < max(self.batch_size // 2, 1)
+            and self._horizon <= now + self.window / 2
+        )
+
+    async def _load(self, database: Database, now: datetime):
+        window_end = now + self.window
+        async with database.async_session() as db:
+            rows = await fetch_deadlines(db, self._cursor, window_end, self.batch_size)
+
+        for deadline, task_id, owner_id in rows:
+            self._push(deadline, task_id, owner_id)
+        if rows:
+            self._cursor = (rows[-1].deadline, rows[-1].id)
+        # Неполная порция означает, что всё окно загружено; иначе загружено
+        # до дедлайна последней строки.
+        self._horizon = (
+            rows[-1].deadline if len(rows) == self.batch_size else window_end
+        )
+
+    async def _fire(self, database: Database, task_ids: list[int], now: datetime):
+        async with database.async_session() as db:
+            reminders = await claim_reminders(db, task_ids, now)
+            await db.commit()
+
+        if reminders:
+            await self.hook(reminders)
+
+    def _wake_at(self, now: datetime) -> datetime:
+        wake_at = self._rescan_at
+        if self._heap:
+            wake_at = min(wake_at, self._heap[0][0])
+        if len(self._scheduled) < max(self.batch_size // 2, 1):
+            wake_at = min(wake_at, max(self._horizon - self.window / 2, now))
+        return wake_at
+
+    async def _sleep(self, wake_at: datetime):
+        timeout = max((wake_at - self._now()).total_seconds(), 0)
+
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def _push(self, deadline: datetime, task_id: int, owner_id: int):
+        if self._scheduled.get(task_id) == deadline:
+            return
+        self._scheduled[task_id] = deadline
+        heapq.heappush(self._heap, (deadline, task_id, owner_id))
+        # Заменённые и отменённые записи вычищаются, когда их становится
+        # больше, чем действующих.
+        if len(self._heap) > 2 * len(self._scheduled) + 64:
+            self._heap = [
+                entry
+                for entry in self._heap
+                if self._scheduled.get(entry[1]) == entry[0]
+            ]
+            heapq.heapify(self._heap)
+
+    def _now(self) -> datetime:
+        return self.clock() + self._clock_offset
+
+    def _reset(self):
+        self._heap.clear()
+        self._scheduled.clear()
+        self._cursor = None
+        self._horizon = None
+        self._rescan_at = None
+
+
+deadline_scheduler = DeadlineScheduler(
+    window=timedelta(seconds=task_settings.REMINDER_WINDOW),
+    batch_size=task_settings.REMINDER_BATCH_SIZE,
+    grace=timedelta(seconds=task_settings.REMINDER_GRACE),
+    rescan_interval=timedelta(seconds=task_settings.REMINDER_RESCAN_INTERVAL),
+)
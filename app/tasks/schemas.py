@@ -2,7 +2,9 @@
 
 from datetime import datetime
 from enum import Enum
-from pydantic import BaseModel, ConfigDict, constr
+from typing import Annotated, Literal
+from pydantic import BaseModel, ConfigDict, Field, constr
+
 
 class TaskStatus(str, Enum):
     """
@@ -19,6 +21,23 @@ class TaskStatus(str, Enum):
     COMPLETED = "completed"
 
 
+class TaskOrdering(str, Enum):
+    """
+    Перечисление вариантов сортировки списка задач.
+
+    Варианты:
+        CREATED_AT: По дате создания, от старых к новым.
+        CREATED_AT_DESC: По дате создания, от новых к старым.
+        DEADLINE: По дедлайну, от ближайших (задачи без дедлайна в конце).
+        DEADLINE_DESC: По дедлайну, от самых поздних (задачи без дедлайна в начале).
+    """
+
+    CREATED_AT = "created_at"
+    CREATED_AT_DESC = "-created_at"
+    DEADLINE = "deadline"
+    DEADLINE_DESC = "-deadline"
+
+
 class TaskUpdateStatus(BaseModel):
     """
     Модель для обновления статуса задачи.
@@ -32,6 +51,33 @@ class TaskUpdateStatus(BaseModel):
     new_status: TaskStatus
 
 
+class TaskBulkUpdateStatus(BaseModel):
+    """
+    Модель для массового обновления статуса задач.
+
+    Атрибуты:
+        ids (list[int]): Идентификаторы задач.
+        new_status (TaskStatus): Новый статус задач.
+    """
+
+    ids: list[int]
+    new_status: TaskStatus
+
+
+class TaskBulkUpdateStatusResult(BaseModel):
+    """
+    Модель результата массового обновления статуса задач.
+
+    Атрибуты:
+        updated (list[int]): Идентификаторы задач, статус которых изменён.
+        not_found (list[int]): Идентификаторы задач, которые не найдены
+            или не принадлежат пользователю.
+    """
+
+    updated: list[int]
+    not_found: list[int]
+
+
 class TaskBase(BaseModel):
     """
     Основная модель задачи, которая используется для создания и обновления задачи.
@@ -58,10 +104,12 @@ class TaskResponse(TaskBase):
     Атрибуты:
         id (int): Идентификатор задачи.
         created_at (datetime): Дата и время создания задачи.
+        is_overdue (bool): Просрочена ли задача (дедлайн прошёл до её завершения).
     """
 
     id: int
     created_at: datetime
+    is_overdue: bool = False
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -85,3 +133,215 @@ class TaskUpdate(BaseModel):
     status: TaskStatus | None = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TaskBatchCreate(BaseModel):
+    """
+    Операция пакета: создание задачи (как POST /tasks/me/).
+
+    Атрибуты:
+        op (str): Тип операции, "create".
+        task (TaskBase): Данные новой задачи.
+    """
+
+    op: Literal["create"]
+    task: TaskBase
+
+
+class TaskBatchUpdate(BaseModel):
+    """
+    Операция пакета: обновление данных задачи (как PATCH /tasks/me/update/).
+
+    Атрибуты:
+        op (str): Тип операции, "update".
+        task (TaskUpdate): Идентификатор задачи и новые данные.
+    """
+
+    op: Literal["update"]
+    task: TaskUpdate
+
+
+class TaskBatchUpdateStatus(BaseModel):
+    """
+    Операция пакета: изменение статуса задачи (как PUT /tasks/me/{task_id}/status/).
+
+    Атрибуты:
+        op (str): Тип операции, "update_status".
+        task (TaskUpdateStatus): Идентификатор задачи и новый статус.
+    """
+
+    op: Literal["update_status"]
+    task: TaskUpdateStatus
+
+
+class TaskBatchDelete(BaseModel):
+    """
+    Операция пакета: удаление задачи (как DELETE /tasks/me/{task_id}/).
+
+    Атрибуты:
+        op (str): Тип операции, "delete".
+        task_id (int): Идентификатор задачи.
+    """
+
+    op: Literal["delete"]
+    task_id: int
+
+
+TaskBatchOperation = Annotated[
+    TaskBatchCreate | TaskBatchUpdate | TaskBatchUpdateStatus | TaskBatchDelete,
+    Field(discriminator="op"),
+]
+
+
+class TaskBatch(BaseModel):
+    """
+    Модель пакета операций с задачами.
+
+    Атрибуты:
+        operations (list[TaskBatchOperation]): Операции в порядке выполнения.
+        atomic (bool): Если True (по умолчанию), ошибка любой операции отменяет весь
+            пакет. Если False, ошибочные операции пропускаются, а остальные фиксируются.
+    """
+
+    operations: list[TaskBatchOperation]
+    atomic: bool = True
+
+
+class TaskBatchOperationResult(BaseModel):
+    """
+    Модель результата одной операции пакета.
+
+    Атрибуты:
+        status_code (int): HTTP-статус, который вернул бы соответствующий маршрут.
+        task (TaskResponse | None): Задача после создания или изменения.
+        task_id (int | None): Идентификатор удалённой задачи.
+        detail (str | None): Описание ошибки.
+    """
+
+    status_code: int
+    task: TaskResponse | None = None
+    task_id: int | None = None
+    detail: str | None = None
+
+
+class TaskBatchResult(BaseModel):
+    """
+    Модель результата пакета операций.
+
+    Атрибуты:
+        committed (bool): Зафиксированы ли изменения. В атомарном режиме False,
+            если хотя бы одна операция завершилась ошибкой.
+        results (list[TaskBatchOperationResult]): Результаты в порядке операций.
+    """
+
+    committed: bool
+    results: list[TaskBatchOperationResult]
+
+
+class TaskPage(BaseModel):
+    """
+    Модель страницы списка задач.
+
+    Атрибуты:
+        items (list[TaskResponse]): Задачи текущей страницы.
+        next_cursor (str | None): Курсор следующей страницы (None, если страница последняя).
+    """
+
+    items: list[TaskResponse]
+    next_cursor: str | None = None
+
+
+class TaskQuickFindResult(BaseModel):
+    """
+    Модель результата быстрого нечёткого поиска задачи по заголовку.
+
+    Атрибуты:
+        id (int): Идентификатор задачи.
+        title (str): Заголовок задачи.
+        score (float): Оценка схожести заголовка с запросом (от 0 до 100).
+    """
+
+    id: int
+    title: str
+    score: float
+
+
+class TaskImportError(BaseModel):
+    """
+    Модель ошибки в строке файла импорта.
+
+    Атрибуты:
+        line (int): Номер строки, с которой начинается ошибочная запись.
+        errors (list[str]): Описание ошибок записи.
+    """
+
+    line: int
+    errors: list[str]
+
+
+class TaskImportResult(BaseModel):
+    """
+    Модель результата импорта задач.
+
+    Атрибуты:
+        imported (int): Количество импортированных задач.
+        failed (int): Количество записей, не прошедших проверку.
+        errors (list[TaskImportError]): Ошибки по строкам (не более IMPORT_MAX_ERRORS).
+    """
+
+    imported: int
+    failed: int
+    errors: list[TaskImportError]
+
+
+class TaskStats(BaseModel):
+    """
+    Модель статистики задач пользователя.
+
+    Атрибуты:
+        by_status (dict[TaskStatus, int]): Количество задач в каждом статусе.
+        total (int): Общее количество задач.
+        overdue (int): Количество незавершённых задач с истёкшим дедлайном.
+        due_this_week (int): Количество незавершённых задач с дедлайном в ближайшие 7 дней.
+    """
+
+    by_status: dict[TaskStatus, int]
+    total: int
+    overdue: int
+    due_this_week: int
+
+
+class TaskChanges(BaseModel):
+    """
+    Модель изменений задач пользователя с момента указанной версии.
+
+    Атрибуты:
+        changed (list[TaskResponse]): Созданные или изменённые задачи.
+        deleted (list[int]): Идентификаторы удалённых задач.
+        token (int): Токен для следующего запроса изменений (параметр `since`).
+    """
+
+    changed: list[TaskResponse]
+    deleted: list[int]
+    token: int
+
+
+class TaskPurgeStatus(BaseModel):
+    """
+    Модель состояния фоновой очистки удалённых задач.
+
+    Атрибуты:
+        id (int): Идентификатор очистки.
+        total (int): Примерное количество задач для удаления.
+        deleted (int): Количество уже удалённых задач.
+        created_at (datetime): Дата и время начала очистки.
+        finished_at (datetime | None): Дата и время завершения (None, пока очистка идёт).
+    """
+
+    id: int
+    total: int
+    deleted: int
+    created_at: datetime
+    finished_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,29 +1,74 @@
 """
 Этот файл содержит маршруты для выполнения CRUD операций с задачами:
-создание, получение, обновление, завершение и удаление задач, а также удаление всех задач пользователя.
+создание, получение, обновление, завершение и удаление задач, а также удаление всех задач пользователя,
+поиск по задачам, пакетные операции (в том числе пакеты разных операций в одной транзакции),
+импорт и экспорт задач, синхронизация изменений и состояние фоновой очистки удалённых задач.
 Используется FastAPI для обработки запросов и взаимодействия с базой данных через SQLAlchemy.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from uuid import uuid4
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import shared_cache
 from app.database import database_helper
+from app.logs import logger
 from app.security import get_current_user
+from app.serialization import MSGPACK_MEDIA_TYPE, MsgPackRoute, accepts_msgpack
+from app.services import etag_headers, get_data_version, make_etag, not_modified
 from app.tasks import (
     TaskBase,
+    TaskBatch,
+    TaskBatchResult,
+    TaskBulkUpdateStatus,
+    TaskBulkUpdateStatusResult,
+    TaskChanges,
+    TaskImportError,
+    TaskImportResult,
+    TaskOrdering,
+    TaskPage,
+    TaskPurgeStatus,
+    TaskQuickFindResult,
     TaskResponse,
+    TaskStats,
+    TaskStatus,
     TaskUpdate,
     update_task_status,
     create_task,
+    create_tasks,
     delete_all_tasks,
     delete_task,
+    export_tasks,
+    get_task_changes,
+    get_task_purge,
+    get_task_stats,
     get_tasks,
+    import_tasks,
+    quick_find_tasks,
+    run_task_batch,
+    search_tasks,
     update_task,
+    update_tasks_status,
     TaskUpdateStatus,
+    task_settings,
 )
+from app.tasks.fields import dump_task_page, parse_task_fields
+from app.tasks.importer import iter_csv_rows, iter_lines, iter_ndjson_rows
+from app.tasks.list_cache import task_list_cache
 
 
-router = APIRouter(prefix="/api/v1/tasks")
+router = APIRouter(prefix="/api/v1/tasks", route_class=MsgPackRoute)
 
 
 @router.post("/me/", response_model=TaskResponse)
@@ -59,20 +104,247 @@ async def create_task_route(
     return new_task
 
 
-@router.get("/me/", response_model=list[TaskResponse])
+@router.post("/me/bulk/", response_model=list[TaskResponse])
+async def create_tasks_route(
+    tasks: list[TaskBase],
+    db: AsyncSession = Depends(database_helper.get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Создает несколько задач для текущего пользователя за один запрос.
+
+    Задачи создаются атомарно: при ошибке не создается ни одна из них.
+
+    Параметры:
+        tasks (list[TaskBase]): Список задач для создания.
+        db (AsyncSession): Сессия для взаимодействия с базой данных.
+        current_user (dict): Данные текущего пользователя, извлеченные из JWT токена.
+
+    Возвращаемое значение:
+        list[TaskResponse]: Созданные задачи в порядке передачи.
+
+    Исключения:
+        - HTTPException (401): Если пользователь не авторизован.
+        - HTTPException (413): Если задач больше, чем допускает настройка BULK_MAX_SIZE.
+    """
+
+    if len(tasks) > task_settings.BULK_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Можно создать не более {task_settings.BULK_MAX_SIZE} задач за раз.",
+        )
+
+    user_id = int(current_user["sub"])
+
+    return await create_tasks(db=db, user_id=user_id, tasks=tasks)
+
+
+@router.post("/me/batch/", response_model=TaskBatchResult)
+async def run_task_batch_route(
+    batch: TaskBatch,
+    db: AsyncSession = Depends(database_helper.get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Выполняет пакет операций с задачами текущего пользователя в одной транзакции.
+
+    Операции (create, update, update_status, delete) соответствуют отдельным маршрутам
+    и выполняются по порядку с одной проверкой токена и одним коммитом.
+
+    Параметры:
+        batch (TaskBatch): Операции и режим выполнения (атомарный или нет).
+        db (AsyncSession): Сессия для взаимодействия с базой данных.
+        current_user (dict): Данные текущего пользователя, извлеченные из JWT токена.
+
+    Возвращаемое значение:
+        TaskBatchResult: Признак фиксации изменений и результаты операций по порядку.
+
+    Исключения:
+        - HTTPException (401): Если пользователь не авторизован.
+        - HTTPException (413): Если операций больше, чем допускает настройка BULK_MAX_SIZE.
+    """
+
+    if len(batch.operations) > task_settings.BULK_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Можно выполнить не более {task_settings.BULK_MAX_SIZE} операций за раз.",
+        )
+
+    user_id = int(current_user["sub"])
+
+    return await run_task_batch(
+        db=db, user_id=user_id, operations=batch.operations, atomic=batch.atomic
+    )
+
+
+@router.post("/me/import/", response_model=TaskImportResult)
+async def import_tasks_route(
+    request: Request,
+    db: AsyncSession = Depends(database_helper.get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Импортирует задачи текущего пользователя из NDJSON или CSV.
+
+    Тело запроса читается потоково и не буферизуется целиком. Формат определяется
+    по заголовку Content-Type: `application/x-ndjson` или `text/csv`
+    (CSV должен начинаться со строки заголовка: title, description, deadline, status).
+
+    Параметры:
+        request (Request): Объект запроса с телом файла импорта.
+        db (AsyncSession): Сессия для взаимодействия с базой данных.
+        current_user (dict): Данные текущего пользователя, извлеченные из JWT токена.
+
+    Возвращаемое значение:
+        TaskImportResult: Число импортированных и ошибочных записей и ошибки по строкам.
+
+    Исключения:
+        - HTTPException (401): Если пользователь не авторизован.
+        - HTTPException (415): Если формат тела запроса не поддерживается.
+    """
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type == "text/csv":
+        rows = iter_csv_rows(iter_lines(request.stream()))
+    elif content_type in ("application/x-ndjson", "application/jsonl"):
+        rows = iter_ndjson_rows(iter_lines(request.stream()))
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Поддерживаются только application/x-ndjson и text/csv.",
+        )
+
+    user_id = int(current_user["sub"])
+
+    imported, failed, errors = await import_tasks(db=db, user_id=user_id, rows=rows)
+    return TaskImportResult(
+        imported=imported,
+        failed=failed,
+        errors=[
+            TaskImportError(line=line, errors=messages) for line, messages in errors
+        ],
+    )
+
+
+@router.get("/me/", response_model=TaskPage)
 async def get_tasks_route(
+    request: Request,
+    limit: int = Query(
+        default=task_settings.PAGE_SIZE, ge=1, le=task_settings.PAGE_SIZE_MAX
+    ),
+    after: str | None = None,
+    task_status: TaskStatus | None = Query(default=None, alias="status"),
+    deadline_before: datetime | None = None,
+    deadline_after: datetime | None = None,
+    created_before: datetime | None = None,
+    created_after: datetime | None = None,
+    order_by: TaskOrdering = TaskOrdering.CREATED_AT,
+    include_archived: bool = False,
+    fields: str | None = Query(
+        default=None, description="Поля задачи через запятую, например id,title,status"
+    ),
     db: AsyncSession = Depends(database_helper.get_db),
     current_user: dict = Depends(get_current_user),
 ):
     """
-    Получает все задачи текущего пользователя.
+    Получает страницу задач текущего пользователя с фильтрацией и сортировкой.
+
+    Ответ содержит слабый ETag. Если переданный в If-None-Match ETag совпадает
+    с текущим, возвращается 304 Not Modified без загрузки задач. Сериализованные
+    страницы кэшируются в памяти процесса и в общем кэше; обе записи привязаны
+    к версии данных пользователя, которая читается при каждом запросе. С заголовком
+    `Accept: application/msgpack` страница сериализуется в MessagePack
+    (кэшируется и получает ETag отдельно от JSON).
 
     Параметры:
+        request (Request): Текущий запрос (заголовки If-None-Match, Accept и параметры).
+        limit (int): Максимальное количество задач на странице.
+        after (str | None): Курсор `next_cursor` из предыдущего ответа (необязательное).
+        task_status (TaskStatus | None): Фильтр по статусу задачи, параметр `status`
+            (необязательное).
+        deadline_before (datetime | None): Только задачи с дедлайном раньше указанного.
+        deadline_after (datetime | None): Только задачи с дедлайном позже указанного.
+        created_before (datetime | None): Только задачи, созданные раньше указанной даты.
+        created_after (datetime | None): Только задачи, созданные позже указанной даты.
+        order_by (TaskOrdering): Порядок сортировки (`created_at`, `-created_at`,
+            `deadline`, `-deadline`).
+        include_archived (bool): Включать ли завершённые задачи, перенесённые в архив
+            (по умолчанию False).
+        fields (str | None): Поля задачи через запятую. Запрос к базе данных выбирает
+            только эти столбцы, а задачи в ответе содержат только эти поля
+            (по умолчанию все поля).
         db (AsyncSession): Сессия для взаимодействия с базой данных.
         current_user (dict): Данные текущего пользователя, извлеченные из JWT токена.
 
     Возвращаемое значение:
-        list[TaskResponse]: Список задач текущего пользователя.
+        TaskPage: Задачи текущей страницы и курсор следующей страницы
+        (или пустой ответ 304, если данные не изменились).
+
+    Исключения:
+        - HTTPException (400): Если курсор некорректен или выдан для другой сортировки,
+          или если указано неизвестное поле.
+        - HTTPException (401): Если пользователь не авторизован.
+    """
+
+    user_id = int(current_user["sub"])
+    as_msgpack = accepts_msgpack(request)
+    media_type = MSGPACK_MEDIA_TYPE if as_msgpack else "application/json"
+    cache_key = f"{media_type}:{request.url.query}"
+    selected_fields = parse_task_fields(fields)
+
+    load_version = task_list_cache.begin_load(user_id)
+    try:
+        # Версия читается до задач: изменение между запросами даст устаревший ETag
+        # (лишнюю загрузку при следующем опросе), но не устаревшие данные.
+        version = await get_data_version(db=db, user_id=user_id)
+        etag = make_etag(version, user_id, cache_key)
+        not_modified_response = not_modified(request, etag)
+        if not_modified_response:
+            return not_modified_response
+
+        # Страница из кэша процесса отдаётся, только если сохранена для текущей
+        # версии: без Redis этот воркер не узнаёт об изменениях в других воркерах.
+        body = task_list_cache.get(user_id, cache_key, etag)
+        if body is None:
+            shared_key = f"tasks:{user_id}:{etag}"
+            body = await shared_cache.get(shared_key)
+            if body is None:
+                tasks, next_cursor = await get_tasks(
+                    db=db,
+                    user_id=user_id,
+                    limit=limit,
+                    after=after,
+                    status=task_status,
+                    deadline_before=deadline_before,
+                    deadline_after=deadline_after,
+                    created_before=created_before,
+                    created_after=created_after,
+                    order_by=order_by,
+                    include_archived=include_archived,
+                    fields=selected_fields,
+                )
+                body = dump_task_page(selected_fields, tasks, next_cursor, as_msgpack)
+                await shared_cache.set(shared_key, body)
+            task_list_cache.store(user_id, load_version, cache_key, etag, body)
+    finally:
+        task_list_cache.end_load(user_id)
+    return Response(content=body, media_type=media_type, headers=etag_headers(etag))
+
+
+@router.get("/me/export/", response_class=StreamingResponse)
+async def export_tasks_route(
+    request: Request,
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Потоково выгружает все задачи текущего пользователя в формате NDJSON.
+
+    Параметры:
+        request (Request): Объект запроса (используется для доступа к базе данных приложения).
+        current_user (dict): Данные текущего пользователя, извлеченные из JWT токена.
+
+    Возвращаемое значение:
+        StreamingResponse: Поток строк JSON, по одной задаче на строку.
 
     Исключения:
         - HTTPException (401): Если пользователь не авторизован.
@@ -80,8 +352,209 @@ async def get_tasks_route(
 
     user_id = int(current_user["sub"])
 
-    tasks = await get_tasks(db=db, user_id=user_id)
-    return tasks
+    return StreamingResponse(
+        export_tasks(
+            session_factory=request.app.state.database.async_session, user_id=user_id
+        ),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="tasks.ndjson"'},
+    )
+
+
+@router.get("/me/stats/", response_model=TaskStats)
+async def get_task_stats_route(
+    db: AsyncSession = Depends(database_helper.get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Получает статистику задач текущего пользователя.
+
+    Параметры:
+        db (AsyncSession): Сессия для взаимодействия с базой данных.
+        current_user (dict): Данные текущего пользователя, извлеченные из JWT токена.
+
+    Возвращаемое значение:
+        TaskStats: Количество задач по статусам, просроченных и со сроком в ближайшие 7 дней.
+
+    Исключения:
+        - HTTPException (401): Если пользователь не авторизован.
+    """
+
+    user_id = int(current_user["sub"])
+
+    by_status, overdue, due_this_week = await get_task_stats(db=db, user_id=user_id)
+    return TaskStats(
+        by_status=by_status,
+        total=sum(by_status.values()),
+        overdue=overdue,
+        due_this_week=due_this_week,
+    )
+
+
+@router.get("/me/changes/", response_model=TaskChanges)
+async def get_task_changes_route(
+    since: int = Query(default=0, ge=0),
+    db: AsyncSession = Depends(database_helper.get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Получает задачи текущего пользователя, созданные, изменённые или удалённые
+    после токена `since`, и новый токен для следующего запроса.
+
+    Параметры:
+        since (int): Токен `token` из предыдущего ответа (0 — получить все задачи).
+        db (AsyncSession): Сессия для взаимодействия с базой данных.
+        current_user (dict): Данные текущего пользователя, извлеченные из JWT токена.
+
+    Возвращаемое значение:
+        TaskChanges: Изменённые задачи, идентификаторы удалённых задач и новый токен.
+
+    Исключения:
+        - HTTPException (400): Если токен некорректен.
+        - HTTPException (401): Если пользователь не авторизован.
+        - HTTPException (410): Если токен устарел и задачи нужно загрузить заново.
+    """
+
+    user_id = int(current_user["sub"])
+
+    changed, deleted, token = await get_task_changes(
+        db=db, user_id=user_id, since=since
+    )
+    return TaskChanges(changed=changed, deleted=deleted, token=token)
+
+
+@router.get("/me/purges/{purge_id}/", response_model=TaskPurgeStatus)
+async def get_task_purge_route(
+    purge_id: int,
+    db: AsyncSession = Depends(database_helper.get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Получает состояние фоновой очистки задач, запущенной удалением всех задач
+    или удалением пользователя.
+
+    Параметры:
+        purge_id (int): ID очистки из ответа на запрос удаления.
+        db (AsyncSession): Сессия для взаимодействия с базой данных.
+        current_user (dict): Данные текущего пользователя, извлеченные из JWT токена.
+
+    Возвращаемое значение:
+        TaskPurgeStatus: Количество удалённых задач и время завершения очистки.
+
+    Исключения:
+        - HTTPException (401): Если пользователь не авторизован.
+        - HTTPException (404): Если очистка не найдена или относится к другому пользователю.
+    """
+
+    user_id = int(current_user["sub"])
+
+    return await get_task_purge(db=db, user_id=user_id, purge_id=purge_id)
+
+
+@router.get("/me/search/", response_model=TaskPage)
+async def search_tasks_route(
+    q: str = Query(min_length=1),
+    limit: int = Query(
+        default=task_settings.PAGE_SIZE, ge=1, le=task_settings.PAGE_SIZE_MAX
+    ),
+    after: str | None = None,
+    db: AsyncSession = Depends(database_helper.get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Ищет задачи текущего пользователя по заголовку и описанию.
+
+    Параметры:
+        q (str): Поисковый запрос. Поддерживаются фразы в кавычках, `or` и `-слово`.
+        limit (int): Максимальное количество задач на странице.
+        after (str | None): Курсор `next_cursor` из предыдущего ответа (необязательное).
+        db (AsyncSession): Сессия для взаимодействия с базой данных.
+        current_user (dict): Данные текущего пользователя, извлеченные из JWT токена.
+
+    Возвращаемое значение:
+        TaskPage: Найденные задачи, упорядоченные по релевантности, и курсор следующей страницы.
+
+    Исключения:
+        - HTTPException (400): Если курсор некорректен.
+        - HTTPException (401): Если пользователь не авторизован.
+    """
+
+    user_id = int(current_user["sub"])
+
+    tasks, next_cursor = await search_tasks(
+        db=db, user_id=user_id, query_text=q, limit=limit, after=after
+    )
+    return TaskPage(items=tasks, next_cursor=next_cursor)
+
+
+@router.get("/me/quick-find/", response_model=list[TaskQuickFindResult])
+async def quick_find_tasks_route(
+    q: str = Query(min_length=1),
+    limit: int = Query(default=10, ge=1, le=50),
+    db: AsyncSession = Depends(database_helper.get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Быстрый нечёткий поиск задач текущего пользователя по заголовку (автодополнение).
+
+    Параметры:
+        q (str): Строка запроса, допускающая опечатки.
+        limit (int): Максимальное количество результатов.
+        db (AsyncSession): Сессия для взаимодействия с базой данных.
+        current_user (dict): Данные текущего пользователя, извлеченные из JWT токена.
+
+    Возвращаемое значение:
+        list[TaskQuickFindResult]: Задачи с наиболее похожими заголовками.
+
+    Исключения:
+        - HTTPException (401): Если пользователь не авторизован.
+    """
+
+    user_id = int(current_user["sub"])
+
+    matches = await quick_find_tasks(db=db, user_id=user_id, query_text=q, limit=limit)
+    return [
+        TaskQuickFindResult(id=task_id, title=title, score=score)
+        for task_id, title, score in matches
+    ]
+
+
+# Маршрут объявлен до /me/{task_id}/status/: иначе путь /me/bulk/status/
+# совпадает с ним (task_id = "bulk").
+@router.put("/me/bulk/status/", response_model=TaskBulkUpdateStatusResult)
+async def change_status_tasks_route(
+    tasks: TaskBulkUpdateStatus,
+    db: AsyncSession = Depends(database_helper.get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Изменяет статус нескольких задач текущего пользователя за один запрос.
+
+    Параметры:
+        tasks (TaskBulkUpdateStatus): Идентификаторы задач и их новый статус.
+        db (AsyncSession): Сессия для взаимодействия с базой данных.
+        current_user (dict): Данные текущего пользователя, извлеченные из JWT токена.
+
+    Возвращаемое значение:
+        TaskBulkUpdateStatusResult: Идентификаторы обновлённых и ненайденных задач.
+
+    Исключения:
+        - HTTPException (401): Если пользователь не авторизован.
+        - HTTPException (413): Если задач больше, чем допускает настройка BULK_MAX_SIZE.
+    """
+
+    if len(tasks.ids) > task_settings.BULK_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Можно изменить не более {task_settings.BULK_MAX_SIZE} задач за раз.",
+        )
+
+    user_id = int(current_user["sub"])
+
+    updated, not_found = await update_tasks_status(
+        db=db, user_id=user_id, task_ids=tasks.ids, new_status=tasks.new_status
+    )
+    return TaskBulkUpdateStatusResult(updated=updated, not_found=not_found)
 
 
 @router.put("/me/{task_id}/status/", response_model=dict)
@@ -177,33 +650,53 @@ async def delete_task_route(
     return {"message": "Задача успешно удалена."}
 
 
-@router.delete("/me/", response_model=dict)
+@router.delete(
+    "/me/",
+    response_model=TaskPurgeStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def delete_all_tasks_route(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(database_helper.get_db),
     current_user: dict = Depends(get_current_user),
 ):
     """
     Удаляет все задачи текущего пользователя.
 
+    Задачи сразу перестают быть видны, а их строки удаляются в фоне. Заголовок
+    Location ответа 202 указывает на состояние очистки.
+
     Параметры:
+        request (Request): Текущий запрос (для построения ссылки на состояние очистки).
+        response (Response): Ответ (заголовок Location).
         db (AsyncSession): Сессия для взаимодействия с базой данных.
         current_user (dict): Данные текущего пользователя, извлеченные из JWT токена.
 
     Возвращаемое значение:
-        dict: Сообщение об успешном удалении всех задач.
+        TaskPurgeStatus: Состояние запущенной очистки задач.
 
     Исключения:
         - HTTPException (401): Если пользователь не авторизован.
-        - HTTPException (404): Если нет задач для удаления.
+        - HTTPException (404): Если пользователь не найден или удалён.
+        - HTTPException (500): Если не удалось запустить очистку (ошибка записывается в лог).
     """
 
     user_id = int(current_user["sub"])
 
     try:
-        await delete_all_tasks(db=db, user_id=user_id)
-        return {"message": "Все задачи удалены."}
-    except Exception:
+        purge = await delete_all_tasks(db=db, user_id=user_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.bind(log_id=str(uuid4())).error(
+            f"Scheduling tasks purge for user {user_id} failed: {str(e)}"
+        )
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Не найдено задач для удаления",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Не удалось запустить удаление задач.",
         )
+    response.headers["Location"] = str(
+        request.url_for("get_task_purge_route", purge_id=purge.id)
+    )
+    return purge
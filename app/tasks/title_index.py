@@ -0,0 +1,279 @@
+"""
+Этот файл содержит in-memory индекс заголовков задач для быстрого нечёткого поиска (автодополнения).
+
+Индекс хранит для каждого пользователя компактный словарь {id задачи: заголовок}
+и отвечает на запросы через пакетный `process.extract` из RapidFuzz, не загружая
+заголовки из базы данных на каждое нажатие клавиши.
+
+Основные компоненты:
+    - TitleIndex: Индекс заголовков с ленивой загрузкой, инкрементальными обновлениями
+      и вытеснением давно не использовавшихся пользователей (LRU).
+    - title_index: Экземпляр индекса, используемый приложением.
+
+    Ограничения:
+        - Индекс живёт в памяти процесса, поэтому каждый воркер строит свою копию.
+          Индекс пользователя привязан к версии его данных (users.data_version):
+          изменения из других воркеров меняют версию, и индекс загружается заново.
+          Изменения в текущем воркере передают новую версию и обновляют индекс на месте.
+        - Суммарное число заголовков ограничено настройкой TITLE_INDEX_MAX_ENTRIES.
+          Для пользователей, чьи заголовки не помещаются в индекс, запоминается
+          только версия данных (не больше OVERSIZED_LIMIT пользователей), чтобы
+          не загружать их заголовки заново при каждом запросе.
+"""
+
+from collections import OrderedDict
+from typing import Iterable
+
+from rapidfuzz import fuzz, process, utils
+
+from .config import task_settings
+
+# Сколько пользователей, не помещающихся в индекс, запоминается.
+OVERSIZED_LIMIT = 1024
+
+
+def extract_titles(
+    titles: dict[int, str],
+    query: str,
+    limit: int,
+    score_cutoff: float,
+    processed: dict[int, str] | None = None,
+) -> list[tuple[int, str, float]]:
+    """
+    Оценивает схожесть запроса со всеми заголовками одним пакетным вызовом RapidFuzz.
+
+    Параметры:
+        titles (dict[int, str]): Заголовки {id задачи: заголовок}.
+        query (str): Строка запроса.
+        limit (int): Максимальное количество результатов.
+        score_cutoff (float): Минимальная оценка схожести от 0 до 100.
+        processed (dict[int, str] | None): Заранее нормализованные заголовки (необязательное).
+
+    Возвращаемое значение:
+        list[tuple[int, str, float]]: Кортежи (id задачи, заголовок, оценка) по убыванию оценки.
+    """
+
+    if processed is None:
+        processed = {
+            task_id: utils.default_process(title) for task_id, title in titles.items()
+        }
+    matches = process.extract(
+        utils.default_process(query),
+        processed,
+        scorer=fuzz.WRatio,
+        limit=limit,
+        score_cutoff=score_cutoff,
+    )
+    return [(task_id, titles[task_id], score) for _, score, task_id in matches]
+
+
+class TitleIndex:
+    """
+    Индекс заголовков задач по пользователям с LRU-вытеснением.
+
+    Атрибуты:
+        max_entries (int): Максимальное суммарное число заголовков в индексе.
+
+    Методы:
+        begin_load(user_id): Отмечает начало загрузки заголовков пользователя из БД.
+        finish_load(user_id, load_version, data_version, items): Сохраняет загруженные
+            заголовки, если за время загрузки они не менялись.
+        cancel_load(user_id): Отмечает завершение загрузки без сохранения результата.
+        is_loaded(user_id, data_version): Проверяет, загружен ли индекс пользователя
+            для указанной версии данных.
+        is_oversized(user_id, data_version): Проверяет, что заголовки пользователя этой
+            версии данных не помещаются в индекс.
+        add(user_id, task_id, title, data_version): Добавляет или обновляет заголовок задачи.
+        remove(user_id, task_id, data_version): Удаляет задачу из индекса.
+        drop(user_id): Удаляет индекс пользователя целиком.
+        clear(): Удаляет индексы всех пользователей.
+        search(user_id, query, limit, score_cutoff): Ищет заголовки, похожие на запрос.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        # user_id -> (версия данных, id задачи -> заголовок,
+        #             id задачи -> нормализованный заголовок)
+        self._users: OrderedDict[int, tuple[int, dict[int, str], dict[int, str]]] = (
+            OrderedDict()
+        )
+        # user_id -> версия данных, заголовки которой не помещаются в индекс
+        self._oversized: OrderedDict[int, int] = OrderedDict()
+        self._size = 0
+        self._version = 0
+        self._loading: dict[int, int] = {}
+        self._touched: dict[int, int] = {}
+
+    def begin_load(self, user_id: int) -> int:
+        """
+        Отмечает начало загрузки заголовков пользователя из базы данных.
+
+        Возвращаемое значение:
+            int: Версия индекса, которую нужно передать в finish_load (load_version).
+        """
+        self._loading[user_id] = self._loading.get(user_id, 0) + 1
+        return self._version
+
+    def finish_load(
+        self,
+        user_id: int,
+        load_version: int,
+        data_version: int,
+        items: Iterable[tuple[int, str]],
+    ) -> dict[int, str]:
+        """
+        Завершает загрузку и сохраняет заголовки пользователя в индекс.
+
+        Если во время загрузки задачи пользователя изменялись, результат
+        используется только для текущего запроса и в индекс не попадает.
+        Если заголовков больше, чем вмещает индекс, запоминается только
+        версия данных (is_oversized).
+
+        Параметры:
+            user_id (int): Идентификатор пользователя.
+            load_version (int): Значение, возвращённое begin_load.
+            data_version (int): Версия данных пользователя, прочитанная до заголовков.
+            items (Iterable[tuple[int, str]]): Пары (id задачи, заголовок).
+
+        Возвращаемое значение:
+            dict[int, str]: Загруженные заголовки {id задачи: заголовок}.
+        """
+        titles = {task_id: title for task_id, title in items}
+        changed_while_loading = self._touched.get(user_id, -1) >= load_version
+        self.cancel_load(user_id)
+
+        if changed_while_loading:
+            return titles
+        self.drop(user_id)
+        if len(titles) > self.max_entries:
+            self._oversized[user_id] = data_version
+            if len(self._oversized) > OVERSIZED_LIMIT:
+                self._oversized.popitem(last=False)
+            return titles
+        processed = {
+            task_id: utils.default_process(title) for task_id, title in titles.items()
+        }
+        self._users[user_id] = (data_version, titles, processed)
+        self._size += len(titles)
+        self._evict()
+        return titles
+
+    def cancel_load(self, user_id: int):
+        """Отмечает завершение (в том числе неудачное) загрузки заголовков пользователя."""
+        self._loading[user_id] -= 1
+        if not self._loading[user_id]:
+            del self._loading[user_id]
+            self._touched.pop(user_id, None)
+
+    def is_loaded(self, user_id: int, data_version: int) -> bool:
+        """
+        Проверяет, загружен ли индекс пользователя для указанной версии данных.
+
+        Индекс другой версии удаляется: данные изменились в другом воркере.
+        """
+        entry = self._users.get(user_id)
+        if entry is None:
+            return False
+        if entry[0] != data_version:
+            self.drop(user_id)
+            return False
+        return True
+
+    def is_oversized(self, user_id: int, data_version: int) -> bool:
+        """Проверяет, что заголовки пользователя этой версии данных не помещаются в индекс."""
+        if self._oversized.get(user_id) != data_version:
+            return False
+        self._oversized.move_to_end(user_id)
+        return True
+
+    def add(self, user_id: int, task_id: int, title: str, data_version: int):
+        """
+        Добавляет или обновляет заголовок задачи, если индекс пользователя загружен.
+
+        Параметры:
+            user_id (int): Идентификатор пользователя.
+            task_id (int): Идентификатор задачи.
+            title (str): Заголовок задачи.
+            data_version (int): Версия данных пользователя после изменения.
+        """
+        entry = self._mutate(user_id, data_version)
+        if entry is None:
+            return
+        titles, processed = entry
+        if task_id not in titles:
+            self._size += 1
+        titles[task_id] = title
+        processed[task_id] = utils.default_process(title)
+        self._evict()
+
+    def remove(self, user_id: int, task_id: int, data_version: int):
+        """
+        Удаляет задачу из индекса пользователя, если он загружен.
+
+        Параметры:
+            user_id (int): Идентификатор пользователя.
+            task_id (int): Идентификатор задачи.
+            data_version (int): Версия данных пользователя после изменения.
+        """
+        entry = self._mutate(user_id, data_version)
+        if entry is None:
+            return
+        titles, processed = entry
+        if titles.pop(task_id, None) is not None:
+            processed.pop(task_id)
+            self._size -= 1
+
+    def drop(self, user_id: int):
+        """Удаляет индекс пользователя целиком; он будет загружен заново при следующем поиске."""
+        entry = self._users.pop(user_id, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+        self._oversized.pop(user_id, None)
+        if user_id in self._loading:
+            self._touched[user_id] = self._version
+            self._version += 1
+
+    def clear(self):
+        """Удаляет индексы всех пользователей."""
+        for user_id in set(self._users) | set(self._loading):
+            self.drop(user_id)
+        self._oversized.clear()
+
+    def search(
+        self, user_id: int, query: str, limit: int, score_cutoff: float
+    ) -> list[tuple[int, str, float]]:
+        """
+        Ищет заголовки задач пользователя, похожие на запрос.
+
+        Возвращаемое значение:
+            list[tuple[int, str, float]]: Кортежи (id задачи, заголовок, оценка) по убыванию оценки.
+        """
+        _, titles, processed = self._users[user_id]
+        self._users.move_to_end(user_id)
+        return extract_titles(titles, query, limit, score_cutoff, processed=processed)
+
+    def _mutate(self, user_id: int, data_version: int):
+        if user_id in self._loading:
+            self._touched[user_id] = self._version
+            self._version += 1
+        self._oversized.pop(user_id, None)
+        entry = self._users.get(user_id)
+        if entry is None:
+            return None
+        # Индекс обновляется на месте, только если он отражает предыдущую версию
+        # данных (или эту же: несколько задач одной транзакции); иначе были
+        # изменения, о которых индекс не знает.
+        version, titles, processed = entry
+        if version not in (data_version - 1, data_version):
+            self.drop(user_id)
+            return None
+        self._users[user_id] = (data_version, titles, processed)
+        return titles, processed
+
+    def _evict(self):
+        while self._size > self.max_entries and self._users:
+            _, (_, titles, _) = self._users.popitem(last=False)
+            self._size -= len(titles)
+
+
+title_index = TitleIndex(max_entries=task_settings.TITLE_INDEX_MAX_ENTRIES)
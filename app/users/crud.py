@@ -5,11 +5,16 @@
 
 from fastapi import HTTPException, status
 from pydantic import EmailStr
-from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.services import get_user, change_username, change_email
+from app.services import (
+    bump_data_version,
+    get_user,
+    change_username,
+    change_email,
+)
 from app.models import User
 from app.security import hash_password
+from app.tasks import schedule_tasks_purge
 
 
 async def create_user(db: AsyncSession, username: str, email: EmailStr, password: str):
@@ -60,6 +65,7 @@ async def update_user_info(
     Исключения:
         HTTPException: В случае, если пользователь не найден или обновление данных невозможно.
     """
+    await bump_data_version(db, user_id)
     user = await get_user(db=db, user_id=user_id)
 
     if new_username:
@@ -97,20 +103,24 @@ async def delete_user(db: AsyncSession, user_id: int):
     """
     Удаляет пользователя из базы данных.
 
+    Пользователь сразу помечается удалённым (вход и запросы с его токеном
+    возвращают ошибку), а его задачи и сама строка пользователя удаляются
+    фоновой очисткой порциями (см. schedule_tasks_purge).
+
     Атрибуты:
         db (AsyncSession): Сессия базы данных.
         user_id (int): Идентификатор пользователя для удаления.
 
     Возвращает:
-        dict: Словарь с подтверждением удаления пользователя.
+        TaskPurge: Запись фоновой очистки (для проверки прогресса).
 
     Исключения:
-        HTTPException: В случае, если пользователь не найден.
+        HTTPException: В случае, если пользователь не найден или уже удалён.
     """
 
-    await get_user(db=db, user_id=user_id)
-
-    await db.execute(delete(User).filter(User.id == user_id))
+    version = await bump_data_version(db, user_id)
+    purge = await schedule_tasks_purge(db, user_id, version, delete_user=True)
     await db.commit()
+    await db.refresh(purge)
 
-    return {"detail": "Пользователь успешно удален"}
+    return purge
@@ -1,8 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import msgpack
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.cache import shared_cache
 from app.database import database_helper
 from app.security import TokenInfo, create_jwt, get_current_user, validate_password
+from app.serialization import MSGPACK_MEDIA_TYPE, MsgPackRoute, accepts_msgpack
+from app.services import etag_headers, get_data_version, make_etag, not_modified
+from app.tasks import TaskPurgeStatus
 from app.users import (
     UserCreate,
     UserResponse,
@@ -14,7 +19,7 @@ from app.users import (
     update_user_info,
 )
 
-router = APIRouter(prefix="/api/v1/users")
+router = APIRouter(prefix="/api/v1/users", route_class=MsgPackRoute)
 
 
 @router.post("/login/", response_model=TokenInfo)
@@ -37,7 +42,11 @@ async def login_route(
     """
     user = await get_user(db=db, email=form_data.username)
 
-    if user and validate_password(pwd=form_data.password, hashed_pwd=user.password):
+    if (
+        user
+        and user.deleted_at is None
+        and validate_password(pwd=form_data.password, hashed_pwd=user.password)
+    ):
         token = create_jwt({"sub": str(user.id), "username": user.username})
         return TokenInfo(access_token=token, token_type="Bearer")
 
@@ -96,13 +105,20 @@ async def update_user_route(
 
 @router.get("/me/", response_model=UserResponse)
 async def get_user_info_route(
+    request: Request,
     db: AsyncSession = Depends(database_helper.get_db),
     current_user: dict = Depends(get_current_user),
 ):
     """
     Получает информацию о текущем пользователе.
 
+    Ответ содержит слабый ETag. Если переданный в If-None-Match ETag совпадает
+    с текущим, возвращается 304 Not Modified. Сериализованный профиль кэшируется
+    в общем кэше по ключу с версией данных пользователя. JSON и MessagePack
+    (`Accept: application/msgpack`) получают разные ETag и записи в кэше.
+
     Атрибуты:
+        request (Request): Текущий запрос (заголовки If-None-Match и Accept).
         db (AsyncSession): Сессия базы данных.
         current_user (dict): Информация о текущем авторизованном пользователе.
 
@@ -111,26 +127,58 @@ async def get_user_info_route(
     """
 
     user_id = int(current_user["sub"])
-
-    user = await get_user_info(db=db, user_id=user_id)
-    return user
-
-
-@router.delete("/me/delete/", response_model=dict)
+    as_msgpack = accepts_msgpack(request)
+    media_type = MSGPACK_MEDIA_TYPE if as_msgpack else "application/json"
+
+    version = await get_data_version(db=db, user_id=user_id)
+    etag = make_etag(version, user_id, media_type)
+    not_modified_response = not_modified(request, etag)
+    if not_modified_response:
+        return not_modified_response
+
+    shared_key = f"users:{user_id}:{etag}"
+    body = await shared_cache.get(shared_key)
+    if body is None:
+        user = UserResponse.model_validate(await get_user_info(db=db, user_id=user_id))
+        if as_msgpack:
+            body = msgpack.packb(user.model_dump(mode="json"))
+        else:
+            body = user.model_dump_json().encode()
+        await shared_cache.set(shared_key, body)
+    return Response(content=body, media_type=media_type, headers=etag_headers(etag))
+
+
+@router.delete(
+    "/me/delete/",
+    response_model=TaskPurgeStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def delete_user_route(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(database_helper.get_db),
     current_user: dict = Depends(get_current_user),
 ):
     """
     Удаляет текущего пользователя из системы.
 
+    Пользователь сразу становится недоступен, а его задачи удаляются в фоне.
+    Заголовок Location ответа 202 указывает на состояние очистки, которое можно
+    запрашивать с тем же токеном до его истечения.
+
     Атрибуты:
+        request (Request): Текущий запрос (для построения ссылки на состояние очистки).
+        response (Response): Ответ (заголовок Location).
         db (AsyncSession): Сессия базы данных.
         current_user (dict): Информация о текущем авторизованном пользователе.
 
     Возвращает:
-        dict: Подтверждение удаления пользователя.
+        TaskPurgeStatus: Состояние запущенной очистки задач пользователя.
     """
     user_id = int(current_user["sub"])
 
-    return await delete_user(db=db, user_id=user_id)
+    purge = await delete_user(db=db, user_id=user_id)
+    response.headers["Location"] = str(
+        request.url_for("get_task_purge_route", purge_id=purge.id)
+    )
+    return purge
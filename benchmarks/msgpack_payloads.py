@@ -0,0 +1,66 @@
+"""
+Этот файл содержит сравнение JSON и MessagePack для ответов API задач.
+
+Для страницы задач (GET /tasks/me/) замеряются размер тела ответа, время
+сериализации на сервере (app.tasks.fields.dump_task_page) и время разбора
+ответа клиентом (json.loads и msgpack.unpackb).
+
+База данных не нужна: данные строятся в памяти.
+
+Пример запуска:
+    python -m benchmarks.msgpack_payloads --sizes 100 10000
+"""
+
+import argparse
+import json
+import timeit
+
+import msgpack
+
+from app.tasks.fields import dump_task_page
+from benchmarks.task_list_serialization import make_rows
+
+
+def measure(function, repeat: int, number: int) -> float:
+    """Возвращает лучшее время одного вызова функции в миллисекундах."""
+
+    return min(timeit.Timer(function).repeat(repeat, number)) / number * 1000
+
+
+def main(argv: list[str] | None = None):
+    """Разбирает аргументы командной строки и печатает результаты замеров."""
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.msgpack_payloads")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'tasks':>8} {'format':>8} {'bytes':>10} "
+        f"{'encode, ms':>11} {'decode, ms':>11}"
+    )
+    for size in args.sizes:
+        rows = make_rows(size)
+        number = max(1, 10_000 // size)
+        json_body = dump_task_page(None, rows, None)
+        msgpack_body = dump_task_page(None, rows, None, as_msgpack=True)
+        assert json.loads(json_body) == msgpack.unpackb(msgpack_body)
+
+        for name, as_msgpack, body, decode in (
+            ("json", False, json_body, json.loads),
+            ("msgpack", True, msgpack_body, msgpack.unpackb),
+        ):
+            encode_time = measure(
+                lambda: dump_task_page(None, rows, None, as_msgpack),
+                args.repeat,
+                number,
+            )
+            decode_time = measure(lambda: decode(body), args.repeat, number)
+            print(
+                f"{size:>8} {name:>8} {len(body):>10} "
+                f"{encode_time:>11.2f} {decode_time:>11.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Этот файл содержит замер сериализации списка задач (GET /tasks/me/).
+
+Сравниваются два способа построения тела ответа:
+    - orm: ORM-объекты Task, по модели TaskResponse на задачу и model_dump_json()
+      (прежний способ).
+    - rows: строки столбцов, одна проверка всей страницы через TypeAdapter
+      и dump_json() (app.tasks.fields.dump_task_page).
+
+База данных не нужна: данные строятся в памяти.
+
+Пример запуска:
+    python -m benchmarks.task_list_serialization --sizes 100 10000 100000
+"""
+
+import argparse
+import timeit
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from app.models import Task
+from app.tasks.fields import dump_task_page
+from app.tasks.schemas import TaskPage, TaskStatus
+
+TaskRow = namedtuple(
+    "TaskRow",
+    ["id", "title", "description", "status", "created_at", "deadline", "is_overdue"],
+)
+
+
+def make_rows(size: int) -> list[TaskRow]:
+    """Строит строки задач, похожие на результат get_tasks."""
+
+    now = datetime(2026, 1, 1)
+    return [
+        TaskRow(
+            id=task_id,
+            title=f"Задача {task_id}",
+            description="Описание задачи " * 4,
+            status=TaskStatus.NEW,
+            created_at=now + timedelta(seconds=task_id),
+            deadline=now + timedelta(days=task_id % 30),
+            is_overdue=False,
+        )
+        for task_id in range(1, size + 1)
+    ]
+
+
+def serialize_orm(rows: list[TaskRow]) -> bytes:
+    tasks = [Task(owner_id=1, **row._asdict()) for row in rows]
+    return TaskPage(items=tasks, next_cursor=None).model_dump_json().encode()
+
+
+def serialize_rows(rows: list[TaskRow]) -> bytes:
+    return dump_task_page(None, rows, None)
+
+
+def main(argv: list[str] | None = None):
+    """Разбирает аргументы командной строки и печатает результаты замеров."""
+
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.task_list_serialization"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'tasks':>8} {'orm, ms':>10} {'rows, ms':>10} {'speedup':>8}")
+    for size in args.sizes:
+        rows = make_rows(size)
+        assert serialize_orm(rows) == serialize_rows(rows)
+        number = max(1, 10_000 // size)
+        results = []
+        for serialize in (serialize_orm, serialize_rows):
+            timer = timeit.Timer(lambda: serialize(rows))
+            results.append(min(timer.repeat(args.repeat, number)) / number * 1000)
+        print(
+            f"{size:>8} {results[0]:>10.2f} {results[1]:>10.2f} "
+            f"{results[0] / results[1]:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,11 @@
    - Предоставляет асинхронный HTTP-клиент `AsyncClient` для выполнения запросов.
    - Область действия: `function` (создается новый клиент для каждого теста).
 
+4. **database**:
+   - Предоставляет тестовую базу данных (ту же, с которой работает тестовый сервер)
+     для тестов, вызывающих функции работы с базой данных напрямую.
+   - После теста закрывает подключения: каждый тест выполняется в своём цикле событий.
+
 Использование:
 - Подключите фикстуры к тестам, указав их в параметрах тестовой функции.
 """
@@ -29,6 +34,8 @@ import pytest_asyncio
 from faker import Faker
 from httpx import AsyncClient
 
+from app.database import database_for_test
+
 faker = Faker()
 
 
@@ -58,3 +65,9 @@ def task_data():
 async def async_client():
     async with AsyncClient() as async_client:
         yield async_client
+
+
+@pytest_asyncio.fixture(scope="function")
+async def database():
+    yield database_for_test
+    await database_for_test.engine.dispose()
@@ -0,0 +1,248 @@
+import asyncio
+
+import pytest
+
+from app.cache import SharedCache
+
+
+class FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.channels = set()
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.channels.add(channel)
+        self.redis.subscribers.append(self)
+
+    async def listen(self):
+        while True:
+            yield {"type": "message", "data": await self.queue.get()}
+
+    async def aclose(self):
+        self.redis.subscribers.remove(self)
+
+
+class FakeRedis:
+    def __init__(self, available=True):
+        self.available = available
+        self.failures = 0
+        self.data = {}
+        self.subscribers = []
+
+    async def ping(self):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("Redis is down")
+        if not self.available:
+            raise ConnectionError("Redis is down")
+        return True
+
+    async def get(self, key):
+        if not self.available:
+            raise ConnectionError("Redis is down")
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        if not self.available:
+            raise ConnectionError("Redis is down")
+        self.data[key] = value
+
+    async def publish(self, channel, message):
+        if not self.available:
+            raise ConnectionError("Redis is down")
+        for pubsub in self.subscribers:
+            if channel in pubsub.channels:
+                pubsub.queue.put_nowait(message.encode())
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    async def aclose(self):
+        pass
+
+
+def make_cache(retry_interval=60, retry_max_interval=None):
+    return SharedCache(
+        url=None,
+        ttl=60,
+        prefix="test",
+        retry_interval=retry_interval,
+        socket_timeout=0.5,
+        retry_max_interval=retry_max_interval,
+    )
+
+
+async def wait_for(condition):
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0)
+    raise AssertionError("Condition was not met.")
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_get_set():
+    redis = FakeRedis()
+    cache = make_cache()
+    await cache.connect(redis)
+
+    assert await cache.get("tasks:1") is None
+    await cache.set("tasks:1", b"[]")
+    assert await cache.get("tasks:1") == b"[]"
+    assert redis.data == {"test:tasks:1": b"[]"}
+
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_invalidation_between_workers():
+    redis = FakeRedis()
+    first_worker, second_worker = make_cache(), make_cache()
+    first_invalidated, second_invalidated = [], []
+    first_worker.on_invalidate(first_invalidated.append)
+    second_worker.on_invalidate(second_invalidated.append)
+    await first_worker.connect(redis)
+    await second_worker.connect(redis)
+    await wait_for(lambda: len(redis.subscribers) == 2)
+
+    first_worker.publish_invalidation(42)
+    await wait_for(lambda: 42 in second_invalidated)
+
+    assert second_invalidated == [None, 42]
+    assert first_invalidated == [None]
+
+    await first_worker.close()
+    await second_worker.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_redis_unavailable():
+    redis = FakeRedis(available=False)
+    cache = make_cache()
+    await cache.connect(redis)
+
+    assert cache.client is None
+    await cache.set("tasks:1", b"[]")
+    assert await cache.get("tasks:1") is None
+    cache.publish_invalidation(42)
+
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_falls_back_on_redis_error():
+    redis = FakeRedis()
+    cache = make_cache()
+    await cache.connect(redis)
+    await cache.set("tasks:1", b"[]")
+
+    redis.available = False
+    assert await cache.get("tasks:1") is None
+
+    redis.available = True
+    # После ошибки Redis не используется до истечения REDIS_RETRY_INTERVAL.
+    assert await cache.get("tasks:1") is None
+
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_reconnects_with_backoff(monkeypatch):
+    delays = []
+    sleep = asyncio.sleep
+
+    async def fake_sleep(delay):
+        if delay:
+            delays.append(delay)
+        await sleep(0)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    redis = FakeRedis()
+    redis.failures = 4
+    cache = make_cache(retry_interval=1, retry_max_interval=4)
+    invalidated = []
+    cache.on_invalidate(invalidated.append)
+    await cache.connect(redis)
+    assert cache.client is None
+
+    await wait_for(lambda: cache.client is not None and redis.subscribers)
+
+    assert delays == [1, 2, 4, 4]
+    # После подключения in-memory кэши сбрасываются.
+    assert invalidated == [None]
+    await cache.set("tasks:1", b"[]")
+    assert await cache.get("tasks:1") == b"[]"
+
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_delivers_invalidations_after_startup_outage():
+    redis = FakeRedis(available=False)
+    first_worker = make_cache(retry_interval=0)
+    second_worker = make_cache(retry_interval=0)
+    second_invalidated = []
+    second_worker.on_invalidate(second_invalidated.append)
+    await first_worker.connect(redis)
+    await second_worker.connect(redis)
+
+    first_worker.publish_invalidation(42)
+    redis.available = True
+    await wait_for(lambda: len(redis.subscribers) == 2)
+    await wait_for(lambda: 42 in second_invalidated)
+
+    assert second_invalidated[0] is None
+
+    await first_worker.close()
+    await second_worker.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_resends_failed_invalidations():
+    redis = FakeRedis()
+    first_worker = make_cache(retry_interval=0)
+    second_worker = make_cache(retry_interval=0)
+    second_invalidated = []
+    second_worker.on_invalidate(second_invalidated.append)
+    await first_worker.connect(redis)
+    await second_worker.connect(redis)
+    await wait_for(lambda: len(redis.subscribers) == 2)
+
+    redis.available = False
+    first_worker.publish_invalidation(42)
+    await wait_for(lambda: 42 in first_worker._missed)
+    assert second_invalidated == [None]
+
+    redis.available = True
+    await wait_for(lambda: 42 in second_invalidated)
+    assert not first_worker._missed
+
+    await first_worker.close()
+    await second_worker.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_overflowing_missed_invalidations_reset_all(monkeypatch):
+    monkeypatch.setattr("app.cache.service._MISSED_LIMIT", 2)
+    redis = FakeRedis()
+    first_worker = make_cache(retry_interval=0)
+    second_worker = make_cache(retry_interval=0)
+    second_invalidated = []
+    second_worker.on_invalidate(second_invalidated.append)
+    await first_worker.connect(redis)
+    await second_worker.connect(redis)
+    await wait_for(lambda: len(redis.subscribers) == 2)
+
+    redis.available = False
+    for user_id in (1, 2, 3):
+        first_worker.publish_invalidation(user_id)
+    await wait_for(lambda: first_worker._missed_all)
+
+    redis.available = True
+    await wait_for(lambda: not first_worker._missed_all)
+    await wait_for(lambda: len(second_invalidated) == 2)
+    assert second_invalidated == [None, None]
+
+    await first_worker.close()
+    await second_worker.close()
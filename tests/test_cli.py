@@ -0,0 +1,15 @@
+from app import cli
+
+
+def test_cli_archive(monkeypatch, capsys):
+    calls = []
+
+    async def archive(older_than, batch_size):
+        calls.append((older_than, batch_size))
+        return 3
+
+    monkeypatch.setattr(cli, "archive", archive)
+    cli.main(["archive", "--older-than", "0", "--batch-size", "10"])
+
+    assert calls == [(0, 10)]
+    assert capsys.readouterr().out.strip() == "3"
@@ -0,0 +1,123 @@
+import gzip
+import zlib
+
+import brotli
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from app.compression import CompressionMiddleware
+
+LINE = b'{"id": 1, "title": "task"}\n'
+
+
+def make_client():
+    app = FastAPI()
+
+    @app.get("/small")
+    async def small():
+        return {"id": 1}
+
+    @app.get("/large")
+    async def large():
+        return {"items": ["task"] * 1000}
+
+    @app.get("/image")
+    async def image():
+        return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+    @app.get("/not-modified")
+    async def not_modified():
+        return Response(status_code=304)
+
+    app.add_middleware(CompressionMiddleware, min_size=500)
+    return TestClient(app)
+
+
+def test_small_response_is_not_compressed():
+    response = make_client().get("/small", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == {"id": 1}
+
+
+def test_vary_header_on_uncompressed_responses():
+    client = make_client()
+
+    for accept_encoding in ("identity", ""):
+        response = client.get("/large", headers={"Accept-Encoding": accept_encoding})
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+
+    response = client.get("/not-modified", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 304
+    assert response.headers["vary"] == "Accept-Encoding"
+
+    # Ответы, которые не сжимаются ни при каком Accept-Encoding, не меняются.
+    response = client.get("/image", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
+
+
+def test_large_response_is_compressed():
+    client = make_client()
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.json() == {"items": ["task"] * 1000}
+
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+
+
+def test_large_response_is_compressed_with_brotli():
+    client = make_client()
+    response = client.get("/large", headers={"Accept-Encoding": "gzip, br"})
+
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["vary"] == "Accept-Encoding"
+
+    with client.stream(
+        "GET", "/large", headers={"Accept-Encoding": "br"}
+    ) as raw_response:
+        body = b"".join(raw_response.iter_raw())
+    assert raw_response.headers["content-encoding"] == "br"
+    assert (
+        brotli.decompress(body) == b'{"items":[' + b",".join([b'"task"'] * 1000) + b"]}"
+    )
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_is_compressed_by_chunks():
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/x-ndjson")],
+            }
+        )
+        for _ in range(3):
+            await send({"type": "http.response.body", "body": LINE, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+    await CompressionMiddleware(app, min_size=500)(scope, None, send)
+
+    headers = dict(messages[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    # Каждая часть отправляется сразу, без ожидания следующих.
+    chunks = [message["body"] for message in messages[1:]]
+    assert len(chunks) == 4
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    assert decompressor.decompress(chunks[0]) == LINE
+    assert gzip.decompress(b"".join(chunks)) == LINE * 3
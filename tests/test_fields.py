@@ -0,0 +1,67 @@
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import msgpack
+
+from app.tasks import TaskPage, TaskResponse, TaskStatus
+from app.tasks.fields import dump_task_page, parse_task_fields
+
+ROWS = [
+    SimpleNamespace(
+        id=1,
+        title="Купить молоко",
+        description="",
+        deadline=None,
+        status=TaskStatus.NEW,
+        created_at=datetime(2026, 1, 1, 12, 0),
+        is_overdue=False,
+    ),
+    SimpleNamespace(
+        id=2,
+        title="Сдать отчёт",
+        description="Квартальный отчёт",
+        deadline=datetime(2026, 1, 2, 18, 30, 15, 250000),
+        status=TaskStatus.IN_PROGRESS,
+        created_at=datetime(2026, 1, 1, 12, 5),
+        is_overdue=True,
+    ),
+]
+
+
+def task_response_page(next_cursor, fields=None):
+    """Страница, сериализованная по одной задаче через TaskResponse."""
+
+    items = [
+        TaskResponse.model_validate(row).model_dump(mode="json", include=fields)
+        for row in ROWS
+    ]
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def test_dump_task_page_matches_task_response():
+    body = dump_task_page(None, ROWS, "cursor")
+
+    page = TaskPage(
+        items=[TaskResponse.model_validate(row) for row in ROWS], next_cursor="cursor"
+    )
+    assert body == page.model_dump_json().encode()
+    assert json.loads(body) == task_response_page("cursor")
+
+
+def test_dump_task_page_fields_subset():
+    fields = parse_task_fields("status,id,deadline")
+    body = dump_task_page(fields, ROWS, None)
+
+    page = json.loads(body)
+    expected = task_response_page(None, set(fields))
+    assert page == expected
+    # Поля следуют в порядке объявления TaskResponse.
+    assert list(page["items"][0]) == list(expected["items"][0])
+
+
+def test_dump_task_page_msgpack():
+    for fields in (None, parse_task_fields("id,title,created_at")):
+        body = dump_task_page(fields, ROWS, "cursor", as_msgpack=True)
+        expected = task_response_page("cursor", set(fields) if fields else None)
+        assert msgpack.unpackb(body) == expected
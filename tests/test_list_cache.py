@@ -0,0 +1,85 @@
+from app.tasks.list_cache import TaskListCache
+
+
+def store(cache, user_id, key, etag, body):
+    version = cache.begin_load(user_id)
+    cache.store(user_id, version, key, etag, body)
+    cache.end_load(user_id)
+
+
+def test_list_cache_get_checks_etag():
+    cache = TaskListCache(max_bytes=100, ttl=60)
+    store(cache, 1, "q", 'W/"1"', b"page")
+
+    assert cache.get(1, "q", 'W/"1"') == b"page"
+    # Запись другой версии данных не отдаётся и удаляется.
+    assert cache.get(1, "q", 'W/"2"') is None
+    assert cache.get(1, "q", 'W/"1"') is None
+
+
+def test_list_cache_lru_eviction():
+    cache = TaskListCache(max_bytes=8, ttl=60)
+    store(cache, 1, "a", "e", b"aaaa")
+    store(cache, 1, "b", "e", b"bbbb")
+    assert cache.get(1, "a", "e") == b"aaaa"
+
+    store(cache, 1, "c", "e", b"cccc")
+
+    assert cache.get(1, "b", "e") is None
+    assert cache.get(1, "a", "e") == b"aaaa"
+    assert cache.get(1, "c", "e") == b"cccc"
+
+
+def test_list_cache_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.tasks.list_cache.time.monotonic", lambda: now[0])
+    cache = TaskListCache(max_bytes=100, ttl=30)
+    store(cache, 1, "q", "e", b"page")
+
+    now[0] += 29
+    assert cache.get(1, "q", "e") == b"page"
+    now[0] += 1
+    assert cache.get(1, "q", "e") is None
+
+
+def test_list_cache_byte_cap():
+    cache = TaskListCache(max_bytes=10, ttl=60)
+    store(cache, 1, "big", "e", b"x" * 11)
+    assert cache.get(1, "big", "e") is None
+
+    store(cache, 1, "a", "e", b"x" * 6)
+    store(cache, 2, "b", "e", b"y" * 6)
+    assert cache.get(1, "a", "e") is None
+    assert cache.get(2, "b", "e") == b"y" * 6
+
+
+def test_list_cache_invalidate_user():
+    cache = TaskListCache(max_bytes=100, ttl=60)
+    store(cache, 1, "a", "e", b"first")
+    store(cache, 1, "b", "e", b"second")
+    store(cache, 2, "a", "e", b"other")
+
+    cache.invalidate(1)
+
+    assert cache.get(1, "a", "e") is None
+    assert cache.get(1, "b", "e") is None
+    assert cache.get(2, "a", "e") == b"other"
+
+
+def test_list_cache_drops_store_after_invalidation_during_load():
+    cache = TaskListCache(max_bytes=100, ttl=60)
+    version = cache.begin_load(1)
+    cache.invalidate(1)
+    cache.store(1, version, "q", "e", b"stale")
+    cache.end_load(1)
+    assert cache.get(1, "q", "e") is None
+
+    # Загрузка, начатая после инвалидации, сохраняется.
+    store(cache, 1, "q", "e", b"fresh")
+    assert cache.get(1, "q", "e") == b"fresh"
+
+
+def test_list_cache_disabled():
+    cache = TaskListCache(max_bytes=100, ttl=60, enabled=False)
+    store(cache, 1, "q", "e", b"page")
+    assert cache.get(1, "q", "e") is None
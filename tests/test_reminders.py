@@ -0,0 +1,282 @@
+import asyncio
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete
+
+from app.models import Task, User
+from app.tasks import reminders
+from app.tasks.reminders import DeadlineScheduler, claim_reminders
+
+DeadlineRow = namedtuple("DeadlineRow", "deadline id owner_id")
+ReminderRow = namedtuple("ReminderRow", "id owner_id title deadline")
+
+START = datetime(2026, 1, 1, 12, 0)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = START
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, minutes):
+        self.now = START + timedelta(minutes=minutes)
+
+
+class FakeSession:
+    def __init__(self, database):
+        self.database = database
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def scalar(self, statement):
+        return self.database.clock()
+
+    async def commit(self):
+        pass
+
+
+class FakeDatabase:
+    """Таблицы tasks и task_reminders в памяти."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        # id задачи -> (дедлайн, завершена ли)
+        self.tasks: dict[int, tuple[datetime, bool]] = {}
+        self.reminders: dict[int, datetime] = {}
+        self.fetches = 0
+        self.claims: list[list[int]] = []
+
+    def async_session(self):
+        return FakeSession(self)
+
+    def add(self, task_id, minutes, completed=False):
+        self.tasks[task_id] = (START + timedelta(minutes=minutes), completed)
+
+
+async def fake_fetch_deadlines(db, after, until, limit):
+    database = db.database
+    database.fetches += 1
+    rows = sorted(
+        DeadlineRow(deadline, task_id, 1)
+        for task_id, (deadline, completed) in database.tasks.items()
+        if not completed
+        and after < (deadline, task_id)
+        and deadline <= until
+        and database.reminders.get(task_id) != deadline
+    )
+    return rows[:limit]
+
+
+async def fake_claim_reminders(db, task_ids, now):
+    database = db.database
+    database.claims.append(list(task_ids))
+    claimed = []
+    for task_id in task_ids:
+        if task_id not in database.tasks:
+            continue
+        deadline, completed = database.tasks[task_id]
+        if completed or deadline > now or database.reminders.get(task_id) == deadline:
+            continue
+        database.reminders[task_id] = deadline
+        claimed.append(ReminderRow(task_id, 1, f"task {task_id}", deadline))
+    return sorted(claimed, key=lambda row: (row.deadline, row.id))
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def fake_database(clock, monkeypatch):
+    monkeypatch.setattr(reminders, "fetch_deadlines", fake_fetch_deadlines)
+    monkeypatch.setattr(reminders, "claim_reminders", fake_claim_reminders)
+    return FakeDatabase(clock)
+
+
+def make_scheduler(clock, fired, batch_size=100):
+    async def hook(rows):
+        fired.extend(row.id for row in rows)
+
+    return DeadlineScheduler(
+        window=timedelta(minutes=10),
+        batch_size=batch_size,
+        grace=timedelta(minutes=1),
+        rescan_interval=timedelta(hours=1),
+        hook=hook,
+        clock=clock,
+    )
+
+
+async def run_until(scheduler, database, clock, minutes):
+    clock.advance(minutes)
+    while (wake_at := await scheduler._tick(database)) is None:
+        pass
+    return wake_at
+
+
+@pytest.mark.asyncio
+async def test_scheduler_fires_in_deadline_order(clock, fake_database):
+    fired = []
+    scheduler = make_scheduler(clock, fired)
+    fake_database.add(1, 3)
+    fake_database.add(2, 1)
+    fake_database.add(3, 2)
+
+    wake_at = await run_until(scheduler, fake_database, clock, 0)
+    assert wake_at == START + timedelta(minutes=1)
+    assert fired == []
+
+    wake_at = await run_until(scheduler, fake_database, clock, 1)
+    assert fired == [2]
+    assert wake_at == START + timedelta(minutes=2)
+
+    await run_until(scheduler, fake_database, clock, 3)
+    assert fired == [2, 3, 1]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_replaces_changed_deadline(clock, fake_database):
+    fired = []
+    scheduler = make_scheduler(clock, fired)
+    fake_database.add(1, 2)
+    await run_until(scheduler, fake_database, clock, 0)
+
+    fake_database.add(1, 4)
+    scheduler.schedule(1, 1, START + timedelta(minutes=4))
+
+    assert await run_until(scheduler, fake_database, clock, 3) == START + timedelta(
+        minutes=4
+    )
+    # Прежний дедлайн пропущен без обращения к базе данных.
+    assert fake_database.claims == []
+
+    await run_until(scheduler, fake_database, clock, 4)
+    assert fired == [1]
+
+    # Перенос дедлайна на более ранний срок будит планировщик раньше.
+    fake_database.add(2, 8)
+    await run_until(scheduler, fake_database, clock, 5)
+    fake_database.add(2, 6)
+    scheduler.schedule(1, 2, START + timedelta(minutes=6))
+    assert scheduler._wake_at(clock()) == START + timedelta(minutes=6)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_drops_cancelled_deadline(clock, fake_database):
+    fired = []
+    scheduler = make_scheduler(clock, fired)
+    fake_database.add(1, 2)
+    fake_database.add(2, 3)
+    await run_until(scheduler, fake_database, clock, 0)
+
+    del fake_database.tasks[1]
+    scheduler.cancel(1)
+    scheduler.schedule(1, 2, None)
+
+    await run_until(scheduler, fake_database, clock, 5)
+    assert fired == []
+    assert fake_database.claims == []
+
+
+@pytest.mark.asyncio
+async def test_scheduler_loads_window_in_batches(clock, fake_database):
+    fired = []
+    scheduler = make_scheduler(clock, fired, batch_size=2)
+    fake_database.add(1, 1)
+    fake_database.add(2, 2)
+    fake_database.add(3, 3)
+    fake_database.add(4, 30)
+
+    await run_until(scheduler, fake_database, clock, 0)
+    assert fake_database.fetches == 1
+    assert scheduler._horizon == START + timedelta(minutes=2)
+
+    # Дедлайн за пределами загруженной части окна не добавляется.
+    scheduler.schedule(1, 3, START + timedelta(minutes=3))
+    assert 3 not in scheduler._scheduled
+    assert not scheduler._needs_load(clock())
+
+    await run_until(scheduler, fake_database, clock, 3)
+    assert fired == [1, 2, 3]
+    assert fake_database.fetches == 2
+    assert scheduler._horizon == START + timedelta(minutes=13)
+
+    # Задача за пределами окна загружается, когда окно до неё сдвигается.
+    await run_until(scheduler, fake_database, clock, 15)
+    assert scheduler._horizon == START + timedelta(minutes=25)
+    assert 4 not in scheduler._scheduled
+    await run_until(scheduler, fake_database, clock, 21)
+    assert 4 in scheduler._scheduled
+    await run_until(scheduler, fake_database, clock, 30)
+    assert fired == [1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_skips_completed_tasks(clock, fake_database):
+    fired = []
+    scheduler = make_scheduler(clock, fired)
+    fake_database.add(1, 1, completed=True)
+    fake_database.add(2, 1)
+
+    await run_until(scheduler, fake_database, clock, 2)
+    assert fired == [2]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_workers_claim_reminder_once(clock, fake_database):
+    fired = []
+    first_worker = make_scheduler(clock, fired)
+    second_worker = make_scheduler(clock, fired)
+    fake_database.add(1, 1)
+    await run_until(first_worker, fake_database, clock, 0)
+    await run_until(second_worker, fake_database, clock, 0)
+
+    clock.advance(1)
+    await asyncio.gather(
+        first_worker._tick(fake_database), second_worker._tick(fake_database)
+    )
+
+    assert len(fake_database.claims) == 2
+    assert fired == [1]
+
+
+@pytest.mark.asyncio
+async def test_claim_reminders_concurrently(database, user_data):
+    async with database.async_session() as db:
+        user = User(
+            username=user_data["username"],
+            email=user_data["email"],
+            password=user_data["password"],
+        )
+        db.add(user)
+        await db.flush()
+        task = Task(
+            owner_id=user.id,
+            title="Reminder",
+            deadline=datetime.now() - timedelta(minutes=1),
+        )
+        db.add(task)
+        await db.commit()
+
+    async def claim():
+        async with database.async_session() as db:
+            claimed = await claim_reminders(db, [task.id], datetime.now())
+            await db.commit()
+            return claimed
+
+    results = await asyncio.gather(claim(), claim())
+    assert sorted(len(claimed) for claimed in results) == [0, 1]
+    assert await claim() == []
+
+    async with database.async_session() as db:
+        await db.execute(delete(User).where(User.id == user.id))
+        await db.commit()
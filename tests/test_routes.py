@@ -0,0 +1,18 @@
+from starlette.routing import Match
+
+from app import app
+
+
+def resolve(method, path):
+    scope = {"type": "http", "method": method, "path": path}
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.name
+
+
+def test_bulk_status_route_is_not_shadowed():
+    assert (
+        resolve("PUT", "/api/v1/tasks/me/bulk/status/") == "change_status_tasks_route"
+    )
+    assert resolve("PUT", "/api/v1/tasks/me/42/status/") == "change_status_task_route"
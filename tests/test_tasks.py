@@ -1,10 +1,15 @@
+import json
 from datetime import datetime, timedelta
 
+import msgpack
 import pytest
 from faker import Faker
 from fastapi import status
+from sqlalchemy import select
 
 from app.database import settings
+from app.models import Task
+from app.tasks import archive_completed_tasks, mark_overdue_tasks
 
 ENDPOINT = f"http://{settings.SERVER_HOST}:{settings.SERVER_PORT}/api/v1"
 faker = Faker()
@@ -88,7 +93,17 @@ async def test_delete_all_tasks(async_client, user_data, task_data):
     task_delete_request = await async_client.delete(
         f"{ENDPOINT}/tasks/me/", headers=headers
     )
-    assert task_delete_request.status_code == status.HTTP_200_OK
+    assert task_delete_request.status_code == status.HTTP_202_ACCEPTED
+
+    tasks_request = await async_client.get(f"{ENDPOINT}/tasks/me/", headers=headers)
+    assert tasks_request.status_code == status.HTTP_200_OK
+    assert tasks_request.json()["items"] == []
+
+    purge_request = await async_client.get(
+        task_delete_request.headers["Location"], headers=headers
+    )
+    assert purge_request.status_code == status.HTTP_200_OK
+    assert purge_request.json()["id"] == task_delete_request.json()["id"]
 
 
 @pytest.mark.asyncio
@@ -185,3 +200,1014 @@ async def test_update_task(async_client, user_data, task_data):
         f"{ENDPOINT}/tasks/me/update/", json=update_task_json, headers=headers
     )
     assert update_task_response.status_code == status.HTTP_200_OK
+    assert update_task_response.json()["is_overdue"] is False
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_pagination(async_client, user_data, task_data):
+
+    create_user_response = await async_client.post(
+        f"{ENDPOINT}/users/register/", json=user_data
+    )
+    assert create_user_response.status_code == status.HTTP_200_OK
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    token = response_json["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    for _ in range(3):
+        task_request = await async_client.post(
+            f"{ENDPOINT}/tasks/me/", json=task_data, headers=headers
+        )
+        assert task_request.status_code == status.HTTP_200_OK
+
+    first_page = await async_client.get(
+        f"{ENDPOINT}/tasks/me/", params={"limit": 2}, headers=headers
+    )
+    assert first_page.status_code == status.HTTP_200_OK
+    first_page_json = first_page.json()
+    assert len(first_page_json["items"]) == 2
+    assert first_page_json["next_cursor"]
+
+    second_page = await async_client.get(
+        f"{ENDPOINT}/tasks/me/",
+        params={"limit": 2, "after": first_page_json["next_cursor"]},
+        headers=headers,
+    )
+    assert second_page.status_code == status.HTTP_200_OK
+    second_page_json = second_page.json()
+    assert len(second_page_json["items"]) == 1
+    assert second_page_json["next_cursor"] is None
+    assert second_page_json["items"][0]["id"] not in [
+        task["id"] for task in first_page_json["items"]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_filter_and_order(async_client, user_data, task_data):
+
+    create_user_response = await async_client.post(
+        f"{ENDPOINT}/users/register/", json=user_data
+    )
+    assert create_user_response.status_code == status.HTTP_200_OK
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    token = response_json["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    early_task = {
+        **task_data,
+        "deadline": (datetime.now() + timedelta(days=1)).isoformat(),
+    }
+    late_task = {
+        **task_data,
+        "deadline": (datetime.now() + timedelta(days=5)).isoformat(),
+    }
+    early_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/", json=early_task, headers=headers
+    )
+    assert early_request.status_code == status.HTTP_200_OK
+    late_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/", json=late_task, headers=headers
+    )
+    assert late_request.status_code == status.HTTP_200_OK
+    late_id = late_request.json()["id"]
+    task_change_status_request = await async_client.put(
+        f"{ENDPOINT}/tasks/me/{late_id}/status/",
+        headers=headers,
+        json={"id": late_id, "new_status": "in_progress"},
+    )
+    assert task_change_status_request.status_code == status.HTTP_200_OK
+
+    filtered_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/", params={"status": "in_progress"}, headers=headers
+    )
+    assert filtered_request.status_code == status.HTTP_200_OK
+    assert [task["id"] for task in filtered_request.json()["items"]] == [late_id]
+
+    ordered_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/", params={"order_by": "-deadline"}, headers=headers
+    )
+    assert ordered_request.status_code == status.HTTP_200_OK
+    assert ordered_request.json()["items"][0]["id"] == late_id
+
+
+@pytest.mark.asyncio
+async def test_search_tasks(async_client, user_data, task_data):
+
+    create_user_response = await async_client.post(
+        f"{ENDPOINT}/users/register/", json=user_data
+    )
+    assert create_user_response.status_code == status.HTTP_200_OK
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    token = response_json["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    keyword = faker.uuid4().replace("-", "")
+    searched_task = {
+        **task_data,
+        "description": f"{task_data['description']} {keyword}",
+    }
+    task_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/", json=searched_task, headers=headers
+    )
+    assert task_request.status_code == status.HTTP_200_OK
+    other_task_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/", json=task_data, headers=headers
+    )
+    assert other_task_request.status_code == status.HTTP_200_OK
+
+    search_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/search/", params={"q": keyword}, headers=headers
+    )
+    assert search_request.status_code == status.HTTP_200_OK
+    assert [task["id"] for task in search_request.json()["items"]] == [
+        task_request.json()["id"]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_quick_find_tasks(async_client, user_data, task_data):
+
+    create_user_response = await async_client.post(
+        f"{ENDPOINT}/users/register/", json=user_data
+    )
+    assert create_user_response.status_code == status.HTTP_200_OK
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    token = response_json["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    task_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/",
+        json={**task_data, "title": "Подготовить квартальный отчёт"},
+        headers=headers,
+    )
+    assert task_request.status_code == status.HTTP_200_OK
+
+    quick_find_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/quick-find/",
+        params={"q": "квартальный отчот"},
+        headers=headers,
+    )
+    assert quick_find_request.status_code == status.HTTP_200_OK
+    assert quick_find_request.json()[0]["id"] == task_request.json()["id"]
+
+    new_task_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/",
+        json={**task_data, "title": "Позвонить бухгалтеру"},
+        headers=headers,
+    )
+    assert new_task_request.status_code == status.HTTP_200_OK
+
+    quick_find_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/quick-find/",
+        params={"q": "бухгалтер"},
+        headers=headers,
+    )
+    assert quick_find_request.status_code == status.HTTP_200_OK
+    assert quick_find_request.json()[0]["id"] == new_task_request.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_create_tasks_bulk(async_client, user_data, task_data):
+
+    create_user_response = await async_client.post(
+        f"{ENDPOINT}/users/register/", json=user_data
+    )
+    assert create_user_response.status_code == status.HTTP_200_OK
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    token = response_json["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    bulk_data = [{**task_data, "title": faker.sentence(nb_words=3)} for _ in range(5)]
+    bulk_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/bulk/", json=bulk_data, headers=headers
+    )
+    assert bulk_request.status_code == status.HTTP_200_OK
+    assert [task["title"] for task in bulk_request.json()] == [
+        task["title"] for task in bulk_data
+    ]
+
+    invalid_bulk_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/bulk/",
+        json=[task_data, {**task_data, "title": "x"}],
+        headers=headers,
+    )
+    assert invalid_bulk_request.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    task_get_request = await async_client.get(f"{ENDPOINT}/tasks/me/", headers=headers)
+    assert task_get_request.status_code == status.HTTP_200_OK
+    assert len(task_get_request.json()["items"]) == len(bulk_data)
+
+
+@pytest.mark.asyncio
+async def test_change_status_tasks_bulk(async_client, user_data, task_data):
+
+    create_user_response = await async_client.post(
+        f"{ENDPOINT}/users/register/", json=user_data
+    )
+    assert create_user_response.status_code == status.HTTP_200_OK
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    token = response_json["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    bulk_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/bulk/", json=[task_data, task_data], headers=headers
+    )
+    assert bulk_request.status_code == status.HTTP_200_OK
+    task_ids = [task["id"] for task in bulk_request.json()]
+    missing_id = max(task_ids) + 1_000_000
+
+    bulk_status_request = await async_client.put(
+        f"{ENDPOINT}/tasks/me/bulk/status/",
+        json={"ids": [*task_ids, missing_id], "new_status": "completed"},
+        headers=headers,
+    )
+    assert bulk_status_request.status_code == status.HTTP_200_OK
+    assert bulk_status_request.json() == {
+        "updated": task_ids,
+        "not_found": [missing_id],
+    }
+
+
+@pytest.mark.asyncio
+async def test_update_task_not_found(async_client, user_data, task_data):
+
+    create_user_response = await async_client.post(
+        f"{ENDPOINT}/users/register/", json=user_data
+    )
+    assert create_user_response.status_code == status.HTTP_200_OK
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    token = response_json["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    task_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/", json=task_data, headers=headers
+    )
+    assert task_request.status_code == status.HTTP_200_OK
+    missing_id = task_request.json()["id"] + 1_000_000
+
+    update_task_response = await async_client.patch(
+        f"{ENDPOINT}/tasks/me/update/",
+        json={"id": missing_id, "title": faker.sentence(nb_words=5)},
+        headers=headers,
+    )
+    assert update_task_response.status_code == status.HTTP_404_NOT_FOUND
+
+    task_change_status_request = await async_client.put(
+        f"{ENDPOINT}/tasks/me/{missing_id}/status/",
+        headers=headers,
+        json={"id": missing_id, "new_status": "in_progress"},
+    )
+    assert task_change_status_request.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_delete_task_not_found(async_client, user_data, task_data):
+
+    create_user_response = await async_client.post(
+        f"{ENDPOINT}/users/register/", json=user_data
+    )
+    assert create_user_response.status_code == status.HTTP_200_OK
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    token = response_json["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    task_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/", json=task_data, headers=headers
+    )
+    assert task_request.status_code == status.HTTP_200_OK
+    task_id = task_request.json()["id"]
+    task_delete_request = await async_client.delete(
+        f"{ENDPOINT}/tasks/me/{task_id}/", headers=headers
+    )
+    assert task_delete_request.status_code == status.HTTP_200_OK
+    task_delete_request = await async_client.delete(
+        f"{ENDPOINT}/tasks/me/{task_id}/", headers=headers
+    )
+    assert task_delete_request.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_export_tasks(async_client, user_data, task_data):
+
+    create_user_response = await async_client.post(
+        f"{ENDPOINT}/users/register/", json=user_data
+    )
+    assert create_user_response.status_code == status.HTTP_200_OK
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    token = response_json["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    bulk_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/bulk/", json=[task_data] * 3, headers=headers
+    )
+    assert bulk_request.status_code == status.HTTP_200_OK
+
+    export_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/export/", headers=headers
+    )
+    assert export_request.status_code == status.HTTP_200_OK
+    assert export_request.headers["content-type"].startswith("application/x-ndjson")
+    exported = [json.loads(line) for line in export_request.text.splitlines()]
+    assert [task["id"] for task in exported] == [
+        task["id"] for task in bulk_request.json()
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_tasks(async_client, user_data, task_data):
+
+    create_user_response = await async_client.post(
+        f"{ENDPOINT}/users/register/", json=user_data
+    )
+    assert create_user_response.status_code == status.HTTP_200_OK
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    token = response_json["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    ndjson_body = "\n".join(
+        [json.dumps(task_data), json.dumps({**task_data, "title": "x"}), "{broken"]
+    )
+    import_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/import/",
+        content=ndjson_body.encode(),
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert import_request.status_code == status.HTTP_200_OK
+    import_json = import_request.json()
+    assert import_json["imported"] == 1
+    assert import_json["failed"] == 2
+    assert [error["line"] for error in import_json["errors"]] == [2, 3]
+
+    csv_body = 'title,description\n"Импорт, CSV","первая строка\nвторая строка"\n'
+    import_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/import/",
+        content=csv_body.encode(),
+        headers={**headers, "Content-Type": "text/csv"},
+    )
+    assert import_request.status_code == status.HTTP_200_OK
+    assert import_request.json()["imported"] == 1
+
+    task_get_request = await async_client.get(f"{ENDPOINT}/tasks/me/", headers=headers)
+    assert task_get_request.status_code == status.HTTP_200_OK
+    assert len(task_get_request.json()["items"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_import_tasks_data_version(async_client, database, user_data, task_data):
+
+    create_user_response = await async_client.post(
+        f"{ENDPOINT}/users/register/", json=user_data
+    )
+    assert create_user_response.status_code == status.HTTP_200_OK
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    token = response_json["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    task_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/", json=task_data, headers=headers
+    )
+    assert task_request.status_code == status.HTTP_200_OK
+    created_id = task_request.json()["id"]
+
+    changes_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/changes/", headers=headers
+    )
+    assert changes_request.status_code == status.HTTP_200_OK
+    sync_token = changes_request.json()["token"]
+
+    # Строки COPY получают версию от импорта, а не от триггера.
+    import_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/import/",
+        content=json.dumps(task_data).encode(),
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert import_request.status_code == status.HTTP_200_OK
+    assert import_request.json()["imported"] == 1
+
+    changes_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/changes/",
+        params={"since": sync_token},
+        headers=headers,
+    )
+    assert changes_request.status_code == status.HTTP_200_OK
+    changes_json = changes_request.json()
+    assert len(changes_json["changed"]) == 1
+    imported_id = changes_json["changed"][0]["id"]
+    assert imported_id != created_id
+    import_token = changes_json["token"]
+    assert import_token > sync_token
+
+    # Вставки через ORM версию не передают, её проставляет триггер.
+    task_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/", json=task_data, headers=headers
+    )
+    assert task_request.status_code == status.HTTP_200_OK
+    second_created_id = task_request.json()["id"]
+
+    changes_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/changes/",
+        params={"since": import_token},
+        headers=headers,
+    )
+    assert changes_request.status_code == status.HTTP_200_OK
+    changes_json = changes_request.json()
+    assert [task["id"] for task in changes_json["changed"]] == [second_created_id]
+
+    async with database.async_session() as db:
+        result = await db.execute(
+            select(Task.id, Task.data_version, Task.updated_at).where(
+                Task.id.in_([created_id, imported_id, second_created_id])
+            )
+        )
+        rows = {
+            task_id: (version, updated_at) for task_id, version, updated_at in result
+        }
+
+    assert 0 < rows[created_id][0] <= sync_token
+    assert rows[imported_id][0] == import_token
+    assert rows[second_created_id][0] == changes_json["token"]
+    assert all(updated_at is not None for _, updated_at in rows.values())
+
+
+@pytest.mark.asyncio
+async def test_get_task_stats(async_client, user_data, task_data):
+
+    create_user_response = await async_client.post(
+        f"{ENDPOINT}/users/register/", json=user_data
+    )
+    assert create_user_response.status_code == status.HTTP_200_OK
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    token = response_json["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    bulk_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/bulk/", json=[task_data] * 3, headers=headers
+    )
+    assert bulk_request.status_code == status.HTTP_200_OK
+    task_ids = [task["id"] for task in bulk_request.json()]
+
+    task_change_status_request = await async_client.put(
+        f"{ENDPOINT}/tasks/me/{task_ids[0]}/status/",
+        headers=headers,
+        json={"id": task_ids[0], "new_status": "completed"},
+    )
+    assert task_change_status_request.status_code == status.HTTP_200_OK
+    task_delete_request = await async_client.delete(
+        f"{ENDPOINT}/tasks/me/{task_ids[1]}/", headers=headers
+    )
+    assert task_delete_request.status_code == status.HTTP_200_OK
+
+    stats_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/stats/", headers=headers
+    )
+    assert stats_request.status_code == status.HTTP_200_OK
+    stats_json = stats_request.json()
+    assert stats_json["by_status"] == {"new": 1, "in_progress": 0, "completed": 1}
+    assert stats_json["total"] == 2
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_etag(async_client, user_data, task_data):
+
+    create_user_response = await async_client.post(
+        f"{ENDPOINT}/users/register/", json=user_data
+    )
+    assert create_user_response.status_code == status.HTTP_200_OK
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    token = response_json["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    task_get_request = await async_client.get(f"{ENDPOINT}/tasks/me/", headers=headers)
+    assert task_get_request.status_code == status.HTTP_200_OK
+    etag = task_get_request.headers["etag"]
+    assert etag.startswith("W/")
+
+    task_get_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/", headers={**headers, "If-None-Match": etag}
+    )
+    assert task_get_request.status_code == status.HTTP_304_NOT_MODIFIED
+
+    task_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/", json=task_data, headers=headers
+    )
+    assert task_request.status_code == status.HTTP_200_OK
+
+    task_get_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/", headers={**headers, "If-None-Match": etag}
+    )
+    assert task_get_request.status_code == status.HTTP_200_OK
+    assert task_get_request.headers["etag"] != etag
+    assert len(task_get_request.json()["items"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_task_changes(async_client, user_data, task_data):
+
+    create_user_response = await async_client.post(
+        f"{ENDPOINT}/users/register/", json=user_data
+    )
+    assert create_user_response.status_code == status.HTTP_200_OK
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    token = response_json["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    bulk_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/bulk/", json=[task_data, task_data], headers=headers
+    )
+    assert bulk_request.status_code == status.HTTP_200_OK
+    task_ids = [task["id"] for task in bulk_request.json()]
+
+    changes_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/changes/", headers=headers
+    )
+    assert changes_request.status_code == status.HTTP_200_OK
+    changes_json = changes_request.json()
+    assert [task["id"] for task in changes_json["changed"]] == task_ids
+    assert changes_json["deleted"] == []
+    sync_token = changes_json["token"]
+
+    update_task_response = await async_client.patch(
+        f"{ENDPOINT}/tasks/me/update/",
+        json={"id": task_ids[0], "title": faker.sentence(nb_words=5)},
+        headers=headers,
+    )
+    assert update_task_response.status_code == status.HTTP_200_OK
+    task_delete_request = await async_client.delete(
+        f"{ENDPOINT}/tasks/me/{task_ids[1]}/", headers=headers
+    )
+    assert task_delete_request.status_code == status.HTTP_200_OK
+
+    changes_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/changes/",
+        params={"since": sync_token},
+        headers=headers,
+    )
+    assert changes_request.status_code == status.HTTP_200_OK
+    changes_json = changes_request.json()
+    assert [task["id"] for task in changes_json["changed"]] == [task_ids[0]]
+    assert changes_json["deleted"] == [task_ids[1]]
+    assert changes_json["token"] > sync_token
+
+
+@pytest.mark.asyncio
+async def test_mark_overdue_tasks(async_client, database, user_data, task_data):
+
+    create_user_response = await async_client.post(
+        f"{ENDPOINT}/users/register/", json=user_data
+    )
+    assert create_user_response.status_code == status.HTTP_200_OK
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    token = response_json["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    past_deadline = (datetime.now() - timedelta(hours=1)).isoformat()
+    bulk_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/bulk/",
+        json=[
+            {**task_data, "deadline": past_deadline},
+            {**task_data, "deadline": past_deadline},
+            task_data,
+        ],
+        headers=headers,
+    )
+    assert bulk_request.status_code == status.HTTP_200_OK
+    overdue_id, completed_id, future_id = [task["id"] for task in bulk_request.json()]
+    task_change_status_request = await async_client.put(
+        f"{ENDPOINT}/tasks/me/{completed_id}/status/",
+        headers=headers,
+        json={"id": completed_id, "new_status": "completed"},
+    )
+    assert task_change_status_request.status_code == status.HTTP_200_OK
+
+    changes_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/changes/", headers=headers
+    )
+    assert changes_request.status_code == status.HTTP_200_OK
+    sync_token = changes_request.json()["token"]
+
+    async with database.async_session() as db:
+        assert await mark_overdue_tasks(db) >= 1
+
+    task_get_request = await async_client.get(f"{ENDPOINT}/tasks/me/", headers=headers)
+    assert task_get_request.status_code == status.HTTP_200_OK
+    is_overdue = {
+        task["id"]: task["is_overdue"] for task in task_get_request.json()["items"]
+    }
+    assert is_overdue == {overdue_id: True, completed_id: False, future_id: False}
+
+    changes_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/changes/",
+        params={"since": sync_token},
+        headers=headers,
+    )
+    assert changes_request.status_code == status.HTTP_200_OK
+    changes_json = changes_request.json()
+    assert [task["id"] for task in changes_json["changed"]] == [overdue_id]
+    assert changes_json["token"] > sync_token
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_include_archived(async_client, user_data, task_data):
+
+    create_user_response = await async_client.post(
+        f"{ENDPOINT}/users/register/", json=user_data
+    )
+    assert create_user_response.status_code == status.HTTP_200_OK
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    token = response_json["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    bulk_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/bulk/", json=[task_data, task_data], headers=headers
+    )
+    assert bulk_request.status_code == status.HTTP_200_OK
+    task_ids = [task["id"] for task in bulk_request.json()]
+
+    first_page = await async_client.get(
+        f"{ENDPOINT}/tasks/me/",
+        params={"include_archived": True, "limit": 1},
+        headers=headers,
+    )
+    assert first_page.status_code == status.HTTP_200_OK
+    first_page_json = first_page.json()
+    assert [task["id"] for task in first_page_json["items"]] == task_ids[:1]
+
+    second_page = await async_client.get(
+        f"{ENDPOINT}/tasks/me/",
+        params={
+            "include_archived": True,
+            "limit": 1,
+            "after": first_page_json["next_cursor"],
+        },
+        headers=headers,
+    )
+    assert second_page.status_code == status.HTTP_200_OK
+    assert [task["id"] for task in second_page.json()["items"]] == task_ids[1:]
+
+
+@pytest.mark.asyncio
+async def test_archive_completed_tasks(async_client, database, user_data, task_data):
+
+    create_user_response = await async_client.post(
+        f"{ENDPOINT}/users/register/", json=user_data
+    )
+    assert create_user_response.status_code == status.HTTP_200_OK
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    token = response_json["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    bulk_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/bulk/", json=[task_data, task_data], headers=headers
+    )
+    assert bulk_request.status_code == status.HTTP_200_OK
+    task_ids = [task["id"] for task in bulk_request.json()]
+    task_change_status_request = await async_client.put(
+        f"{ENDPOINT}/tasks/me/{task_ids[0]}/status/",
+        headers=headers,
+        json={"id": task_ids[0], "new_status": "completed"},
+    )
+    assert task_change_status_request.status_code == status.HTTP_200_OK
+
+    changes_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/changes/", headers=headers
+    )
+    assert changes_request.status_code == status.HTTP_200_OK
+    sync_token = changes_request.json()["token"]
+
+    async with database.async_session() as db:
+        assert await archive_completed_tasks(db, older_than=0) >= 1
+
+    task_get_request = await async_client.get(f"{ENDPOINT}/tasks/me/", headers=headers)
+    assert task_get_request.status_code == status.HTTP_200_OK
+    assert [task["id"] for task in task_get_request.json()["items"]] == task_ids[1:]
+
+    task_get_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/", params={"include_archived": True}, headers=headers
+    )
+    assert task_get_request.status_code == status.HTTP_200_OK
+    items = task_get_request.json()["items"]
+    assert [task["id"] for task in items] == task_ids
+    assert items[0]["status"] == "completed"
+
+    changes_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/changes/",
+        params={"since": sync_token},
+        headers=headers,
+    )
+    assert changes_request.status_code == status.HTTP_200_OK
+    changes_json = changes_request.json()
+    assert changes_json["changed"] == []
+    assert changes_json["deleted"] == task_ids[:1]
+
+    stats_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/stats/", headers=headers
+    )
+    assert stats_request.status_code == status.HTTP_200_OK
+    stats_json = stats_request.json()
+    assert stats_json["by_status"] == {"new": 1, "in_progress": 0, "completed": 0}
+    assert stats_json["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_fields(async_client, user_data, task_data):
+
+    create_user_response = await async_client.post(
+        f"{ENDPOINT}/users/register/", json=user_data
+    )
+    assert create_user_response.status_code == status.HTTP_200_OK
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    token = response_json["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    task_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/", json=task_data, headers=headers
+    )
+    assert task_request.status_code == status.HTTP_200_OK
+
+    tasks_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/",
+        params={"fields": "id,title,status"},
+        headers=headers,
+    )
+    assert tasks_request.status_code == status.HTTP_200_OK
+    assert tasks_request.json()["items"] == [
+        {
+            "title": task_data["title"],
+            "status": "new",
+            "id": task_request.json()["id"],
+        }
+    ]
+
+    tasks_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/", params={"fields": "id,password"}, headers=headers
+    )
+    assert tasks_request.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_msgpack_content_negotiation(async_client, user_data, task_data):
+
+    create_user_response = await async_client.post(
+        f"{ENDPOINT}/users/register/", json=user_data
+    )
+    assert create_user_response.status_code == status.HTTP_200_OK
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    token = response_json["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    msgpack_headers = {
+        **headers,
+        "Accept": "application/msgpack",
+        "Content-Type": "application/msgpack",
+    }
+    task_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/",
+        content=msgpack.packb(task_data),
+        headers=msgpack_headers,
+    )
+    assert task_request.status_code == status.HTTP_200_OK
+    assert task_request.headers["content-type"] == "application/msgpack"
+    task = msgpack.unpackb(task_request.content)
+    assert task["title"] == task_data["title"]
+
+    tasks_request = await async_client.get(
+        f"{ENDPOINT}/tasks/me/", headers=msgpack_headers
+    )
+    assert tasks_request.status_code == status.HTTP_200_OK
+    assert tasks_request.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(tasks_request.content)["items"] == [task]
+
+    json_request = await async_client.get(f"{ENDPOINT}/tasks/me/", headers=headers)
+    assert json_request.json()["items"] == [task]
+    assert json_request.headers["etag"] != tasks_request.headers["etag"]
+
+    user_request = await async_client.get(
+        f"{ENDPOINT}/users/me/", headers=msgpack_headers
+    )
+    assert user_request.status_code == status.HTTP_200_OK
+    assert msgpack.unpackb(user_request.content)["email"] == user_data["email"]
+
+    json_user_request = await async_client.get(
+        f"{ENDPOINT}/users/me/",
+        headers={**headers, "If-None-Match": user_request.headers["etag"]},
+    )
+    assert json_user_request.status_code == status.HTTP_200_OK
+    assert json_user_request.json()["email"] == user_data["email"]
+    assert json_user_request.headers["etag"] != user_request.headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_run_task_batch(async_client, user_data, task_data):
+
+    create_user_response = await async_client.post(
+        f"{ENDPOINT}/users/register/", json=user_data
+    )
+    assert create_user_response.status_code == status.HTTP_200_OK
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    token = response_json["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    task_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/", json=task_data, headers=headers
+    )
+    assert task_request.status_code == status.HTTP_200_OK
+    task_id = task_request.json()["id"]
+
+    operations = [
+        {"op": "create", "task": task_data},
+        {"op": "delete", "task_id": task_id + 1_000_000},
+        {"op": "update_status", "task": {"id": task_id, "new_status": "completed"}},
+    ]
+    batch_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/batch/",
+        json={"operations": operations, "atomic": True},
+        headers=headers,
+    )
+    assert batch_request.status_code == status.HTTP_200_OK
+    assert batch_request.json()["committed"] is False
+    assert [result["status_code"] for result in batch_request.json()["results"]] == [
+        status.HTTP_424_FAILED_DEPENDENCY,
+        status.HTTP_404_NOT_FOUND,
+        status.HTTP_424_FAILED_DEPENDENCY,
+    ]
+    tasks_request = await async_client.get(f"{ENDPOINT}/tasks/me/", headers=headers)
+    assert [task["status"] for task in tasks_request.json()["items"]] == ["new"]
+
+    batch_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/batch/",
+        json={"operations": operations, "atomic": False},
+        headers=headers,
+    )
+    assert batch_request.status_code == status.HTTP_200_OK
+    assert batch_request.json()["committed"] is True
+    results = batch_request.json()["results"]
+    assert [result["status_code"] for result in results] == [
+        status.HTTP_200_OK,
+        status.HTTP_404_NOT_FOUND,
+        status.HTTP_200_OK,
+    ]
+    assert results[0]["task"]["title"] == task_data["title"]
+    assert results[2]["task"]["status"] == "completed"
+    tasks_request = await async_client.get(f"{ENDPOINT}/tasks/me/", headers=headers)
+    assert len(tasks_request.json()["items"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_create_task_idempotency_key(async_client, user_data, task_data):
+
+    create_user_response = await async_client.post(
+        f"{ENDPOINT}/users/register/", json=user_data
+    )
+    assert create_user_response.status_code == status.HTTP_200_OK
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    token = response_json["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    idempotent_headers = {**headers, "Idempotency-Key": faker.uuid4()}
+    task_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/", json=task_data, headers=idempotent_headers
+    )
+    assert task_request.status_code == status.HTTP_200_OK
+
+    retry_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/", json=task_data, headers=idempotent_headers
+    )
+    assert retry_request.status_code == status.HTTP_200_OK
+    assert retry_request.headers["idempotent-replayed"] == "true"
+    assert retry_request.json() == task_request.json()
+
+    other_request = await async_client.post(
+        f"{ENDPOINT}/tasks/me/",
+        json={**task_data, "title": "Другая задача"},
+        headers=idempotent_headers,
+    )
+    assert other_request.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    tasks_request = await async_client.get(f"{ENDPOINT}/tasks/me/", headers=headers)
+    assert len(tasks_request.json()["items"]) == 1
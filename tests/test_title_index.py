@@ -0,0 +1,95 @@
+import sys
+
+from app.tasks.title_index import TitleIndex
+
+# app.tasks.title_index перекрыт одноимённым объектом индекса в app.tasks.
+title_index_module = sys.modules[TitleIndex.__module__]
+
+
+def load(index, user_id, data_version, titles):
+    load_version = index.begin_load(user_id)
+    return index.finish_load(user_id, load_version, data_version, titles.items())
+
+
+def found(index, user_id, query):
+    return [task_id for task_id, _, _ in index.search(user_id, query, 10, 60)]
+
+
+def test_title_index_checks_data_version():
+    index = TitleIndex(max_entries=100)
+    load(index, 1, 5, {1: "Buy milk"})
+
+    assert index.is_loaded(1, 5)
+    assert found(index, 1, "milk") == [1]
+    # Задачи изменились в другом воркере: индекс удаляется.
+    assert not index.is_loaded(1, 6)
+    assert not index.is_loaded(1, 5)
+
+
+def test_title_index_advances_with_local_changes():
+    index = TitleIndex(max_entries=100)
+    load(index, 1, 5, {1: "Buy milk"})
+
+    index.add(1, 2, "Buy bread", 6)
+    index.add(1, 3, "Buy eggs", 6)
+    index.remove(1, 1, 7)
+
+    assert index.is_loaded(1, 7)
+    assert sorted(found(index, 1, "buy")) == [2, 3]
+
+
+def test_title_index_drops_entry_after_missed_change():
+    index = TitleIndex(max_entries=100)
+    load(index, 1, 5, {1: "Buy milk"})
+
+    # Изменение версии 6 прошло мимо индекса (например, смена статуса).
+    index.add(1, 2, "Buy bread", 7)
+
+    assert not index.is_loaded(1, 7)
+    assert index._size == 0
+
+
+def test_title_index_skips_load_changed_during_loading():
+    index = TitleIndex(max_entries=100)
+    load_version = index.begin_load(1)
+    index.add(1, 2, "Buy bread", 6)
+
+    titles = index.finish_load(1, load_version, 5, {1: "Buy milk"}.items())
+
+    assert titles == {1: "Buy milk"}
+    assert not index.is_loaded(1, 5)
+
+
+def test_title_index_remembers_oversized_users(monkeypatch):
+    monkeypatch.setattr(title_index_module, "OVERSIZED_LIMIT", 2)
+    index = TitleIndex(max_entries=2)
+    titles = {1: "a", 2: "b", 3: "c"}
+
+    assert load(index, 1, 5, titles) == titles
+    assert not index.is_loaded(1, 5)
+    assert index.is_oversized(1, 5)
+    assert not index.is_oversized(1, 6)
+
+    # Изменение задач сбрасывает отметку.
+    index.add(1, 4, "d", 6)
+    assert not index.is_oversized(1, 6)
+
+    load(index, 1, 6, titles)
+    load(index, 2, 1, titles)
+    load(index, 3, 1, titles)
+    assert not index.is_oversized(1, 6)
+    assert index.is_oversized(2, 1)
+    assert index.is_oversized(3, 1)
+
+
+def test_title_index_evicts_least_recently_used():
+    index = TitleIndex(max_entries=3)
+    load(index, 1, 1, {1: "Buy milk", 2: "Buy bread"})
+    load(index, 2, 1, {3: "Walk dog"})
+    found(index, 1, "milk")
+
+    load(index, 3, 1, {4: "Read book"})
+
+    assert index.is_loaded(1, 1)
+    assert not index.is_loaded(2, 1)
+    assert index.is_loaded(3, 1)
@@ -77,7 +77,35 @@ async def test_delete_user(async_client, user_data):
     delete_request = await async_client.delete(
         f"{ENDPOINT}/users/me/delete/", headers=headers
     )
-    assert delete_request.status_code == status.HTTP_200_OK
+    assert delete_request.status_code == status.HTTP_202_ACCEPTED
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    # Email и имя удалённого пользователя свободны, не дожидаясь фоновой очистки.
+    create_user_response = await async_client.post(
+        f"{ENDPOINT}/users/register/", json=user_data
+    )
+    assert create_user_response.status_code == status.HTTP_200_OK
+
+    response = await async_client.post(
+        f"{ENDPOINT}/users/login/",
+        data={"username": user_data["email"], "password": user_data["password"]},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["access_token"] != token
+    new_headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    user_get_request = await async_client.get(
+        f"{ENDPOINT}/users/me/", headers=new_headers
+    )
+    assert user_get_request.status_code == status.HTTP_200_OK
+    assert user_get_request.json()["email"] == user_data["email"]
+
+    user_get_request = await async_client.get(f"{ENDPOINT}/users/me/", headers=headers)
+    assert user_get_request.status_code != status.HTTP_200_OK
 
 
 @pytest.mark.asyncio